@@ -26,6 +26,7 @@ interface YearnRedemption:
     def redeem(amount: uint256) -> uint256: payable
 
 interface CurvePool:
+    def get_dy(_i: uint256, _j: uint256, _dx: uint256) -> uint256: view
     def exchange(
         _i: uint256, _j: uint256, _dx: uint256, _min_dy: uint256, _use_eth: bool
     ) -> uint256: nonpayable
@@ -147,6 +148,38 @@ def redeem(_account: address, _receiver: address, _lt_amount: uint256, _dt_amoun
     log Redeem(_account, _receiver, _lt_amount, _dt_amount, msg.value, minted)
     return minted
 
+@external
+@view
+def quote_sell(_lt_amount: uint256, _dt_amount: uint256) -> (uint256, uint256, uint256):
+    """
+    @notice Quote a redemption without ETH, where part of the discount tokens is sold
+    @param _lt_amount Amount of locking tokens
+    @param _dt_amount Amount of discount tokens
+    @return Tuple with the amount of discount tokens to sell, the expected amount of ETH
+        received from the sale and the expected amount of liquid locker tokens minted
+    @dev 
+        Binary searches the smallest sell amount for which the ETH received from the Curve pool
+        covers the full redemption cost of the remainder, without relying on the slippage tolerance.
+        The sell amount can be passed ABI encoded as `_data` to `redeem`
+    """
+    assert _dt_amount > 1
+
+    # selling nothing never covers a nonzero redemption cost, selling everything leaves nothing to redeem
+    lo: uint256 = 1
+    hi: uint256 = _dt_amount
+    for i in range(256):
+        if lo >= hi:
+            break
+        mid: uint256 = (lo + hi) / 2
+        if self.curve_pool.get_dy(0, 1, mid) >= self.yearn_redemption.eth_required(_dt_amount - mid):
+            hi = mid
+        else:
+            lo = mid + 1
+    assert lo < _dt_amount
+
+    eth_amount: uint256 = self.curve_pool.get_dy(0, 1, lo)
+    return lo, eth_amount, (_lt_amount + _dt_amount - lo) * SCALE
+
 @internal
 def _redeem_yearn(_receiver: address, _amount: uint256, _eth_amount: uint256):
     """
@@ -0,0 +1,498 @@
+# @version 0.3.10
+"""
+@title Batch redeemer
+@author 1up
+@license GNU AGPLv3
+@notice
+    Redeem discount token and lock into protocol's voting escrow, in batches.
+    Redemptions without ETH are queued per epoch. After the epoch has ended anyone
+    can settle it, redeeming the entire batch with a single sale, redemption, lock
+    update and mint. Afterwards each receiver can withdraw their pro-rata share
+    of the minted liquid locker tokens. The sale is bounded by the pool's price
+    oracle, epochs that remain unsettled for too long can be refunded.
+    Redemptions with ETH are not queued and are processed immediately.
+"""
+
+from vyper.interfaces import ERC20
+
+interface Redeemer:
+    def redeem(_account: address, _receiver: address, _lt_amount: uint256, _dt_amount: uint256, _data: Bytes[256]) -> uint256: payable
+implements: Redeemer
+
+interface VotingEscrow:
+    def modify_lock(_amount: uint256, _unlock_time: uint256, _account: address): nonpayable
+
+interface LiquidLocker:
+    def mint(_receiver: address) -> uint256: nonpayable
+
+interface YearnRedemption:
+    def eth_required(amount: uint256) -> uint256: view
+    def redeem(amount: uint256) -> uint256: payable
+
+interface CurvePool:
+    def price_oracle() -> uint256: view
+    def get_dy(_i: uint256, _j: uint256, _dx: uint256) -> uint256: view
+    def exchange(
+        _i: uint256, _j: uint256, _dx: uint256, _min_dy: uint256, _use_eth: bool
+    ) -> uint256: nonpayable
+
+voting_escrow: public(immutable(VotingEscrow))
+liquid_locker: public(immutable(LiquidLocker))
+locking_token: public(immutable(ERC20))
+discount_token: public(immutable(ERC20))
+proxy: public(immutable(address))
+gauge_rewards: public(immutable(address))
+staking_rewards: public(immutable(address))
+management: public(address)
+pending_management: public(address)
+treasury: public(address)
+yearn_redemption: public(YearnRedemption)
+curve_pool: public(CurvePool)
+max_slippage: public(uint256)
+packed_queued: public(HashMap[uint256, HashMap[address, uint256]]) # epoch => receiver => (lt amount, dt amount)
+packed_epochs: public(HashMap[uint256, uint256]) # epoch => (lt amount, dt amount)
+minted: public(HashMap[uint256, uint256]) # epoch => liquid locker tokens minted on settlement
+
+event Redeem:
+    account: indexed(address)
+    receiver: address
+    lt_amount: uint256
+    dt_amount: uint256
+    value: uint256
+    minted: uint256
+
+event Queue:
+    epoch: indexed(uint256)
+    account: indexed(address)
+    receiver: indexed(address)
+    lt_amount: uint256
+    dt_amount: uint256
+
+event Settle:
+    epoch: indexed(uint256)
+    lt_amount: uint256
+    dt_amount: uint256
+    sell_amount: uint256
+    minted: uint256
+
+event Withdraw:
+    epoch: indexed(uint256)
+    account: indexed(address)
+    receiver: address
+    amount: uint256
+
+event Refund:
+    epoch: indexed(uint256)
+    account: indexed(address)
+    receiver: address
+    lt_amount: uint256
+    dt_amount: uint256
+
+event ClaimExcess:
+    excess: uint256
+
+event SetTreasury:
+    treasury: address
+
+event SetYearnRedemption:
+    yearn_redemption: address
+
+event SetCurvePool:
+    curve_pool: address
+
+event SetMaxSlippage:
+    max_slippage: uint256
+
+event PendingManagement:
+    management: address
+
+event SetManagement:
+    management: address
+
+SCALE: constant(uint256) = 69_420
+EPOCH_LENGTH: constant(uint256) = 24 * 60 * 60
+MAX_NUM_EPOCHS: constant(uint256) = 32
+MASK: constant(uint256) = 2**128 - 1
+REFUND_DELAY: constant(uint256) = 7
+PRECISION: constant(uint256) = 10**18
+SLIPPAGE_DENOMINATOR: constant(uint256) = 10_000
+
+@external
+def __init__(
+    _voting_escrow: address, _liquid_locker: address, _locking_token: address, _discount_token: address,
+    _proxy: address, _gauge_rewards: address, _staking_rewards: address,
+):
+    """
+    @notice Constructor
+    @param _voting_escrow Voting escrow
+    @param _liquid_locker Liquid locker
+    @param _locking_token Locking token
+    @param _discount_token Discount token
+    @param _proxy Proxy
+    @param _gauge_rewards Gauge rewards contract
+    @param _staking_rewards Staking rewards contract
+    """
+    voting_escrow = VotingEscrow(_voting_escrow)
+    liquid_locker = LiquidLocker(_liquid_locker)
+    locking_token = ERC20(_locking_token)
+    discount_token = ERC20(_discount_token)
+    proxy = _proxy
+    gauge_rewards = _gauge_rewards
+    staking_rewards = _staking_rewards
+    self.management = msg.sender
+    self.treasury = msg.sender
+    self.max_slippage = 200
+    assert locking_token.approve(_voting_escrow, max_value(uint256), default_return_value=True)
+
+@external
+@payable
+def __default__():
+    """
+    @notice Receive ETH from Curve pool swaps
+    """
+    assert msg.sender == self.curve_pool.address
+
+@external
+@view
+def epoch() -> uint256:
+    """
+    @notice Get the current epoch
+    @return Current epoch
+    """
+    return block.timestamp / EPOCH_LENGTH
+
+@external
+@view
+def queued(_epoch: uint256, _receiver: address) -> (uint256, uint256):
+    """
+    @notice Get the amounts queued in an epoch for a receiver
+    @param _epoch Epoch
+    @param _receiver Receiver
+    @return Tuple with amount of locking tokens and discount tokens
+    """
+    return self._unpack(self.packed_queued[_epoch][_receiver])
+
+@external
+@view
+def claimable(_epoch: uint256, _receiver: address) -> uint256:
+    """
+    @notice Get the amount of liquid locker tokens that can be withdrawn from an epoch
+    @param _epoch Epoch
+    @param _receiver Receiver
+    @return Amount of liquid locker tokens. Zero if the epoch is not settled yet
+    """
+    return self._claimable(_epoch, _receiver)
+
+@external
+@payable
+def redeem(_account: address, _receiver: address, _lt_amount: uint256, _dt_amount: uint256, _data: Bytes[256]) -> uint256:
+    """
+    @notice
+        Redeem discount token into locking token and lock into liquid locker.
+        Without ETH the tokens are queued in the current epoch instead
+    @param _account User performing the redemption
+    @param _receiver Receiver of rewards
+    @param _lt_amount Amount of locking tokens
+    @param _dt_amount Amount of discount tokens
+    @param _data Additional data, ignored
+    @return Amount of liquid locker tokens created. Zero if the tokens are queued
+    @dev Can only be called by either of the reward contracts
+    """
+    assert msg.sender in [gauge_rewards, staking_rewards]
+    assert _lt_amount > 0 or _dt_amount > 0
+
+    if _lt_amount > 0:
+        assert locking_token.transferFrom(msg.sender, self, _lt_amount, default_return_value=True)
+    if _dt_amount > 0:
+        assert discount_token.transferFrom(msg.sender, self, _dt_amount, default_return_value=True)
+
+    if msg.value == 0:
+        # queue for redemption at the end of the epoch
+        epoch: uint256 = block.timestamp / EPOCH_LENGTH
+        lt_amount: uint256 = 0
+        dt_amount: uint256 = 0
+        lt_amount, dt_amount = self._unpack(self.packed_queued[epoch][_receiver])
+        self.packed_queued[epoch][_receiver] = self._pack(lt_amount + _lt_amount, dt_amount + _dt_amount)
+        lt_amount, dt_amount = self._unpack(self.packed_epochs[epoch])
+        self.packed_epochs[epoch] = self._pack(lt_amount + _lt_amount, dt_amount + _dt_amount)
+        log Queue(epoch, _account, _receiver, _lt_amount, _dt_amount)
+        return 0
+
+    # redemption cost is paid for
+    assert _dt_amount > 0
+    self._redeem_yearn(_receiver, _dt_amount, msg.value)
+    amount: uint256 = _lt_amount + _dt_amount
+    voting_escrow.modify_lock(amount, 0, proxy)
+    minted: uint256 = liquid_locker.mint(_receiver)
+    assert minted >= amount * SCALE
+    log Redeem(_account, _receiver, _lt_amount, _dt_amount, msg.value, minted)
+    return minted
+
+@external
+def settle(_epoch: uint256) -> uint256:
+    """
+    @notice Redeem all tokens queued in an epoch that has ended
+    @param _epoch Epoch to settle
+    @return Amount of liquid locker tokens minted
+    @dev
+        The discount tokens are partially sold to pay for the redemption cost
+        of the remainder. The sell amount is the smallest amount for which the
+        proceeds cover the full redemption cost. Excess ETH can be claimed to the treasury.
+        Reverts if the proceeds are below the pool's oracle price by more than the max slippage
+    """
+    assert _epoch < block.timestamp / EPOCH_LENGTH
+    assert self.minted[_epoch] == 0
+
+    lt_amount: uint256 = 0
+    dt_amount: uint256 = 0
+    lt_amount, dt_amount = self._unpack(self.packed_epochs[_epoch])
+    assert lt_amount > 0 or dt_amount > 0
+
+    amount: uint256 = lt_amount + dt_amount
+    sell_amount: uint256 = 0
+    if dt_amount > 0:
+        sell_amount = self._sell_amount(dt_amount)
+        amount -= sell_amount
+        # anyone can settle, bound the sale by the oracle price to prevent sandwiching
+        min_dy: uint256 = sell_amount * PRECISION / self.curve_pool.price_oracle()
+        min_dy -= min_dy * self.max_slippage / SLIPPAGE_DENOMINATOR
+        eth_amount: uint256 = self.curve_pool.exchange(0, 1, sell_amount, min_dy, True)
+        self._redeem_yearn(self, dt_amount - sell_amount, eth_amount)
+
+    voting_escrow.modify_lock(amount, 0, proxy)
+    minted: uint256 = liquid_locker.mint(self)
+    assert minted >= amount * SCALE
+    self.minted[_epoch] = minted
+    log Settle(_epoch, lt_amount, dt_amount, sell_amount, minted)
+    return minted
+
+@external
+def withdraw(_epochs: DynArray[uint256, MAX_NUM_EPOCHS], _receiver: address = msg.sender) -> uint256:
+    """
+    @notice Withdraw liquid locker tokens from settled epochs
+    @param _epochs Epochs to withdraw from
+    @param _receiver Recipient of the liquid locker tokens
+    @return Amount of liquid locker tokens withdrawn
+    """
+    total: uint256 = 0
+    for epoch in _epochs:
+        amount: uint256 = self._claimable(epoch, msg.sender)
+        assert amount > 0
+        self.packed_queued[epoch][msg.sender] = 0
+        total += amount
+        log Withdraw(epoch, msg.sender, _receiver, amount)
+
+    assert ERC20(liquid_locker.address).transfer(_receiver, total, default_return_value=True)
+    return total
+
+@external
+def refund(_epochs: DynArray[uint256, MAX_NUM_EPOCHS], _receiver: address = msg.sender):
+    """
+    @notice Refund the tokens queued in epochs that have not been settled in time
+    @param _epochs Epochs to refund from
+    @param _receiver Recipient of the locking tokens and discount tokens
+    @dev An epoch can be refunded once `REFUND_DELAY` epochs have passed after its end
+    """
+    current: uint256 = block.timestamp / EPOCH_LENGTH
+    lt_total: uint256 = 0
+    dt_total: uint256 = 0
+    for epoch in _epochs:
+        assert epoch + REFUND_DELAY < current
+        assert self.minted[epoch] == 0
+
+        lt_amount: uint256 = 0
+        dt_amount: uint256 = 0
+        lt_amount, dt_amount = self._unpack(self.packed_queued[epoch][msg.sender])
+        assert lt_amount > 0 or dt_amount > 0
+        self.packed_queued[epoch][msg.sender] = 0
+
+        lt_epoch: uint256 = 0
+        dt_epoch: uint256 = 0
+        lt_epoch, dt_epoch = self._unpack(self.packed_epochs[epoch])
+        self.packed_epochs[epoch] = self._pack(lt_epoch - lt_amount, dt_epoch - dt_amount)
+        lt_total += lt_amount
+        dt_total += dt_amount
+        log Refund(epoch, msg.sender, _receiver, lt_amount, dt_amount)
+
+    if lt_total > 0:
+        assert locking_token.transfer(_receiver, lt_total, default_return_value=True)
+    if dt_total > 0:
+        assert discount_token.transfer(_receiver, dt_total, default_return_value=True)
+
+@external
+def claim_excess():
+    """
+    @notice Claim excess ETH by sending it to the treasury
+    """
+    value: uint256 = self.balance
+    assert value > 0
+    raw_call(self.treasury, b"", value=value)
+    log ClaimExcess(value)
+
+@external
+def set_treasury(_treasury: address):
+    """
+    @notice Set new treasury address, recipient of excess ETH
+    @param _treasury Treasury address
+    @dev Can only be called by management
+    """
+    assert msg.sender == self.management
+    assert _treasury != empty(address)
+    self.treasury = _treasury
+    log SetTreasury(_treasury)
+
+@external
+def set_yearn_redemption(_yearn_redemption: address):
+    """
+    @notice
+        Set new Yearn redemption contract. Can be set to zero
+        to effectively disable redemptions.
+    @param _yearn_redemption Yearn redemption contract
+    @dev Can only be called by management
+    """
+    assert msg.sender == self.management
+
+    previous: address = self.yearn_redemption.address
+    if previous != empty(address):
+        # retract previous allowance
+        assert discount_token.approve(previous, 0, default_return_value=True)
+    if _yearn_redemption != empty(address):
+        # set new allowance
+        assert discount_token.approve(_yearn_redemption, max_value(uint256), default_return_value=True)
+
+    self.yearn_redemption = YearnRedemption(_yearn_redemption)
+    log SetYearnRedemption(_yearn_redemption)
+
+@external
+def set_curve_pool(_curve_pool: address):
+    """
+    @notice
+        Set new Curve pool contract. Can be set to zero
+        to effectively disable settlements.
+    @param _curve_pool Curve pool contract
+    @dev Can only be called by management
+    """
+    assert msg.sender == self.management
+
+    previous: address = self.curve_pool.address
+    if previous != empty(address):
+        # retract previous allowance
+        assert discount_token.approve(previous, 0, default_return_value=True)
+    if _curve_pool != empty(address):
+        # set new allowance
+        assert discount_token.approve(_curve_pool, max_value(uint256), default_return_value=True)
+
+    self.curve_pool = CurvePool(_curve_pool)
+    log SetCurvePool(_curve_pool)
+
+@external
+def set_max_slippage(_max_slippage: uint256):
+    """
+    @notice Set the max slippage of settlement sales relative to the pool's oracle price
+    @param _max_slippage Max slippage, in basis points
+    @dev Can only be called by management
+    """
+    assert msg.sender == self.management
+    assert _max_slippage <= SLIPPAGE_DENOMINATOR
+    self.max_slippage = _max_slippage
+    log SetMaxSlippage(_max_slippage)
+
+@external
+def set_management(_management: address):
+    """
+    @notice
+        Set the pending management address.
+        Needs to be accepted by that account separately to transfer management over
+    @param _management New pending management address
+    """
+    assert msg.sender == self.management
+    self.pending_management = _management
+    log PendingManagement(_management)
+
+@external
+def accept_management():
+    """
+    @notice
+        Accept management role.
+        Can only be called by account previously marked as pending management by current management
+    """
+    assert msg.sender == self.pending_management
+    self.pending_management = empty(address)
+    self.management = msg.sender
+    log SetManagement(msg.sender)
+
+@internal
+def _redeem_yearn(_receiver: address, _amount: uint256, _eth_amount: uint256):
+    """
+    @notice Redeem through Yearn. Refunds any excess above 0.3%
+    """
+    value: uint256 = self.yearn_redemption.eth_required(_amount)
+    assert value > 0
+    if _eth_amount > value and _receiver != self:
+        # return anything above 0.3%, excess from settlements is kept for the treasury
+        raw_call(_receiver, b"", value=_eth_amount - value)
+    value -= value * 3 / 1000
+    assert _eth_amount >= value, "slippage"
+    self.yearn_redemption.redeem(_amount, value=value)
+
+@internal
+@view
+def _sell_amount(_dt_amount: uint256) -> uint256:
+    """
+    @notice Smallest amount of discount tokens to sell to pay for the redemption of the remainder
+    """
+    assert _dt_amount > 1
+
+    # selling nothing never covers a nonzero redemption cost, selling everything leaves nothing to redeem
+    lo: uint256 = 1
+    hi: uint256 = _dt_amount
+    for i in range(256):
+        if lo >= hi:
+            break
+        mid: uint256 = (lo + hi) / 2
+        if self.curve_pool.get_dy(0, 1, mid) >= self.yearn_redemption.eth_required(_dt_amount - mid):
+            hi = mid
+        else:
+            lo = mid + 1
+    assert lo < _dt_amount
+    return lo
+
+@internal
+@view
+def _claimable(_epoch: uint256, _receiver: address) -> uint256:
+    """
+    @notice
+        Pro-rata share of minted liquid locker tokens in an epoch. Locking tokens
+        are redeemed 1:1, the remainder is distributed according to discount tokens
+    """
+    minted: uint256 = self.minted[_epoch]
+    if minted == 0:
+        return 0
+
+    lt_amount: uint256 = 0
+    dt_amount: uint256 = 0
+    lt_amount, dt_amount = self._unpack(self.packed_queued[_epoch][_receiver])
+    amount: uint256 = lt_amount * SCALE
+    if dt_amount > 0:
+        lt_total: uint256 = 0
+        dt_total: uint256 = 0
+        lt_total, dt_total = self._unpack(self.packed_epochs[_epoch])
+        amount += dt_amount * (minted - lt_total * SCALE) / dt_total
+    return amount
+
+@internal
+@pure
+def _pack(_lt_amount: uint256, _dt_amount: uint256) -> uint256:
+    """
+    @notice Pack locking token and discount token amounts in a single slot
+    """
+    assert _lt_amount <= MASK and _dt_amount <= MASK
+    return _lt_amount | _dt_amount << 128
+
+@internal
+@pure
+def _unpack(_packed: uint256) -> (uint256, uint256):
+    """
+    @notice Unpack locking token and discount token amounts from a single slot
+    """
+    return _packed & MASK, _packed >> 128
@@ -6,13 +6,29 @@
 @notice
     Permissionless deployment of gauges from the Yearn registry.
     Deployed gauges are immediately added to the registry.
+    Gauges are deployed deterministically, their address only depends on the
+    Yearn gauge, the number of gauges previously deployed for it and the blueprint.
+    Alternatively, management can configure an implementation to deploy gauges
+    as minimal proxies instead, with the gauge configuration appended to the proxy code.
+    This reduces the deployment cost at the expense of a small overhead per call.
 """
 
 interface YearnRegistry:
     def registered(_ygauge: address) -> bool: view
 
+interface ERC4626:
+    def asset() -> address: view
+
+interface ERC20Detailed:
+    def decimals() -> uint8: view
+
+interface GaugeClone:
+    def factory() -> address: view
+    def initialize(): nonpayable
+
 interface Registry:
     def register(_gauge: address) -> uint256: nonpayable
+    def register_many(_gauges: DynArray[address, MAX_BATCH_SIZE]) -> DynArray[uint256, MAX_BATCH_SIZE]: nonpayable
 
 yearn_registry: public(immutable(YearnRegistry))
 reward_token: public(immutable(address))
@@ -22,6 +38,9 @@ rewards: public(immutable(address))
 management: public(address)
 pending_management: public(address)
 gauge_blueprint: public(address)
+gauge_implementation: public(address)
+gauge_loader: public(address)
+deployments: public(HashMap[address, uint256]) # ygauge => number of gauges deployed
 
 event DeployGauge:
     ygauge: indexed(address)
@@ -30,12 +49,28 @@ event DeployGauge:
 event SetGaugeBlueprint:
     blueprint: address
 
+event SetGaugeImplementation:
+    implementation: address
+    loader: address
+
 event PendingManagement:
     management: address
 
 event SetManagement:
     management: address
 
+MAX_BATCH_SIZE: constant(uint256) = 16
+MAX_INITCODE_SIZE: constant(uint256) = 16384
+BLUEPRINT_PREAMBLE_SIZE: constant(uint256) = 3
+ADDRESS_MASK: constant(uint256) = 2**160 - 1
+CLONE_CODE_SIZE: constant(uint256) = 146
+# initcode that deploys everything appended to it: runtime = code[11:]
+LOADER: constant(Bytes[11]) = b"\x60\x0b\x80\x38\x03\x80\x91\x3d\x39\x3d\xf3"
+BLUEPRINT_PREAMBLE: constant(Bytes[3]) = b"\xfe\x71\x00"
+# https://eips.ethereum.org/EIPS/eip-1167
+PROXY_PREFIX: constant(Bytes[10]) = b"\x36\x3d\x3d\x37\x3d\x3d\x3d\x36\x3d\x73"
+PROXY_SUFFIX: constant(Bytes[15]) = b"\x5a\xf4\x3d\x82\x80\x3e\x90\x3d\x91\x60\x2b\x57\xfd\x5b\xf3"
+
 @external
 def __init__(_yearn_registry: address, _reward_token: address, _proxy: address, _registry: address, _rewards: address):
     """
@@ -56,25 +91,72 @@ def __init__(_yearn_registry: address, _reward_token: address, _proxy: address,
 @external
 def deploy_gauge(_ygauge: address) -> address:
     """
-    @notice Deploy a new gauge for a Yearn gauge using the current blueprint
+    @notice Deploy a new gauge for a Yearn gauge using the current blueprint or implementation
     @param _ygauge The yearn gauge
     @return New gauge address
     @dev Calls registry to register gauge
     """
-    assert yearn_registry.registered(_ygauge)
-
-    gauge: address = create_from_blueprint(
-        self.gauge_blueprint,
-        _ygauge,
-        proxy,
-        reward_token,
-        rewards,
-        code_offset=3
-    )
-    log DeployGauge(_ygauge, gauge)
+    gauge: address = self._deploy_gauge(_ygauge)
     registry.register(gauge)
     return gauge
 
+@external
+def deploy_gauges(_ygauges: DynArray[address, MAX_BATCH_SIZE]) -> DynArray[address, MAX_BATCH_SIZE]:
+    """
+    @notice Deploy new gauges for multiple Yearn gauges using the current blueprint or implementation
+    @param _ygauges The yearn gauges
+    @return New gauge addresses
+    @dev Calls registry to register all gauges at once
+    """
+    gauges: DynArray[address, MAX_BATCH_SIZE] = []
+    for ygauge in _ygauges:
+        gauges.append(self._deploy_gauge(ygauge))
+    registry.register_many(gauges)
+    return gauges
+
+@external
+@view
+def predict_gauge(_ygauge: address) -> address:
+    """
+    @notice Predict the address of the gauge for a Yearn gauge using the current blueprint or implementation
+    @param _ygauge The yearn gauge
+    @return Gauge address
+    @dev Prediction is only valid as long as the blueprint and implementation are not changed
+        and no other gauge is deployed for the Yearn gauge
+    """
+    initcode_hash: bytes32 = empty(bytes32)
+    implementation: address = self.gauge_implementation
+    if implementation != empty(address):
+        code: Bytes[CLONE_CODE_SIZE] = self._clone_code(implementation, _ygauge)
+        initcode_hash = keccak256(concat(LOADER, code))
+    else:
+        blueprint: address = self.gauge_blueprint
+        size: uint256 = blueprint.codesize - BLUEPRINT_PREAMBLE_SIZE
+        assert size <= MAX_INITCODE_SIZE
+
+        # copy initcode from blueprint in words, since code can only be sliced with a constant length.
+        # last word overlaps with the previous one and is shifted to remove the overlap
+        words: DynArray[bytes32, MAX_INITCODE_SIZE / 32] = []
+        for i in range(MAX_INITCODE_SIZE / 32):
+            start: uint256 = i * 32
+            if start >= size:
+                break
+            if start + 32 > size:
+                word: uint256 = convert(slice(blueprint.code, BLUEPRINT_PREAMBLE_SIZE + size - 32, 32), uint256)
+                words.append(convert(word << 8 * (start + 32 - size), bytes32))
+            else:
+                words.append(convert(slice(blueprint.code, BLUEPRINT_PREAMBLE_SIZE + start, 32), bytes32))
+
+        # strip offset and length from encoded array
+        initcode: Bytes[MAX_INITCODE_SIZE + 64] = _abi_encode(words)
+        initcode_hash = keccak256(
+            concat(slice(initcode, 64, size), _abi_encode(_ygauge, proxy, reward_token, rewards))
+        )
+
+    salt: bytes32 = self._salt(_ygauge, self.deployments[_ygauge])
+    hash: bytes32 = keccak256(concat(b"\xff", convert(self, bytes20), salt, initcode_hash))
+    return convert(convert(hash, uint256) & ADDRESS_MASK, address)
+
 @external
 def set_gauge_blueprint(_blueprint: address):
     """
@@ -87,6 +169,24 @@ def set_gauge_blueprint(_blueprint: address):
     self.gauge_blueprint = _blueprint
     log SetGaugeBlueprint(_blueprint)
 
+@external
+def set_gauge_implementation(_implementation: address, _loader: address):
+    """
+    @notice 
+        Set a new gauge implementation, to deploy gauges as minimal proxies.
+        Setting it to the zero address reverts to deploying gauges from the blueprint
+    @param _implementation Gauge clone implementation address
+    @param _loader Blueprint of the initcode that deploys the clone code
+    @dev Can only be called by management
+    """
+    assert msg.sender == self.management
+    if _implementation != empty(address):
+        assert GaugeClone(_implementation).factory() == self
+        assert slice(_loader.code, 0, 14) == concat(BLUEPRINT_PREAMBLE, LOADER)
+    self.gauge_implementation = _implementation
+    self.gauge_loader = _loader
+    log SetGaugeImplementation(_implementation, _loader)
+
 @external
 def set_management(_management: address):
     """
@@ -110,3 +210,72 @@ def accept_management():
     self.pending_management = empty(address)
     self.management = msg.sender
     log SetManagement(msg.sender)
+
+@internal
+def _deploy_gauge(_ygauge: address) -> address:
+    """
+    @notice Deploy a new gauge from the blueprint or as clone of the implementation, without registering it
+    """
+    assert yearn_registry.registered(_ygauge)
+
+    # every deployment for the same Yearn gauge uses a new salt, so that
+    # a replacement can be deployed after the previous gauge is deregistered
+    idx: uint256 = self.deployments[_ygauge]
+    self.deployments[_ygauge] = idx + 1
+
+    gauge: address = empty(address)
+    salt: bytes32 = self._salt(_ygauge, idx)
+    implementation: address = self.gauge_implementation
+    if implementation != empty(address):
+        code: Bytes[CLONE_CODE_SIZE] = self._clone_code(implementation, _ygauge)
+        gauge = create_from_blueprint(
+            self.gauge_loader,
+            code,
+            raw_args=True,
+            code_offset=BLUEPRINT_PREAMBLE_SIZE,
+            salt=salt
+        )
+        GaugeClone(gauge).initialize()
+    else:
+        gauge = create_from_blueprint(
+            self.gauge_blueprint,
+            _ygauge,
+            proxy,
+            reward_token,
+            rewards,
+            code_offset=BLUEPRINT_PREAMBLE_SIZE,
+            salt=salt
+        )
+    log DeployGauge(_ygauge, gauge)
+    return gauge
+
+@internal
+@view
+def _clone_code(_implementation: address, _ygauge: address) -> Bytes[CLONE_CODE_SIZE]:
+    """
+    @notice Runtime code of a gauge clone: minimal proxy followed by the gauge configuration
+    """
+    asset: address = ERC4626(_ygauge).asset()
+    decimals: uint8 = ERC20Detailed(asset).decimals()
+    # decimals are added as a full word and sliced off, since concat writes
+    # full words and would write past the end of its buffer for a trailing `bytes1`
+    code: Bytes[CLONE_CODE_SIZE + 31] = concat(
+        PROXY_PREFIX,
+        convert(_implementation, bytes20),
+        PROXY_SUFFIX,
+        convert(_ygauge, bytes20),
+        convert(proxy, bytes20),
+        convert(reward_token, bytes20),
+        convert(rewards, bytes20),
+        convert(asset, bytes20),
+        convert(convert(decimals, uint256) << 248, bytes32)
+    )
+    return slice(code, 0, CLONE_CODE_SIZE)
+
+@internal
+@pure
+def _salt(_ygauge: address, _idx: uint256) -> bytes32:
+    """
+    @notice Deployment salt of the gauge for a Yearn gauge: Yearn gauge in the lower 160 bits, deployment index above it
+    """
+    return convert(convert(_ygauge, uint256) | (_idx << 160), bytes32)
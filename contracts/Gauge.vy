@@ -8,6 +8,10 @@
     Does not store balances directly, instead they are reported
     to the reward contract.
     The underlying Yearn gauge tokens are held by the proxy.
+    `GaugeClone` is a copy of this contract for minimal proxy deployments.
+    Both read their configuration only through the internal accessors at the end
+    of the contract, everything from `name` up to the accessors is identical in both.
+    Any change to the shared code has to be made in both contracts.
 """
 
 from vyper.interfaces import ERC20
@@ -86,7 +90,7 @@ def name() -> String[128]:
     @return Gauge name
     @dev Based on the name of the asset inside the Yearn gauge
     """
-    name: String[124] = ERC20Detailed(asset).name()
+    name: String[124] = ERC20Detailed(self._asset()).name()
     return concat("1UP ", name)
 
 @external
@@ -97,7 +101,7 @@ def symbol() -> String[64]:
     @return Gauge symbol
     @dev Based on the name of the asset inside the Yearn gauge
     """
-    symbol: String[61] = ERC20Detailed(asset).symbol()
+    symbol: String[61] = ERC20Detailed(self._asset()).symbol()
     return concat("up-", symbol)
 
 @external
@@ -108,7 +112,7 @@ def decimals() -> uint8:
     @return Gauge decimals
     @dev Same as the decimals of the asset inside the Yearn gauge
     """
-    return ERC20Detailed(asset).decimals()
+    return convert(self._decimals(), uint8)
 
 @external
 @view
@@ -117,7 +121,7 @@ def totalSupply() -> uint256:
     @notice Get the gauge total supply
     @return Gauge total supply
     """
-    return rewards.gauge_supply(self) / multiplier
+    return Rewards(self._rewards()).gauge_supply(self) / self._multiplier()
 
 @external
 @view
@@ -127,7 +131,7 @@ def balanceOf(_account: address) -> uint256:
     @param _account User
     @return Gauge balance
     """
-    return rewards.gauge_balance(self, _account) / multiplier
+    return Rewards(self._rewards()).gauge_balance(self, _account) / self._multiplier()
 
 @external
 def transfer(_to: address, _value: uint256) -> bool:
@@ -140,7 +144,7 @@ def transfer(_to: address, _value: uint256) -> bool:
     assert _to != empty(address) and _to != self
 
     if _value > 0:
-        rewards.report(ygauge, msg.sender, _to, _value * multiplier, 0)
+        Rewards(self._rewards()).report(self._ygauge(), msg.sender, _to, _value * self._multiplier(), 0)
 
     log Transfer(msg.sender, _to, _value)
     return True
@@ -161,7 +165,7 @@ def transferFrom(_from: address, _to: address, _value: uint256) -> bool:
         if allowance < max_value(uint256):
             self.allowance[_from][msg.sender] = allowance - _value
 
-        rewards.report(ygauge, _from, _to, _value * multiplier, 0)
+        Rewards(self._rewards()).report(self._ygauge(), _from, _to, _value * self._multiplier(), 0)
 
     log Transfer(_from, _to, _value)
     return True
@@ -187,7 +191,7 @@ def totalAssets() -> uint256:
     @notice Get the total amount of assets in the vault
     @return Total amount of assets
     """
-    return rewards.gauge_supply(self) / multiplier
+    return Rewards(self._rewards()).gauge_supply(self) / self._multiplier()
 
 @view
 @external
@@ -279,7 +283,7 @@ def maxWithdraw(_owner: address) -> uint256:
     @param _owner User withdrawing
     @return Maximum amount of assets that can be withdrawn
     """
-    return rewards.gauge_balance(self, _owner) / multiplier
+    return Rewards(self._rewards()).gauge_balance(self, _owner) / self._multiplier()
 
 @view
 @external
@@ -311,7 +315,7 @@ def maxRedeem(_owner: address) -> uint256:
     @param _owner User redeeming
     @return Maximum amount of shares that can be redeemed
     """
-    return rewards.gauge_balance(self, _owner) / multiplier
+    return Rewards(self._rewards()).gauge_balance(self, _owner) / self._multiplier()
 
 @view
 @external
@@ -344,9 +348,9 @@ def _deposit(_assets: uint256, _receiver: address):
     """
     assert _assets > 0
     pending: uint256 = self._pending()
-    rewards.report(ygauge, empty(address), _receiver, _assets * multiplier, pending)
-    assert ERC20(asset).transferFrom(msg.sender, self, _assets, default_return_value=True)
-    ERC4626(ygauge).deposit(_assets, proxy)
+    Rewards(self._rewards()).report(self._ygauge(), empty(address), _receiver, _assets * self._multiplier(), pending)
+    assert ERC20(self._asset()).transferFrom(msg.sender, self, _assets, default_return_value=True)
+    ERC4626(self._ygauge()).deposit(_assets, self._proxy())
     log Deposit(msg.sender, _receiver, _assets, _assets)
     log Transfer(empty(address), _receiver, _assets)
 
@@ -364,8 +368,8 @@ def _withdraw(_assets: uint256, _receiver: address, _owner: address):
         if allowance < max_value(uint256):
             self.allowance[_owner][msg.sender] = allowance - _assets
     pending: uint256 = self._pending()
-    rewards.report(ygauge, _owner, empty(address), _assets * multiplier, pending)
-    ERC4626(ygauge).withdraw(_assets, _receiver, proxy)
+    Rewards(self._rewards()).report(self._ygauge(), _owner, empty(address), _assets * self._multiplier(), pending)
+    ERC4626(self._ygauge()).withdraw(_assets, _receiver, self._proxy())
     log Withdraw(msg.sender, _receiver, _owner, _assets, _assets)
     log Transfer(_owner, empty(address), _assets)
 
@@ -374,5 +378,45 @@ def _pending() -> uint256:
     """
     @notice Claim rewards from the Yearn gauge and return reward balance
     """
-    YearnGauge(ygauge).getReward(proxy)
-    return reward_token.balanceOf(self)
+    YearnGauge(self._ygauge()).getReward(self._proxy())
+    return ERC20(self._reward_token()).balanceOf(self)
+
+# configuration, read from immutables. `GaugeClone` reads it from its code instead
+
+@internal
+@view
+def _ygauge() -> address:
+    return ygauge
+
+@internal
+@view
+def _proxy() -> address:
+    return proxy
+
+@internal
+@view
+def _reward_token() -> address:
+    return reward_token.address
+
+@internal
+@view
+def _rewards() -> address:
+    return rewards.address
+
+@internal
+@view
+def _asset() -> address:
+    return asset
+
+@internal
+@view
+def _multiplier() -> uint256:
+    """
+    @notice Multiplier to convert gauge amounts to 18 decimals
+    """
+    return multiplier
+
+@internal
+@view
+def _decimals() -> uint256:
+    return convert(ERC20Detailed(asset).decimals(), uint256)
@@ -0,0 +1,484 @@
+# @version 0.3.10
+"""
+@title Gauge clone
+@author 1up
+@license GNU AGPLv3
+@notice
+    Implementation contract for minimal proxy gauges, functionally identical to `Gauge`.
+    Instead of immutables, each clone stores its configuration in its own code,
+    appended after the minimal proxy bytecode. The configuration is read back
+    by copying the code of the clone.
+    Clones are deployed and initialized by the factory.
+    This contract is a copy of `Gauge` apart from its configuration and initialization,
+    any change made to either contract has to be made to both. The gauge tests
+    check that the shared code is identical, and that both expose the same interface
+    and end up in the same state.
+"""
+
+from vyper.interfaces import ERC20
+from vyper.interfaces import ERC4626
+implements: ERC20
+implements: ERC4626
+
+interface ERC20Detailed:
+    def name() -> String[124]: view
+    def symbol() -> String[61]: view
+
+interface YearnGauge:
+    def getReward(_account: address): nonpayable
+
+interface Rewards:
+    def report(_ygauge: address, _from: address, _to: address, _amount: uint256, _rewards: uint256): nonpayable
+    def gauge_supply(_gauge: address) -> uint256: view
+    def gauge_balance(_gauge: address, _account: address) -> uint256: view
+
+factory: public(immutable(address))
+allowance: public(HashMap[address, HashMap[address, uint256]])
+
+event Transfer:
+    sender: indexed(address)
+    receiver: indexed(address)
+    value: uint256
+
+event Approval:
+    owner: indexed(address)
+    spender: indexed(address)
+    value: uint256
+
+event Deposit:
+    sender: indexed(address)
+    owner: indexed(address)
+    assets: uint256
+    shares: uint256
+
+event Withdraw:
+    sender: indexed(address)
+    receiver: indexed(address)
+    owner: indexed(address)
+    assets: uint256
+    shares: uint256
+
+# clone code: minimal proxy | ygauge | proxy | reward token | rewards | asset | decimals
+PROXY_SIZE: constant(uint256) = 45
+YGAUGE_OFFSET: constant(uint256) = PROXY_SIZE
+PROXY_OFFSET: constant(uint256) = PROXY_SIZE + 20
+REWARD_TOKEN_OFFSET: constant(uint256) = PROXY_SIZE + 40
+REWARDS_OFFSET: constant(uint256) = PROXY_SIZE + 60
+ASSET_OFFSET: constant(uint256) = PROXY_SIZE + 80
+DECIMALS_OFFSET: constant(uint256) = PROXY_SIZE + 100
+
+@external
+def __init__(_factory: address):
+    """
+    @notice Constructor
+    @param _factory Factory that is allowed to initialize clones
+    """
+    factory = _factory
+
+@external
+def initialize():
+    """
+    @notice Initialize a clone by setting the required approvals
+    @dev Can only be called by the factory, immediately after deployment of the clone
+    """
+    assert msg.sender == factory
+    assert ERC20(self._reward_token()).approve(self._rewards(), max_value(uint256), default_return_value=True)
+    assert ERC20(self._asset()).approve(self._ygauge(), max_value(uint256), default_return_value=True)
+    log Transfer(empty(address), msg.sender, 0)
+
+@external
+@view
+def asset() -> address:
+    """
+    @notice Get the asset inside the Yearn gauge
+    @return Asset address
+    """
+    return self._asset()
+
+@external
+@view
+def ygauge() -> address:
+    """
+    @notice Get the Yearn gauge
+    @return Yearn gauge address
+    """
+    return self._ygauge()
+
+@external
+@view
+def proxy() -> address:
+    """
+    @notice Get the proxy
+    @return Proxy address
+    """
+    return self._proxy()
+
+@external
+@view
+def reward_token() -> address:
+    """
+    @notice Get the reward token
+    @return Reward token address
+    """
+    return self._reward_token()
+
+@external
+@view
+def rewards() -> address:
+    """
+    @notice Get the rewards contract
+    @return Rewards contract address
+    """
+    return self._rewards()
+
+@external
+@view
+def name() -> String[128]:
+    """
+    @notice Get the gauge name
+    @return Gauge name
+    @dev Based on the name of the asset inside the Yearn gauge
+    """
+    name: String[124] = ERC20Detailed(self._asset()).name()
+    return concat("1UP ", name)
+
+@external
+@view
+def symbol() -> String[64]:
+    """
+    @notice Get the gauge symbol
+    @return Gauge symbol
+    @dev Based on the name of the asset inside the Yearn gauge
+    """
+    symbol: String[61] = ERC20Detailed(self._asset()).symbol()
+    return concat("up-", symbol)
+
+@external
+@view
+def decimals() -> uint8:
+    """
+    @notice Get the gauge decimals
+    @return Gauge decimals
+    @dev Same as the decimals of the asset inside the Yearn gauge
+    """
+    return convert(self._decimals(), uint8)
+
+@external
+@view
+def totalSupply() -> uint256:
+    """
+    @notice Get the gauge total supply
+    @return Gauge total supply
+    """
+    return Rewards(self._rewards()).gauge_supply(self) / self._multiplier()
+
+@external
+@view
+def balanceOf(_account: address) -> uint256:
+    """
+    @notice Get the gauge balance of a user
+    @param _account User
+    @return Gauge balance
+    """
+    return Rewards(self._rewards()).gauge_balance(self, _account) / self._multiplier()
+
+@external
+def transfer(_to: address, _value: uint256) -> bool:
+    """
+    @notice Transfer gauge tokens to another user
+    @param _to User to transfer gauge tokens to
+    @param _value Amount of gauge tokens to transfer
+    @return Always True
+    """
+    assert _to != empty(address) and _to != self
+
+    if _value > 0:
+        Rewards(self._rewards()).report(self._ygauge(), msg.sender, _to, _value * self._multiplier(), 0)
+
+    log Transfer(msg.sender, _to, _value)
+    return True
+
+@external
+def transferFrom(_from: address, _to: address, _value: uint256) -> bool:
+    """
+    @notice Transfer another user's gauge tokens by spending an allowance
+    @param _from User to transfer gauge tokens from
+    @param _to User to transfer gauge tokens to
+    @param _value Amount of gauge tokens to transfer
+    @return Always True
+    """
+    assert _to != empty(address) and _to != self
+
+    if _value > 0:
+        allowance: uint256 = self.allowance[_from][msg.sender]
+        if allowance < max_value(uint256):
+            self.allowance[_from][msg.sender] = allowance - _value
+
+        Rewards(self._rewards()).report(self._ygauge(), _from, _to, _value * self._multiplier(), 0)
+
+    log Transfer(_from, _to, _value)
+    return True
+
+@external
+def approve(_spender: address, _value: uint256) -> bool:
+    """
+    @notice Approve spending of the caller's gauge tokens
+    @param _spender User that is allowed to spend caller's tokens
+    @param _value Amount of tokens spender is allowed to spend
+    @return Always True
+    """
+    assert _spender != empty(address)
+
+    self.allowance[msg.sender][_spender] = _value
+    log Approval(msg.sender, _spender, _value)
+    return True
+
+@view
+@external
+def totalAssets() -> uint256:
+    """
+    @notice Get the total amount of assets in the vault
+    @return Total amount of assets
+    """
+    return Rewards(self._rewards()).gauge_supply(self) / self._multiplier()
+
+@view
+@external
+def convertToShares(_assets: uint256) -> uint256:
+    """
+    @notice Convert an amount of assets to shares
+    @param _assets Amount of assets
+    @return Amount of shares
+    """
+    return _assets
+
+@view
+@external
+def convertToAssets(_shares: uint256) -> uint256:
+    """
+    @notice Convert an amount of shares to assets
+    @param _shares Amount of shares
+    @return Amount of assets
+    """
+    return _shares
+
+@view
+@external
+def maxDeposit(_owner: address) -> uint256:
+    """
+    @notice Get the maximum amount of assets a user can deposit
+    @param _owner User depositing
+    @return Maximum amount of assets that can be deposited
+    """
+    return max_value(uint256)
+
+@view
+@external
+def previewDeposit(_assets: uint256) -> uint256:
+    """
+    @notice Preview a deposit
+    @param _assets Amount of assets to be deposited
+    @return Equivalent amount of shares to be minted
+    """
+    return _assets
+
+@external
+def deposit(_assets: uint256, _receiver: address = msg.sender) -> uint256:
+    """
+    @notice Deposit assets
+    @param _assets Amount of assets to deposit
+    @param _receiver Recipient of the shares
+    @return Amount of shares minted
+    """
+    self._deposit(_assets, _receiver)
+    return _assets
+
+@view
+@external
+def maxMint(_owner: address) -> uint256:
+    """
+    @notice Get the maximum amount of shares a user can mint
+    @param _owner User minting
+    @return Maximum amount of shares that can be minted
+    """
+    return max_value(uint256)
+
+@view
+@external
+def previewMint(_shares: uint256) -> uint256:
+    """
+    @notice Preview a mint
+    @param _shares Amount of shares to be minted
+    @return Equivalent amount of assets to be deposited
+    """
+    return _shares
+
+@external
+def mint(_shares: uint256, _receiver: address = msg.sender) -> uint256:
+    """
+    @notice Mint shares
+    @param _shares Amount of shares to mint
+    @param _receiver Recipient of the shares
+    @return Amount of assets deposited
+    """
+    self._deposit(_shares, _receiver)
+    return _shares
+
+@view
+@external
+def maxWithdraw(_owner: address) -> uint256:
+    """
+    @notice Get the maximum amount of assets a user can withdraw
+    @param _owner User withdrawing
+    @return Maximum amount of assets that can be withdrawn
+    """
+    return Rewards(self._rewards()).gauge_balance(self, _owner) / self._multiplier()
+
+@view
+@external
+def previewWithdraw(_assets: uint256) -> uint256:
+    """
+    @notice Preview a withdrawal
+    @param _assets Amount of assets to be withdrawn
+    @return Equivalent amount of shares to be burned
+    """
+    return _assets
+
+@external
+def withdraw(_assets: uint256, _receiver: address = msg.sender, _owner: address = msg.sender) -> uint256:
+    """
+    @notice Withdraw assets
+    @param _assets Amount of assets to withdraw
+    @param _receiver Recipient of the assets
+    @param _owner Owner of the shares
+    @return Amount of shares redeemed
+    """
+    self._withdraw(_assets, _receiver, _owner)
+    return _assets
+
+@view
+@external
+def maxRedeem(_owner: address) -> uint256:
+    """
+    @notice Get the maximum amount of shares a user can redeem
+    @param _owner User redeeming
+    @return Maximum amount of shares that can be redeemed
+    """
+    return Rewards(self._rewards()).gauge_balance(self, _owner) / self._multiplier()
+
+@view
+@external
+def previewRedeem(_shares: uint256) -> uint256:
+    """
+    @notice Preview a redemption
+    @param _shares Amount of shares to be redeemed
+    @return Equivalent amount of assets to be withdrawn
+    """
+    return _shares
+
+@external
+def redeem(_shares: uint256, _receiver: address = msg.sender, _owner: address = msg.sender) -> uint256:
+    """
+    @notice Redeem shares
+    @param _shares Amount of shares to redeem
+    @param _receiver Recipient of the assets
+    @param _owner Owner of the shares
+    @return Amount of assets withdrawn
+    """
+    self._withdraw(_shares, _receiver, _owner)
+    return _shares
+
+@internal
+def _deposit(_assets: uint256, _receiver: address):
+    """
+    @notice
+        Handle a deposit by claiming rewards, reporting to the rewards contract
+        and transferring tokens from the caller to the proxy
+    """
+    assert _assets > 0
+    pending: uint256 = self._pending()
+    Rewards(self._rewards()).report(self._ygauge(), empty(address), _receiver, _assets * self._multiplier(), pending)
+    assert ERC20(self._asset()).transferFrom(msg.sender, self, _assets, default_return_value=True)
+    ERC4626(self._ygauge()).deposit(_assets, self._proxy())
+    log Deposit(msg.sender, _receiver, _assets, _assets)
+    log Transfer(empty(address), _receiver, _assets)
+
+@internal
+def _withdraw(_assets: uint256, _receiver: address, _owner: address):
+    """
+    @notice
+        Handle a withdrawal by claiming rewards, reporting to the rewards contract
+        and transferring tokens from the proxy to the receiver
+    """
+    assert _assets > 0
+    assert _receiver != empty(address) and _receiver != self
+    if _owner != msg.sender:
+        allowance: uint256 = self.allowance[_owner][msg.sender]
+        if allowance < max_value(uint256):
+            self.allowance[_owner][msg.sender] = allowance - _assets
+    pending: uint256 = self._pending()
+    Rewards(self._rewards()).report(self._ygauge(), _owner, empty(address), _assets * self._multiplier(), pending)
+    ERC4626(self._ygauge()).withdraw(_assets, _receiver, self._proxy())
+    log Withdraw(msg.sender, _receiver, _owner, _assets, _assets)
+    log Transfer(_owner, empty(address), _assets)
+
+@internal
+def _pending() -> uint256:
+    """
+    @notice Claim rewards from the Yearn gauge and return reward balance
+    """
+    YearnGauge(self._ygauge()).getReward(self._proxy())
+    return ERC20(self._reward_token()).balanceOf(self)
+
+# configuration, read from the code of the clone
+
+@internal
+@view
+def _ygauge() -> address:
+    return self._address_arg(YGAUGE_OFFSET)
+
+@internal
+@view
+def _proxy() -> address:
+    return self._address_arg(PROXY_OFFSET)
+
+@internal
+@view
+def _reward_token() -> address:
+    return self._address_arg(REWARD_TOKEN_OFFSET)
+
+@internal
+@view
+def _rewards() -> address:
+    return self._address_arg(REWARDS_OFFSET)
+
+@internal
+@view
+def _asset() -> address:
+    return self._address_arg(ASSET_OFFSET)
+
+@internal
+@view
+def _multiplier() -> uint256:
+    """
+    @notice Multiplier to convert gauge amounts to 18 decimals
+    """
+    return 10**(18 - self._decimals())
+
+@internal
+@view
+def _decimals() -> uint256:
+    clone: address = self
+    return convert(slice(clone.code, DECIMALS_OFFSET, 1), uint256)
+
+@internal
+@view
+def _address_arg(_offset: uint256) -> address:
+    """
+    @notice Read an address from the configuration in the code of the clone
+    @dev 
+        Code is copied from the clone address explicitly, since `self.code` copies
+        the code of the implementation when called through the proxy
+    """
+    clone: address = self
+    return convert(convert(slice(clone.code, _offset, 20), bytes20), address)
@@ -0,0 +1,79 @@
+# @version 0.3.10
+"""
+@title Gauge lens
+@author 1up
+@license GNU AGPLv3
+@notice
+    Read-only aggregation of the registered gauges and their reward state.
+    Allows off-chain consumers to retrieve the state of many gauges in a single call.
+"""
+
+from vyper.interfaces import ERC20
+
+struct GaugeInfo:
+    gauge: address
+    ygauge: address
+    idx: uint256
+
+struct GaugeState:
+    gauge: address
+    ygauge: address
+    idx: uint256
+    supply: uint256
+    pending: uint256
+
+interface Registry:
+    def proxy() -> address: view
+    def gauges_page(_start: uint256, _count: uint256) -> DynArray[GaugeInfo, MAX_PAGE_SIZE]: view
+
+interface YearnGauge:
+    def earned(_account: address) -> uint256: view
+
+interface Rewards:
+    def discount_token() -> address: view
+    def gauge_supply(_gauge: address) -> uint256: view
+
+registry: public(immutable(Registry))
+proxy: public(immutable(address))
+rewards: public(immutable(Rewards))
+reward_token: public(immutable(ERC20))
+
+MAX_PAGE_SIZE: constant(uint256) = 256
+
+@external
+def __init__(_registry: address, _rewards: address):
+    """
+    @notice Constructor
+    @param _registry Registry
+    @param _rewards Gauge rewards contract
+    """
+    registry = Registry(_registry)
+    proxy = registry.proxy()
+    rewards = Rewards(_rewards)
+    reward_token = ERC20(rewards.discount_token())
+
+@external
+@view
+def gauges_page(_start: uint256, _count: uint256) -> DynArray[GaugeState, MAX_PAGE_SIZE]:
+    """
+    @notice Get a page of registered gauges along with their reward state
+    @param _start Index of the first gauge in the page
+    @param _count Maximum number of gauges in the page
+    @return
+        List with gauge address, Yearn gauge address, index, total supply
+        and pending (unharvested) rewards of each gauge in the page
+    @dev Supply is in 18 decimals, regardless of the decimals of the gauge
+    @dev Pending rewards are those earned by the proxy in the Yearn gauge,
+        plus those already claimed to the gauge but not yet harvested
+    """
+    gauges: DynArray[GaugeInfo, MAX_PAGE_SIZE] = registry.gauges_page(_start, _count)
+    page: DynArray[GaugeState, MAX_PAGE_SIZE] = []
+    for info in gauges:
+        page.append(GaugeState({
+            gauge: info.gauge,
+            ygauge: info.ygauge,
+            idx: info.idx,
+            supply: rewards.gauge_supply(info.gauge),
+            pending: YearnGauge(info.ygauge).earned(proxy) + reward_token.balanceOf(info.gauge)
+        }))
+    return page
@@ -0,0 +1,186 @@
+# @version 0.3.10
+"""
+@title YFI matching registry
+@author 1up
+@license GNU AGPLv3
+@notice
+    Matches locked YFI for multiple recipients, each at their own rate and up to their own cap.
+    Anyone can transfer YFI into this contract.
+    Matching for all recipients happens at once, with a single liquid locker deposit.
+    Owner can add, update and remove recipients and clawback any unmatched tokens.
+"""
+
+from vyper.interfaces import ERC20
+from vyper.interfaces import ERC4626
+
+interface LiquidLocker:
+    def token() -> address: view
+    def voting_escrow() -> address: view
+    def proxy() -> address: view
+    def deposit(_amount: uint256) -> uint256: nonpayable
+
+interface YearnVotingEscrow:
+    def locked(_account: address) -> uint256: view
+
+staking: public(immutable(ERC4626))
+liquid_locker: public(immutable(LiquidLocker))
+proxy: public(immutable(address))
+voting_escrow: public(immutable(YearnVotingEscrow))
+locking_token: public(immutable(ERC20))
+owner: public(immutable(address))
+recipients: public(DynArray[address, MAX_RECIPIENTS])
+matching_rates: public(HashMap[address, uint256])
+caps: public(HashMap[address, uint256])
+matched: public(HashMap[address, uint256])
+total_matched: public(uint256)
+
+event SetRecipient:
+    recipient: indexed(address)
+    matching_rate: uint256
+    cap: uint256
+
+event Match:
+    recipient: indexed(address)
+    amount: uint256
+    ll_amount: uint256
+
+MATCHING_SCALE: constant(uint256) = 10_000
+MAX_RECIPIENTS: constant(uint256) = 32
+
+@external
+def __init__(_staking: address, _owner: address):
+    """
+    @notice Constructor
+    @param _staking Staking contract address
+    @param _owner Matching contract owner
+    """
+    staking = ERC4626(_staking)
+    liquid_locker = LiquidLocker(staking.asset())
+    proxy = liquid_locker.proxy()
+    voting_escrow = YearnVotingEscrow(liquid_locker.voting_escrow())
+    locking_token = ERC20(liquid_locker.token())
+    owner = _owner
+
+    assert locking_token.approve(liquid_locker.address, max_value(uint256), default_return_value=True)
+    assert ERC20(liquid_locker.address).approve(_staking, max_value(uint256), default_return_value=True)
+
+@external
+@view
+def num_recipients() -> uint256:
+    """
+    @notice Get the number of matching recipients
+    """
+    return len(self.recipients)
+
+@external
+@view
+def matchable(_recipient: address) -> uint256:
+    """
+    @notice Get the amount of YFI that is eligible to be newly matched for a recipient
+    @param _recipient Matching recipient
+    @return Amount of YFI, not limited by the balance of this contract
+    """
+    return self._matchable(_recipient, voting_escrow.locked(proxy) - self.total_matched)
+
+@external
+def match_all() -> (uint256, uint256):
+    """
+    @notice Matches any additional locked YFI since last call for all recipients
+    @return Tuple with newly matched YFI amount, newly matched supYFI amount
+    @dev Can only be called by owner or a matching recipient
+    @dev If the balance is insufficient, recipients are matched in order until it runs out
+    """
+    assert msg.sender == owner or self.matching_rates[msg.sender] > 0
+
+    # amount locked, excluding what is previously matched by this contract
+    locked: uint256 = voting_escrow.locked(proxy) - self.total_matched
+    available: uint256 = locking_token.balanceOf(self)
+
+    recipients: DynArray[address, MAX_RECIPIENTS] = self.recipients
+    matches: DynArray[uint256, MAX_RECIPIENTS] = []
+    total: uint256 = 0
+    for recipient in recipients:
+        match: uint256 = min(self._matchable(recipient, locked), available - total)
+        matches.append(match)
+        total += match
+    assert total > 0
+    self.total_matched += total
+
+    ll_total: uint256 = liquid_locker.deposit(total)
+    assert ll_total > 0
+
+    # split liquid locker tokens proportionally, last recipient with a match receives the remainder
+    ll_left: uint256 = ll_total
+    left: uint256 = total
+    for i in range(MAX_RECIPIENTS):
+        if i == len(recipients):
+            break
+        match: uint256 = matches[i]
+        if match == 0:
+            continue
+        recipient: address = recipients[i]
+        self.matched[recipient] += match
+
+        ll_match: uint256 = ll_left
+        left -= match
+        if left > 0:
+            ll_match = ll_total * match / total
+        ll_left -= ll_match
+        assert staking.deposit(ll_match, recipient) > 0
+        log Match(recipient, match, ll_match)
+
+    return total, ll_total
+
+@external
+def set_recipient(_recipient: address, _matching_rate: uint256, _cap: uint256):
+    """
+    @notice Add or update a matching recipient
+    @param _recipient Matching recipient
+    @param _matching_rate Matching rate (bps). Zero removes the recipient
+    @param _cap Maximum total amount of YFI matched for the recipient
+    @dev Can only be called by owner
+    @dev Previously matched amounts are kept when a recipient is removed and added again
+    """
+    assert msg.sender == owner
+    assert _recipient != empty(address)
+    assert _matching_rate <= MATCHING_SCALE
+
+    if _matching_rate == 0:
+        assert self.matching_rates[_recipient] > 0
+        recipients: DynArray[address, MAX_RECIPIENTS] = self.recipients
+        last: address = recipients.pop()
+        if last != _recipient:
+            for i in range(MAX_RECIPIENTS):
+                if recipients[i] == _recipient:
+                    recipients[i] = last
+                    break
+        self.recipients = recipients
+    elif self.matching_rates[_recipient] == 0:
+        self.recipients.append(_recipient)
+
+    self.matching_rates[_recipient] = _matching_rate
+    self.caps[_recipient] = _cap
+    log SetRecipient(_recipient, _matching_rate, _cap)
+
+@external
+def revoke(_token: address, _amount: uint256):
+    """
+    @notice Send tokens back to the owner
+    @param _token Token address
+    @param _amount Amount of tokens to revoke
+    @dev Can only be called by owner
+    """
+    assert msg.sender == owner
+    assert ERC20(_token).transfer(owner, _amount, default_return_value=True)
+
+@internal
+@view
+def _matchable(_recipient: address, _locked: uint256) -> uint256:
+    """
+    @notice Amount to newly match for a recipient, given the amount locked not by this contract
+    """
+    target: uint256 = min(_locked * self.matching_rates[_recipient] / MATCHING_SCALE, self.caps[_recipient])
+    matched: uint256 = self.matched[_recipient]
+    if target <= matched:
+        return 0
+    return target - matched
@@ -18,16 +18,25 @@ voting_escrow: immutable(VotingEscrow)
 management: public(address)
 pending_management: public(address)
 operators: public(HashMap[address, bool])
-messages: public(HashMap[bytes32, bool])
+message_expiry: public(HashMap[bytes32, uint256]) # hash => timestamp at which signature expires
 
 event Call:
     operator: indexed(address)
     target: indexed(address)
 
+event CallMany:
+    operator: indexed(address)
+    calls: uint256
+    failed: uint256
+
 event SetSignedMessage:
     hash: indexed(bytes32)
     signed: bool
 
+event SetMessageExpiry:
+    hash: indexed(bytes32)
+    expiry: uint256
+
 event SetOperator:
     operator: indexed(address)
     flag: bool
@@ -38,7 +47,14 @@ event PendingManagement:
 event SetManagement:
     management: address
 
+struct Result:
+    success: bool
+    data: Bytes[MAX_RETURN_SIZE]
+
 MAX_SIZE: constant(uint256) = 1024
+MAX_CALLS: constant(uint256) = 32
+MAX_RETURN_SIZE: constant(uint256) = 256
+MAX_MESSAGES: constant(uint256) = 256
 EIP1271_MAGIC_VALUE: constant(bytes4) = 0x1626ba7e
 
 @external
@@ -59,10 +75,21 @@ def isValidSignature(_hash: bytes32, _signature: Bytes[128]) -> bytes4:
     @param _hash Hash of message
     @param _signature Signature, unused
     @return EIP-1271 magic value
+    @dev Messages are only valid until their expiry
     """
-    assert self.messages[_hash] and len(_signature) == 0
+    assert self.message_expiry[_hash] > block.timestamp and len(_signature) == 0
     return EIP1271_MAGIC_VALUE
 
+@external
+@view
+def messages(_hash: bytes32) -> bool:
+    """
+    @notice Check whether a message is signed and has not expired
+    @param _hash Hash of message
+    @return True: signed, False: not signed
+    """
+    return self.message_expiry[_hash] > block.timestamp
+
 @external
 @payable
 def call(_target: address, _data: Bytes[MAX_SIZE]):
@@ -76,6 +103,54 @@ def call(_target: address, _data: Bytes[MAX_SIZE]):
     raw_call(_target, _data, value=msg.value)
     log Call(msg.sender, _target)
 
+@external
+@payable
+def call_many(
+    _targets: DynArray[address, MAX_CALLS],
+    _data: DynArray[Bytes[MAX_SIZE], MAX_CALLS],
+    _values: DynArray[uint256, MAX_CALLS],
+    _allow_failure: DynArray[bool, MAX_CALLS]
+) -> DynArray[Result, MAX_CALLS]:
+    """
+    @notice Call multiple contracts through the proxy in a single transaction
+    @param _targets Contracts to call
+    @param _data Calldata for each call
+    @param _values ETH value to send along with each call
+    @param _allow_failure
+        For each call, True: failure is recorded in the result, 
+        False: failure reverts the entire batch
+    @return Success flag and return data of each call, truncated to `MAX_RETURN_SIZE` bytes
+    @dev Can only be called by operators
+    @dev Sum of values has to equal the ETH sent along
+    """
+    assert self.operators[msg.sender]
+    num: uint256 = len(_targets)
+    assert len(_data) == num and len(_values) == num and len(_allow_failure) == num
+
+    results: DynArray[Result, MAX_CALLS] = []
+    total: uint256 = 0
+    failed: uint256 = 0
+    for i in range(MAX_CALLS):
+        if i == num:
+            break
+        total += _values[i]
+        success: bool = True
+        response: Bytes[MAX_RETURN_SIZE] = b""
+        if _allow_failure[i]:
+            success, response = raw_call(
+                _targets[i], _data[i], max_outsize=MAX_RETURN_SIZE, value=_values[i], revert_on_failure=False
+            )
+            if not success:
+                failed += 1
+        else:
+            # reverts with the full revert data of the call
+            response = raw_call(_targets[i], _data[i], max_outsize=MAX_RETURN_SIZE, value=_values[i])
+        results.append(Result({success: success, data: response}))
+
+    assert total == msg.value
+    log CallMany(msg.sender, num, failed)
+    return results
+
 @external
 def modify_lock(_amount: uint256, _unlock_time: uint256):
     """
@@ -88,17 +163,36 @@ def modify_lock(_amount: uint256, _unlock_time: uint256):
     voting_escrow.modify_lock(_amount, _unlock_time)
 
 @external
-def set_signed_message(_hash: bytes32, _signed: bool):
+def set_signed_message(_hash: bytes32, _signed: bool, _expiry: uint256 = max_value(uint256)):
     """
     @notice Mark a message as signed
     @param _hash Message hash
     @param _signed True: signed, False; not signed
+    @param _expiry Timestamp at which the signature expires, defaults to never
     @dev Can only be called by operators
     """
     assert self.operators[msg.sender]
-    assert _hash != empty(bytes32)
-    self.messages[_hash] = _signed
-    log SetSignedMessage(_hash, _signed)
+    self._set_signed_message(_hash, _signed, _expiry)
+
+@external
+def set_signed_messages(
+    _hashes: DynArray[bytes32, MAX_MESSAGES], 
+    _signed: DynArray[bool, MAX_MESSAGES], 
+    _expiry: uint256 = max_value(uint256)
+):
+    """
+    @notice Mark multiple messages as signed or unsigned
+    @param _hashes Message hashes
+    @param _signed For each message, True: signed, False; not signed
+    @param _expiry Timestamp at which the signatures expire, defaults to never
+    @dev Can only be called by operators
+    """
+    assert self.operators[msg.sender]
+    assert len(_hashes) == len(_signed)
+    for i in range(MAX_MESSAGES):
+        if i == len(_hashes):
+            break
+        self._set_signed_message(_hashes[i], _signed[i], _expiry)
 
 @external
 def set_operator(_operator: address, _flag: bool):
@@ -136,3 +230,18 @@ def accept_management():
     self.pending_management = empty(address)
     self.management = msg.sender
     log SetManagement(msg.sender)
+
+@internal
+def _set_signed_message(_hash: bytes32, _signed: bool, _expiry: uint256):
+    """
+    @notice Store the expiry of a signed message, or clear it when unsigned
+    """
+    assert _hash != empty(bytes32)
+    expiry: uint256 = 0
+    if _signed:
+        assert _expiry > block.timestamp
+        expiry = _expiry
+    self.message_expiry[_hash] = expiry
+    log SetSignedMessage(_hash, _signed)
+    if _signed:
+        log SetMessageExpiry(_hash, expiry)
@@ -19,8 +19,18 @@ implements: Registry
 interface Gauge:
     def ygauge() -> address: view
 
+struct GaugeInfo:
+    gauge: address
+    ygauge: address
+    idx: uint256
+
 interface Proxy:
-    def call(_target: address, _data: Bytes[68]): nonpayable
+    def call_many(
+        _targets: DynArray[address, MAX_PROXY_CALLS],
+        _data: DynArray[Bytes[68], MAX_PROXY_CALLS],
+        _values: DynArray[uint256, MAX_PROXY_CALLS],
+        _allow_failure: DynArray[bool, MAX_PROXY_CALLS]
+    ): nonpayable
 
 proxy: public(immutable(Proxy))
 management: public(address)
@@ -30,9 +40,14 @@ registrar: public(address)
 num_gauges: public(uint256)
 ygauges: public(address[MAX_NUM_GAUGES])
 gauge_map: public(HashMap[address, address]) # ygauge => gauge
+packed_gauges: public(HashMap[address, uint256]) # gauge => idx | ygauge
 
 MAX_NUM_GAUGES: constant(uint256) = 99999
+MAX_PAGE_SIZE: constant(uint256) = 256
+MAX_BATCH_SIZE: constant(uint256) = 16
+MAX_PROXY_CALLS: constant(uint256) = 2 * MAX_BATCH_SIZE
 YGAUGE_DISABLED: constant(address) = 0x0000000000000000000000000000000000000001
+YGAUGE_MASK: constant(uint256) = 2**160 - 1
 
 event Register:
     gauge: indexed(address)
@@ -84,6 +99,29 @@ def gauges(_idx: uint256) -> address:
     assert ygauge != empty(address)
     return self.gauge_map[ygauge]
 
+@external
+@view
+def gauges_page(_start: uint256, _count: uint256) -> DynArray[GaugeInfo, MAX_PAGE_SIZE]:
+    """
+    @notice Get a page of registered gauges
+    @param _start Index of the first gauge in the page
+    @param _count Maximum number of gauges in the page
+    @return List with gauge address, Yearn gauge address and index of each gauge in the page
+    @dev Page is cut short if it extends beyond the last gauge
+    """
+    page: DynArray[GaugeInfo, MAX_PAGE_SIZE] = []
+    num_gauges: uint256 = self.num_gauges
+    if _start >= num_gauges:
+        return page
+
+    for i in range(MAX_PAGE_SIZE):
+        idx: uint256 = _start + i
+        if i == _count or idx == num_gauges:
+            break
+        ygauge: address = self.ygauges[idx]
+        page.append(GaugeInfo({gauge: self.gauge_map[ygauge], ygauge: ygauge, idx: idx}))
+    return page
+
 @external
 @view
 def gauge_registered(_gauge: address) -> bool:
@@ -92,8 +130,30 @@ def gauge_registered(_gauge: address) -> bool:
     @param _gauge Gauge address
     @return True: gauge is registered, False: gauge is not registered
     """
-    ygauge: address = Gauge(_gauge).ygauge()
-    return self.gauge_map[ygauge] == _gauge
+    return self.packed_gauges[_gauge] != 0
+
+@external
+@view
+def gauge_ygauge(_gauge: address) -> address:
+    """
+    @notice Get the Yearn gauge of a registered gauge
+    @param _gauge Gauge address
+    @return Yearn gauge address, zero if the gauge is not registered
+    """
+    return self._unpack_gauge(self.packed_gauges[_gauge])[0]
+
+@external
+@view
+def gauge_index(_gauge: address) -> uint256:
+    """
+    @notice Get the index of a registered gauge
+    @param _gauge Gauge address
+    @return Index of the gauge
+    @dev Reverts if the gauge is not registered
+    """
+    packed: uint256 = self.packed_gauges[_gauge]
+    assert packed != 0
+    return self._unpack_gauge(packed)[1]
 
 @external
 @view
@@ -116,50 +176,42 @@ def register(_gauge: address) -> uint256:
     @dev The underlying Yearn gauge cannot already be in the registry
     """
     assert msg.sender == self.registrar
-    ygauge: address = Gauge(_gauge).ygauge()
-    assert ygauge != empty(address)
-    assert self.gauge_map[ygauge] == empty(address)
-
-    idx: uint256 = self.num_gauges
-    assert idx < MAX_NUM_GAUGES
-    self.num_gauges = idx + 1
-    self.ygauges[idx] = ygauge
-    self.gauge_map[ygauge] = _gauge
-
-    # approve gauge to transfer ygauge tokens out of proxy
-    data: Bytes[68] = _abi_encode(_gauge, max_value(uint256), method_id=method_id("approve(address,uint256)"))
-    proxy.call(ygauge, data)
+    return self._register([_gauge])[0]
 
-    # set gauge as recipient of rewards
-    data = _abi_encode(_gauge, method_id=method_id("setRecipient(address)"))
-    proxy.call(ygauge, data)
-
-    log Register(_gauge, ygauge, idx)
-    return idx
+@external
+def register_many(_gauges: DynArray[address, MAX_BATCH_SIZE]) -> DynArray[uint256, MAX_BATCH_SIZE]:
+    """
+    @notice Register multiple gauges
+    @param _gauges Gauge addresses
+    @return Indices of the newly registered gauges
+    @dev Can only be called by the registrar
+    @dev The underlying Yearn gauges cannot already be in the registry
+    """
+    assert msg.sender == self.registrar
+    return self._register(_gauges)
 
 @external
-def deregister(_gauge: address, _idx: uint256):
+def deregister(_gauge: address):
     """
     @notice Deregister a gauge
     @param _gauge Gauge address
-    @param _idx Gauge index
     @dev Can only be called by management
     """
     assert msg.sender == self.management
-    ygauge: address = Gauge(_gauge).ygauge()
-    assert self.gauge_map[ygauge] == _gauge
-    assert self.ygauges[_idx] == ygauge
+    self.num_gauges = self._deregister(_gauge, self.num_gauges)
 
-    # swap last entry in array with the one being deleted
-    # and shorten array by one
-    max_idx: uint256 = self.num_gauges - 1
-    self.num_gauges = max_idx
-    log Deregister(_gauge, ygauge, _idx)
-    if _idx != max_idx:
-        self.ygauges[_idx] = self.ygauges[max_idx]
-        log NewIndex(max_idx, _idx)
-    self.ygauges[max_idx] = empty(address)
-    self.gauge_map[ygauge] = empty(address)
+@external
+def deregister_many(_gauges: DynArray[address, MAX_BATCH_SIZE]):
+    """
+    @notice Deregister multiple gauges
+    @param _gauges Gauge addresses
+    @dev Can only be called by management
+    """
+    assert msg.sender == self.management
+    num_gauges: uint256 = self.num_gauges
+    for gauge in _gauges:
+        num_gauges = self._deregister(gauge, num_gauges)
+    self.num_gauges = num_gauges
 
 @external
 @view
@@ -223,3 +275,87 @@ def accept_management():
     self.pending_management = empty(address)
     self.management = msg.sender
     log SetManagement(msg.sender)
+
+@internal
+def _register(_gauges: DynArray[address, MAX_BATCH_SIZE]) -> DynArray[uint256, MAX_BATCH_SIZE]:
+    """
+    @notice Add gauges to the registry and configure them in the proxy using a single proxy call
+    """
+    idx: uint256 = self.num_gauges
+    indices: DynArray[uint256, MAX_BATCH_SIZE] = []
+    targets: DynArray[address, MAX_PROXY_CALLS] = []
+    data: DynArray[Bytes[68], MAX_PROXY_CALLS] = []
+    values: DynArray[uint256, MAX_PROXY_CALLS] = []
+    allow_failure: DynArray[bool, MAX_PROXY_CALLS] = []
+
+    for gauge in _gauges:
+        ygauge: address = Gauge(gauge).ygauge()
+        assert ygauge != empty(address)
+        assert self.gauge_map[ygauge] == empty(address)
+        assert self.packed_gauges[gauge] == 0
+        assert idx < MAX_NUM_GAUGES
+
+        self.ygauges[idx] = ygauge
+        self.gauge_map[ygauge] = gauge
+        self.packed_gauges[gauge] = self._pack_gauge(ygauge, idx)
+
+        # approve gauge to transfer ygauge tokens out of proxy
+        targets.append(ygauge)
+        data.append(_abi_encode(gauge, max_value(uint256), method_id=method_id("approve(address,uint256)")))
+
+        # set gauge as recipient of rewards
+        targets.append(ygauge)
+        data.append(_abi_encode(gauge, method_id=method_id("setRecipient(address)")))
+
+        log Register(gauge, ygauge, idx)
+        indices.append(idx)
+        idx += 1
+
+    self.num_gauges = idx
+    for target in targets:
+        values.append(0)
+        allow_failure.append(False)
+    proxy.call_many(targets, data, values, allow_failure)
+    return indices
+
+@internal
+def _deregister(_gauge: address, _num_gauges: uint256) -> uint256:
+    """
+    @notice
+        Remove a gauge from the registry and return the new number of gauges.
+        Number of gauges should be updated by the caller
+    """
+    ygauge: address = empty(address)
+    idx: uint256 = 0
+    ygauge, idx = self._unpack_gauge(self.packed_gauges[_gauge])
+    assert ygauge != empty(address)
+
+    # swap last entry in array with the one being deleted
+    # and shorten array by one
+    max_idx: uint256 = _num_gauges - 1
+    log Deregister(_gauge, ygauge, idx)
+    if idx != max_idx:
+        last: address = self.ygauges[max_idx]
+        self.ygauges[idx] = last
+        self.packed_gauges[self.gauge_map[last]] = self._pack_gauge(last, idx)
+        log NewIndex(max_idx, idx)
+    self.ygauges[max_idx] = empty(address)
+    self.gauge_map[ygauge] = empty(address)
+    self.packed_gauges[_gauge] = 0
+    return max_idx
+
+@internal
+@pure
+def _pack_gauge(_ygauge: address, _idx: uint256) -> uint256:
+    """
+    @notice Pack Yearn gauge and index in a single slot
+    """
+    return convert(_ygauge, uint256) | _idx << 160
+
+@internal
+@pure
+def _unpack_gauge(_packed: uint256) -> (address, uint256):
+    """
+    @notice Unpack Yearn gauge and index from a single slot
+    """
+    return convert(_packed & YGAUGE_MASK, address), _packed >> 160
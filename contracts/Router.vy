@@ -0,0 +1,143 @@
+# @version 0.3.10
+"""
+@title Router
+@author 1up
+@license GNU AGPLv3
+@notice
+    Chains actions into 1UP in a single transaction:
+        - Deposit YFI into the liquid locker
+        - Stake upYFI
+        - Redeem the caller's unstaked upYFI
+        - Zap the underlying token of a yvault into a 1UP gauge
+    Each action takes its input either from the caller or from the output of the previous actions.
+    Outputs are held by the router only for the duration of the transaction, anything left
+    after the final action is sent to the receiver.
+    The router never acts on a position it was not given tokens or an allowance for: redeeming
+    spends the caller's staking allowance. Locking and claiming staking rewards can only be
+    done by the account itself and are not supported.
+    Can be used as depositor inside `VestingEscrowFactory`.
+"""
+
+from vyper.interfaces import ERC20
+from vyper.interfaces import ERC4626
+
+interface Depositor:
+    def deposit(_amount: uint256) -> uint256: nonpayable
+implements: Depositor
+
+interface LiquidLocker:
+    def token() -> address: view
+    def deposit(_amount: uint256, _receiver: address) -> uint256: nonpayable
+
+interface Staking:
+    def asset() -> address: view
+    def deposit(_assets: uint256, _receiver: address) -> uint256: nonpayable
+    def redeem(_shares: uint256, _receiver: address, _owner: address) -> uint256: nonpayable
+    def maxRedeem(_owner: address) -> uint256: view
+
+interface Zap:
+    def deposit(_gauge: address, _assets: uint256) -> uint256: nonpayable
+
+struct Action:
+    action: uint256
+    amount: uint256
+    target: address
+    data: Bytes[256]
+
+staking: public(immutable(Staking))
+zap: public(immutable(Zap))
+liquid_locker: public(immutable(LiquidLocker))
+locking_token: public(immutable(ERC20))
+
+event Execute:
+    account: indexed(address)
+    receiver: indexed(address)
+    num_actions: uint256
+
+DEPOSIT: constant(uint256) = 0 # YFI -> upYFI
+STAKE: constant(uint256) = 1 # upYFI -> supYFI, to receiver
+REDEEM: constant(uint256) = 2 # caller's unstaked supYFI -> upYFI
+ZAP: constant(uint256) = 3 # underlying -> 1UP gauge token, to receiver. target is the gauge
+MAX_ACTIONS: constant(uint256) = 16
+BALANCE: constant(uint256) = max_value(uint256)
+
+@external
+def __init__(_staking: address, _zap: address):
+    """
+    @notice Constructor
+    @param _staking supYFI address
+    @param _zap Zap contract address
+    """
+    staking = Staking(_staking)
+    zap = Zap(_zap)
+    liquid_locker = LiquidLocker(staking.asset())
+    locking_token = ERC20(liquid_locker.token())
+
+    assert locking_token.approve(liquid_locker.address, max_value(uint256), default_return_value=True)
+    assert ERC20(liquid_locker.address).approve(_staking, max_value(uint256), default_return_value=True)
+
+@external
+@nonreentrant("lock")
+def execute(_actions: DynArray[Action, MAX_ACTIONS], _receiver: address = msg.sender):
+    """
+    @notice Execute a sequence of actions
+    @param _actions
+        Actions to execute in order. An amount of `max_value(uint256)` uses the
+        router's balance of the input token, which is the output of the previous actions.
+        Any other amount is taken from the caller
+    @param _receiver Receiver of supYFI, gauge tokens and any leftover tokens
+    """
+    assert _receiver != empty(address) and _receiver != self
+
+    for action in _actions:
+        if action.action == DEPOSIT:
+            amount: uint256 = self._take(locking_token.address, action.amount)
+            liquid_locker.deposit(amount, self)
+        elif action.action == STAKE:
+            amount: uint256 = self._take(liquid_locker.address, action.amount)
+            staking.deposit(amount, _receiver)
+        elif action.action == REDEEM:
+            amount: uint256 = action.amount
+            if amount == BALANCE:
+                amount = staking.maxRedeem(msg.sender)
+            staking.redeem(amount, self, msg.sender)
+        elif action.action == ZAP:
+            underlying: address = ERC4626(ERC4626(action.target).asset()).asset()
+            amount: uint256 = self._take(underlying, action.amount)
+            if ERC20(underlying).allowance(self, zap.address) < amount:
+                assert ERC20(underlying).approve(zap.address, max_value(uint256), default_return_value=True)
+            shares: uint256 = zap.deposit(action.target, amount)
+            assert ERC20(action.target).transfer(_receiver, shares, default_return_value=True)
+        else:
+            raise "unknown action"
+
+    # send leftovers to receiver
+    for token in [locking_token, ERC20(liquid_locker.address)]:
+        amount: uint256 = token.balanceOf(self)
+        if amount > 0:
+            assert token.transfer(_receiver, amount, default_return_value=True)
+
+    log Execute(msg.sender, _receiver, len(_actions))
+
+@external
+def deposit(_amount: uint256) -> uint256:
+    """
+    @notice Deposit YFI into supYFI
+    @param _amount Amount of YFI to take
+    @return Amount of supYFI minted to the caller
+    @dev Compatible with `VestingEscrowDepositor`
+    """
+    assert locking_token.transferFrom(msg.sender, self, _amount, default_return_value=True)
+    amount: uint256 = liquid_locker.deposit(_amount, self)
+    staking.deposit(amount, msg.sender)
+    return amount
+
+@internal
+def _take(_token: address, _amount: uint256) -> uint256:
+    """
+    @notice Take tokens from the caller, or use the router's balance
+    """
+    if _amount == BALANCE:
+        return ERC20(_token).balanceOf(self)
+    assert ERC20(_token).transferFrom(msg.sender, self, _amount, default_return_value=True)
+    return _amount
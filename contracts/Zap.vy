@@ -23,12 +23,19 @@ interface LegacyYearnVault:
     def token() -> address: view
     def withdraw(_shares: uint256, _recipient: address, _max_loss: uint256) -> uint256: nonpayable
 
+interface Registry:
+    def gauge_registered(_gauge: address) -> bool: view
+
 weth: public(immutable(WETH))
+registry: public(immutable(Registry))
 management: public(address)
 
+MAX_GAUGES: constant(uint256) = 32
+
 @external
-def __init__(_weth: address):
+def __init__(_weth: address, _registry: address):
     weth = WETH(_weth)
+    registry = Registry(_registry)
     self.management = msg.sender
 
 @external
@@ -62,6 +69,58 @@ def deposit_legacy(_gauge: address, _assets: uint256) -> uint256:
     assert ERC20(underlying).transferFrom(msg.sender, self, _assets, default_return_value=True)
     return self._deposit(_gauge, yvault, underlying, _assets)
 
+@external
+def deposit_many(_gauges: DynArray[address, MAX_GAUGES], _assets: DynArray[uint256, MAX_GAUGES]) -> DynArray[uint256, MAX_GAUGES]:
+    assert len(_gauges) == len(_assets)
+
+    shares: DynArray[uint256, MAX_GAUGES] = []
+    for i in range(MAX_GAUGES):
+        if i == len(_gauges):
+            break
+        yvault: address = ERC4626(_gauges[i]).asset()
+        underlying: address = ERC4626(yvault).asset()
+
+        assert ERC20(underlying).transferFrom(msg.sender, self, _assets[i], default_return_value=True)
+        shares.append(self._deposit(_gauges[i], yvault, underlying, _assets[i]))
+    return shares
+
+@external
+@payable
+def deposit_many_eth(_gauges: DynArray[address, MAX_GAUGES], _assets: DynArray[uint256, MAX_GAUGES]) -> DynArray[uint256, MAX_GAUGES]:
+    assert len(_gauges) == len(_assets)
+
+    # wrap all ETH at once
+    weth.deposit(value=msg.value)
+
+    total: uint256 = 0
+    shares: DynArray[uint256, MAX_GAUGES] = []
+    for i in range(MAX_GAUGES):
+        if i == len(_gauges):
+            break
+        yvault: address = ERC4626(_gauges[i]).asset()
+        underlying: address = ERC4626(yvault).asset()
+        assert underlying == weth.address, "not WETH"
+
+        total += _assets[i]
+        shares.append(self._deposit(_gauges[i], yvault, weth.address, _assets[i]))
+    assert total == msg.value
+    return shares
+
+@external
+def deposit_many_legacy(_gauges: DynArray[address, MAX_GAUGES], _assets: DynArray[uint256, MAX_GAUGES]) -> DynArray[uint256, MAX_GAUGES]:
+    assert len(_gauges) == len(_assets)
+
+    shares: DynArray[uint256, MAX_GAUGES] = []
+    for i in range(MAX_GAUGES):
+        if i == len(_gauges):
+            break
+        yvault: address = ERC4626(_gauges[i]).asset()
+        underlying: address = LegacyYearnVault(yvault).token()
+
+        assert ERC20(underlying).transferFrom(msg.sender, self, _assets[i], default_return_value=True)
+        shares.append(self._deposit(_gauges[i], yvault, underlying, _assets[i]))
+    return shares
+
 @external
 def withdraw(_gauge: address, _shares: uint256, _max_loss: uint256 = 0) -> uint256:
     yvault: address = ERC4626(_gauge).asset()
@@ -88,6 +147,86 @@ def withdraw_legacy(_gauge: address, _shares: uint256, _max_loss: uint256 = 0) -
     # withdraw underlying token from yvault
     return LegacyYearnVault(yvault).withdraw(_shares, msg.sender, _max_loss)
 
+@external
+def withdraw_many(
+    _gauges: DynArray[address, MAX_GAUGES], _shares: DynArray[uint256, MAX_GAUGES], _max_loss: uint256 = 0
+) -> DynArray[uint256, MAX_GAUGES]:
+    assert len(_gauges) == len(_shares)
+
+    assets: DynArray[uint256, MAX_GAUGES] = []
+    for i in range(MAX_GAUGES):
+        if i == len(_gauges):
+            break
+        yvault: address = ERC4626(_gauges[i]).asset()
+        assets.append(self._withdraw(_gauges[i], yvault, _shares[i], _max_loss, msg.sender))
+    return assets
+
+@external
+def withdraw_many_eth(
+    _gauges: DynArray[address, MAX_GAUGES], _shares: DynArray[uint256, MAX_GAUGES], _max_loss: uint256 = 0
+) -> DynArray[uint256, MAX_GAUGES]:
+    assert len(_gauges) == len(_shares)
+
+    total: uint256 = 0
+    assets: DynArray[uint256, MAX_GAUGES] = []
+    for i in range(MAX_GAUGES):
+        if i == len(_gauges):
+            break
+        yvault: address = ERC4626(_gauges[i]).asset()
+        underlying: address = ERC4626(yvault).asset()
+        assert underlying == weth.address, "not WETH"
+
+        amount: uint256 = self._withdraw(_gauges[i], yvault, _shares[i], _max_loss, self)
+        total += amount
+        assets.append(amount)
+
+    # unwrap and send all ETH at once
+    weth.withdraw(total)
+    raw_call(msg.sender, b"", value=total)
+    return assets
+
+@external
+def withdraw_many_legacy(
+    _gauges: DynArray[address, MAX_GAUGES], _shares: DynArray[uint256, MAX_GAUGES], _max_loss: uint256 = 0
+) -> DynArray[uint256, MAX_GAUGES]:
+    assert len(_gauges) == len(_shares)
+
+    assets: DynArray[uint256, MAX_GAUGES] = []
+    for i in range(MAX_GAUGES):
+        if i == len(_gauges):
+            break
+        yvault: address = ERC4626(_gauges[i]).asset()
+        ERC4626(_gauges[i]).withdraw(_shares[i], self, msg.sender)
+        assets.append(LegacyYearnVault(yvault).withdraw(_shares[i], msg.sender, _max_loss))
+    return assets
+
+@external
+def migrate(_from: address, _to: address, _shares: uint256, _min_out: uint256, _max_loss: uint256 = 0) -> uint256:
+    assert registry.gauge_registered(_from) and registry.gauge_registered(_to), "not registered"
+    from_vault: address = ERC4626(_from).asset()
+    to_vault: address = ERC4626(_to).asset()
+
+    # withdraw yvault token from 1up gauge, only what was received is moved on
+    shares: uint256 = ERC20(from_vault).balanceOf(self)
+    ERC4626(_from).withdraw(_shares, self, msg.sender)
+    shares = ERC20(from_vault).balanceOf(self) - shares
+
+    if from_vault == to_vault:
+        # deposit yvault token directly into the other 1up gauge
+        self._approve(to_vault, _to, shares, True)
+        ERC4626(_to).deposit(shares, msg.sender)
+    else:
+        # move underlying token between yvaults
+        underlying: address = ERC4626(to_vault).asset()
+        assert ERC4626(from_vault).asset() == underlying, "underlying mismatch"
+        assets: uint256 = ERC20(underlying).balanceOf(self)
+        YearnVault(from_vault).redeem(shares, self, self, _max_loss)
+        assets = ERC20(underlying).balanceOf(self) - assets
+        shares = self._deposit(_to, to_vault, underlying, assets)
+
+    assert shares >= _min_out, "slippage"
+    return shares
+
 @external
 def rescue(_token: address, _amount: uint256 = max_value(uint256)):
     assert msg.sender == self.management
@@ -109,16 +248,30 @@ def set_management(_management: address):
 
 @internal
 def _deposit(_gauge: address, _yvault: address, _underlying: address, _assets: uint256) -> uint256:
+    registered: bool = registry.gauge_registered(_gauge)
+
     # deposit underlying token into yvault
-    assert ERC20(_underlying).approve(_yvault, _assets, default_return_value=True)
+    self._approve(_underlying, _yvault, _assets, registered)
     shares: uint256 = ERC4626(_yvault).deposit(_assets, self)
 
     # deposit yvault token into 1up gauge
-    assert ERC20(_yvault).approve(_gauge, shares, default_return_value=True)
+    self._approve(_yvault, _gauge, shares, registered)
     ERC4626(_gauge).deposit(shares, msg.sender)
 
     return shares
 
+@internal
+def _approve(_token: address, _spender: address, _amount: uint256, _unlimited: bool):
+    if not _unlimited:
+        # spender is not known to us, only approve what is used right away
+        assert ERC20(_token).approve(_spender, _amount, default_return_value=True)
+        return
+
+    # registered gauges and their yvaults get unlimited approvals that are only renewed
+    # once depleted, so that repeated deposits into them dont need a new approval
+    if ERC20(_token).allowance(self, _spender) < _amount:
+        assert ERC20(_token).approve(_spender, max_value(uint256), default_return_value=True)
+
 @internal
 def _withdraw(_gauge: address, _yvault: address, _shares: uint256, _max_loss: uint256, _recipient: address) -> uint256:
     # withdraw yvault token from 1up gauge
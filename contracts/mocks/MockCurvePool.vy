@@ -0,0 +1,180 @@
+# @version 0.3.10
+"""
+@notice
+    Mock of a Curve crypto pool between a token and ETH.
+    Implements the invariant math of the pool, without price adjustments.
+"""
+
+from vyper.interfaces import ERC20
+
+token: public(immutable(ERC20))
+A: public(immutable(uint256))
+gamma: public(immutable(uint256))
+mid_fee: public(immutable(uint256))
+out_fee: public(immutable(uint256))
+fee_gamma: public(immutable(uint256))
+price_scale: public(immutable(uint256))
+balances: public(uint256[N_COINS])
+price_oracle: public(uint256)
+D: public(uint256)
+
+N_COINS: constant(uint256) = 2
+PRECISION: constant(uint256) = 10**18
+A_MULTIPLIER: constant(uint256) = 10000
+
+@external
+def __init__(
+    _token: address, _A: uint256, _gamma: uint256, _mid_fee: uint256,
+    _out_fee: uint256, _fee_gamma: uint256, _price_scale: uint256
+):
+    token = ERC20(_token)
+    A = _A
+    gamma = _gamma
+    mid_fee = _mid_fee
+    out_fee = _out_fee
+    fee_gamma = _fee_gamma
+    price_scale = _price_scale
+    self.price_oracle = _price_scale
+
+@external
+@payable
+def __default__():
+    pass
+
+@external
+@payable
+def seed(_amount: uint256):
+    assert token.transferFrom(msg.sender, self, _amount, default_return_value=True)
+    self.balances = [self.balances[0] + _amount, self.balances[1] + msg.value]
+    self.D = self._newton_D(self._xp(self.balances))
+
+@external
+def set_price_oracle(_price_oracle: uint256):
+    self.price_oracle = _price_oracle
+
+@external
+@view
+def get_dy(_i: uint256, _j: uint256, _dx: uint256) -> uint256:
+    return self._get_dy(_i, _j, _dx)
+
+@external
+@payable
+def exchange(_i: uint256, _j: uint256, _dx: uint256, _min_dy: uint256, _use_eth: bool) -> uint256:
+    assert _i == 0 and _j == 1 and _use_eth
+    dy: uint256 = self._get_dy(_i, _j, _dx)
+    assert dy >= _min_dy
+    assert token.transferFrom(msg.sender, self, _dx, default_return_value=True)
+    balances: uint256[N_COINS] = [self.balances[0] + _dx, self.balances[1] - dy]
+    self.balances = balances
+    self.D = self._newton_D(self._xp(balances))
+    raw_call(msg.sender, b"", value=dy)
+    return dy
+
+@internal
+@view
+def _xp(_balances: uint256[N_COINS]) -> uint256[N_COINS]:
+    return [_balances[0], _balances[1] * price_scale / PRECISION]
+
+@internal
+@view
+def _get_dy(_i: uint256, _j: uint256, _dx: uint256) -> uint256:
+    assert _i != _j and _i < N_COINS and _j < N_COINS
+    balances: uint256[N_COINS] = self.balances
+    balances[_i] += _dx
+    xp: uint256[N_COINS] = self._xp(balances)
+    y: uint256 = self._newton_y(xp, self.D, _j)
+    dy: uint256 = xp[_j] - y - 1
+    xp[_j] = y
+    if _j > 0:
+        dy = dy * PRECISION / price_scale
+    dy -= self._fee(xp) * dy / 10**10
+    return dy
+
+@internal
+@view
+def _fee(_xp: uint256[N_COINS]) -> uint256:
+    f: uint256 = _xp[0] + _xp[1]
+    f = fee_gamma * 10**18 / (fee_gamma + 10**18 - (10**18 * N_COINS**N_COINS) * _xp[0] / f * _xp[1] / f)
+    return (mid_fee * f + out_fee * (10**18 - f)) / 10**18
+
+@internal
+@view
+def _newton_D(_xp: uint256[N_COINS]) -> uint256:
+    x: uint256[N_COINS] = _xp
+    if x[0] < x[1]:
+        x = [_xp[1], _xp[0]]
+
+    D: uint256 = N_COINS * isqrt(x[0] * x[1])
+    S: uint256 = x[0] + x[1]
+    for i in range(255):
+        D_prev: uint256 = D
+        K0: uint256 = (10**18 * N_COINS**2) * x[0] / D * x[1] / D
+        g1k0: uint256 = gamma + 10**18
+        if g1k0 > K0:
+            g1k0 = g1k0 - K0 + 1
+        else:
+            g1k0 = K0 - g1k0 + 1
+        mul1: uint256 = 10**18 * D / gamma * g1k0 / gamma * g1k0 * A_MULTIPLIER / A
+        mul2: uint256 = (2 * 10**18) * N_COINS * K0 / g1k0
+        neg_fprime: uint256 = (S + S * mul2 / 10**18) + mul1 * N_COINS / K0 - mul2 * D / 10**18
+        D_plus: uint256 = D * (neg_fprime + S) / neg_fprime
+        D_minus: uint256 = D * D / neg_fprime
+        if 10**18 > K0:
+            D_minus += D * (mul1 / neg_fprime) / 10**18 * (10**18 - K0) / K0
+        else:
+            D_minus -= D * (mul1 / neg_fprime) / 10**18 * (K0 - 10**18) / K0
+        if D_plus > D_minus:
+            D = D_plus - D_minus
+        else:
+            D = (D_minus - D_plus) / 2
+
+        diff: uint256 = 0
+        if D > D_prev:
+            diff = D - D_prev
+        else:
+            diff = D_prev - D
+        if diff * 10**14 < max(10**16, D):
+            return D
+    raise "no convergence"
+
+@internal
+@view
+def _newton_y(_xp: uint256[N_COINS], _D: uint256, _i: uint256) -> uint256:
+    x_j: uint256 = _xp[1 - _i]
+    y: uint256 = _D**2 / (x_j * N_COINS**2)
+    K0_i: uint256 = (10**18 * N_COINS) * x_j / _D
+    convergence_limit: uint256 = max(max(x_j / 10**14, _D / 10**14), 100)
+    for j in range(255):
+        y_prev: uint256 = y
+        K0: uint256 = K0_i * y * N_COINS / _D
+        S: uint256 = x_j + y
+        g1k0: uint256 = gamma + 10**18
+        if g1k0 > K0:
+            g1k0 = g1k0 - K0 + 1
+        else:
+            g1k0 = K0 - g1k0 + 1
+        mul1: uint256 = 10**18 * _D / gamma * g1k0 / gamma * g1k0 * A_MULTIPLIER / A
+        mul2: uint256 = 10**18 + (2 * 10**18) * K0 / g1k0
+        yfprime: uint256 = 10**18 * y + S * mul2 + mul1
+        dyfprime: uint256 = _D * mul2
+        if yfprime < dyfprime:
+            y = y_prev / 2
+            continue
+        yfprime -= dyfprime
+        fprime: uint256 = yfprime / y
+        y_minus: uint256 = mul1 / fprime
+        y_plus: uint256 = (yfprime + 10**18 * _D) / fprime + y_minus * 10**18 / K0
+        y_minus += 10**18 * S / fprime
+        if y_plus < y_minus:
+            y = y_prev / 2
+        else:
+            y = y_plus - y_minus
+
+        diff: uint256 = 0
+        if y > y_prev:
+            diff = y - y_prev
+        else:
+            diff = y_prev - y
+        if diff < max(convergence_limit, y / 10**14):
+            return y
+    raise "no convergence"
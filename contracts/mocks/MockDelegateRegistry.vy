@@ -0,0 +1,16 @@
+# @version 0.3.10
+"""
+@notice Mock of the Snapshot delegate registry
+"""
+
+delegation: public(HashMap[address, HashMap[bytes32, address]])
+
+@external
+def setDelegate(_id: bytes32, _delegate: address):
+    assert _delegate != msg.sender and _delegate != empty(address)
+    self.delegation[msg.sender][_id] = _delegate
+
+@external
+def clearDelegate(_id: bytes32):
+    assert self.delegation[msg.sender][_id] != empty(address)
+    self.delegation[msg.sender][_id] = empty(address)
@@ -5,7 +5,10 @@ interface Registry:
 implements: Registry
 
 gauge_map: public(HashMap[address, address])
+gauge_registered: public(HashMap[address, bool])
 
 @external
 def set_gauge_map(_ygauge: address, _gauge: address):
+    self.gauge_registered[self.gauge_map[_ygauge]] = False
     self.gauge_map[_ygauge] = _gauge
+    self.gauge_registered[_gauge] = True
@@ -0,0 +1,6 @@
+# @version 0.3.10
+
+@external
+@pure
+def fail(_reason: String[1024]):
+    raise _reason
@@ -1,8 +1,16 @@
 # @version 0.3.10
+"""
+@notice
+    Mock of a Yearn gauge. Assets are deposited 1:1 for shares, so it can
+    also stand in for a Yearn vault. Claims mint a fixed amount of rewards.
+"""
 
 from vyper.interfaces import ERC20
 implements: ERC20
 
+interface MockToken:
+    def mint(_account: address, _value: uint256): nonpayable
+
 totalSupply: public(uint256)
 balanceOf: public(HashMap[address, uint256])
 allowance: public(HashMap[address, HashMap[address, uint256]])
@@ -11,6 +19,11 @@ name: public(constant(String[9])) = "MockToken"
 symbol: public(constant(String[4])) = "MOCK"
 decimals: public(constant(uint8)) = 18
 
+asset: public(address)
+reward_token: public(address)
+reward_rate: public(uint256)
+recipients: public(HashMap[address, address])
+
 event Transfer:
     sender: indexed(address)
     receiver: indexed(address)
@@ -25,6 +38,12 @@ event Approval:
 def __init__():
     log Transfer(empty(address), msg.sender, 0)
 
+@external
+def initialize(_asset: address, _reward_token: address = empty(address)):
+    assert self.asset == empty(address)
+    self.asset = _asset
+    self.reward_token = _reward_token
+
 @external
 def transfer(_to: address, _value: uint256) -> bool:
     assert _to != empty(address)
@@ -60,10 +79,64 @@ def burn(_account: address, _value: uint256):
     self.balanceOf[_account] -= _value
     log Transfer(_account, empty(address), _value)
 
+@external
+@view
+def convertToShares(_assets: uint256) -> uint256:
+    return _assets
+
+@external
+@view
+def convertToAssets(_shares: uint256) -> uint256:
+    return _shares
+
+@external
+def deposit(_assets: uint256, _receiver: address = msg.sender) -> uint256:
+    assert ERC20(self.asset).transferFrom(msg.sender, self, _assets, default_return_value=True)
+    self.totalSupply += _assets
+    self.balanceOf[_receiver] += _assets
+    log Transfer(empty(address), _receiver, _assets)
+    return _assets
+
+@external
+def withdraw(_assets: uint256, _receiver: address = msg.sender, _owner: address = msg.sender) -> uint256:
+    self._withdraw(_assets, _receiver, _owner)
+    return _assets
+
+@external
+def redeem(_shares: uint256, _receiver: address = msg.sender, _owner: address = msg.sender, _max_loss: uint256 = 0) -> uint256:
+    self._withdraw(_shares, _receiver, _owner)
+    return _shares
+
+@external
+def set_reward_rate(_rate: uint256):
+    self.reward_rate = _rate
+
 @external
 def setRecipient(_recipient: address):
-    pass
+    self.recipients[msg.sender] = _recipient
+
+@external
+@view
+def earned(_account: address) -> uint256:
+    if self.balanceOf[_account] == 0:
+        return 0
+    return self.reward_rate
 
 @external
 def getReward(_account: address):
-    pass
+    # mint a fixed amount of rewards on every claim
+    if self.reward_rate == 0 or self.balanceOf[_account] == 0:
+        return
+    recipient: address = self.recipients[_account]
+    if recipient == empty(address):
+        recipient = _account
+    MockToken(self.reward_token).mint(recipient, self.reward_rate)
+
+@internal
+def _withdraw(_assets: uint256, _receiver: address, _owner: address):
+    if _owner != msg.sender:
+        self.allowance[_owner][msg.sender] -= _assets
+    self.totalSupply -= _assets
+    self.balanceOf[_owner] -= _assets
+    log Transfer(_owner, empty(address), _assets)
+    assert ERC20(self.asset).transfer(_receiver, _assets, default_return_value=True)
@@ -0,0 +1,43 @@
+# @version 0.3.10
+"""
+@notice
+    Mock of the Yearn dYFI redemption contract.
+    Redemption cost is linear in the amount, at a configurable rate.
+"""
+
+from vyper.interfaces import ERC20
+
+discount_token: public(immutable(ERC20))
+locking_token: public(immutable(ERC20))
+rate: public(uint256)
+
+SLIPPAGE: constant(uint256) = 3
+
+@external
+def __init__(_discount_token: address, _locking_token: address, _rate: uint256):
+    discount_token = ERC20(_discount_token)
+    locking_token = ERC20(_locking_token)
+    self.rate = _rate
+
+@external
+@view
+def eth_required(_amount: uint256) -> uint256:
+    return self._eth_required(_amount)
+
+@external
+@payable
+def redeem(_amount: uint256, _receiver: address = msg.sender) -> uint256:
+    required: uint256 = self._eth_required(_amount)
+    assert msg.value >= required - required * SLIPPAGE / 1000
+    assert discount_token.transferFrom(msg.sender, self, _amount, default_return_value=True)
+    assert locking_token.transfer(_receiver, _amount, default_return_value=True)
+    return _amount
+
+@external
+def set_rate(_rate: uint256):
+    self.rate = _rate
+
+@internal
+@view
+def _eth_required(_amount: uint256) -> uint256:
+    return _amount * self.rate / 10**18
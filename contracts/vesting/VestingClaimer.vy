@@ -0,0 +1,50 @@
+# @version 0.3.10
+"""
+@title 1UP Vesting claimer
+@author 1UP
+@license GNU AGPLv3
+@notice
+    Claims vested tokens from many `VestingEscrowLL` contracts in a single transaction.
+    Tokens are always sent to the recipient of each vest, so only vests with open claim
+    can be claimed. Vests without open claim or without unclaimed tokens are skipped.
+    Holds no state and no tokens.
+"""
+
+interface Vesting:
+    def recipient() -> address: view
+    def open_claim() -> bool: view
+    def unclaimed() -> uint256: view
+    def claim(_beneficiary: address) -> uint256: nonpayable
+
+MAX_ESCROWS: constant(uint256) = 256
+
+@external
+def claim(_escrows: DynArray[Vesting, MAX_ESCROWS]) -> DynArray[uint256, MAX_ESCROWS]:
+    """
+    @notice Claim vested tokens to the recipient of each vest
+    @param _escrows Vesting contracts to claim from
+    @return Amount claimed from each vesting contract, zero if skipped
+    """
+    claimed: DynArray[uint256, MAX_ESCROWS] = []
+    for escrow in _escrows:
+        amount: uint256 = 0
+        if escrow.open_claim() and escrow.unclaimed() > 0:
+            amount = escrow.claim(escrow.recipient())
+        claimed.append(amount)
+    return claimed
+
+@external
+@view
+def claimable(_escrows: DynArray[Vesting, MAX_ESCROWS]) -> DynArray[uint256, MAX_ESCROWS]:
+    """
+    @notice Get the amount that would be claimed from each vest
+    @param _escrows Vesting contracts
+    @return Amount of unclaimed tokens of each vesting contract, zero if it will be skipped
+    """
+    claimable: DynArray[uint256, MAX_ESCROWS] = []
+    for escrow in _escrows:
+        amount: uint256 = 0
+        if escrow.open_claim():
+            amount = escrow.unclaimed()
+        claimable.append(amount)
+    return claimable
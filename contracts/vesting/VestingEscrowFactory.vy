@@ -21,10 +21,19 @@ struct Vest:
     start: uint256
     cliff: uint256
 
+struct VestInfo:
+    idx: uint256
+    vest: Vest
+
 num_vests: public(uint256)
-pending_vests: public(HashMap[uint256, Vest])
+packed_vests: public(HashMap[uint256, uint256[2]]) # amount | recipient, start | duration | cliff
 liquid_lockers: public(HashMap[address, address]) # liquid locker token => deposit contract
 operators: public(HashMap[address, HashMap[address, bool]]) # liquid locker token => operator address => approved
+escrows: public(HashMap[uint256, HashMap[address, address]]) # vest index => liquid locker token => vesting contract
+num_recipient_vests: public(HashMap[address, uint256])
+recipient_vests: public(HashMap[address, HashMap[uint256, uint256]]) # recipient => i => vest index
+num_recipient_escrows: public(HashMap[address, uint256])
+recipient_escrows: public(HashMap[address, HashMap[uint256, address]]) # recipient => i => vesting contract
 
 interface Depositor:
     def deposit(_amount: uint256) -> uint256: nonpayable
@@ -40,6 +49,10 @@ interface VestingEscrowLL:
         cliff_length: uint256,
         open_claim: bool,
     ) -> bool: nonpayable
+    def top_up(amount: uint256): nonpayable
+    def disabled_at() -> uint256: view
+    def end_time() -> uint256: view
+    def owner() -> address: view
 
 event VestingEscrowCreated:
     funder: indexed(address)
@@ -58,6 +71,14 @@ event VestingContractDeployed:
     yfi_amount: uint256
     token_amount: uint256
 
+event VestingContractToppedUp:
+    recipient: indexed(address)
+    token: indexed(address)
+    index: uint256
+    escrow: address
+    yfi_amount: uint256
+    token_amount: uint256
+
 event Revoke:
     index: indexed(uint256)
     beneficiary: address
@@ -75,6 +96,13 @@ TARGET: public(immutable(address))
 YFI: public(immutable(ERC20))
 OWNER: public(immutable(address))
 
+MAX_VESTS: constant(uint256) = 256
+MAX_PAGE_SIZE: constant(uint256) = 256
+ADDRESS_MASK: constant(uint256) = 2**160 - 1
+AMOUNT_MASK: constant(uint256) = 2**96 - 1
+TIME_MASK: constant(uint256) = 2**64 - 1
+MAX_END_TIME: constant(uint256) = 2**48 - 1 # vesting escrows pack their times into 48 bits
+
 
 @external
 def __init__(target: address, yfi: address, owner: address):
@@ -108,35 +136,81 @@ def create_vest(
     @param cliff_length Duration (in seconds) after which the first portion vests
     @return Vest index
     """
-    assert cliff_length <= vesting_duration  # dev: incorrect vesting cliff
-    assert vesting_start + vesting_duration > block.timestamp  # dev: just use a transfer, dummy
-    assert vesting_duration > 0  # dev: duration must be > 0
-    assert recipient not in [self, empty(address), YFI.address, OWNER] # dev: wrong recipient
-    assert amount > 0
-
     idx: uint256 = self.num_vests
     self.num_vests = idx + 1
-    self.pending_vests[idx] = Vest({
-        recipient: recipient,
-        amount: amount,
-        duration: vesting_duration,
-        start: vesting_start,
-        cliff: cliff_length
-    })
+    self._create_vest(idx, recipient, amount, vesting_duration, vesting_start, cliff_length)
     assert YFI.transferFrom(msg.sender, self, amount, default_return_value=True)
+    return idx
 
-    log VestingEscrowCreated(
-        msg.sender,
-        recipient,
-        idx,
-        amount,
-        vesting_start,
-        vesting_duration,
-        cliff_length
-    )
+@external
+def create_vests(
+    recipients: DynArray[address, MAX_VESTS],
+    amounts: DynArray[uint256, MAX_VESTS],
+    vesting_durations: DynArray[uint256, MAX_VESTS],
+    vesting_starts: DynArray[uint256, MAX_VESTS],
+    cliff_lengths: DynArray[uint256, MAX_VESTS]
+) -> uint256:
+    """
+    @notice Create multiple new YFI vests
+    @dev Prior to deployment you must approve the sum of `amounts` YFI
+    @param recipients Addresses to vest tokens for
+    @param amounts Amounts of tokens being vested for each recipient
+    @param vesting_durations Time periods (in seconds) over which tokens are released
+    @param vesting_starts Epoch times when tokens begin to vest
+    @param cliff_lengths Durations (in seconds) after which the first portion vests
+    @return Index of the first vest, the other vests have consecutive indices
+    """
+    num: uint256 = len(recipients)
+    assert num > 0
+    assert len(amounts) == num and len(vesting_durations) == num
+    assert len(vesting_starts) == num and len(cliff_lengths) == num
+
+    idx: uint256 = self.num_vests
+    total: uint256 = 0
+    for i in range(MAX_VESTS):
+        if i == num:
+            break
+        self._create_vest(idx + i, recipients[i], amounts[i], vesting_durations[i], vesting_starts[i], cliff_lengths[i])
+        total += amounts[i]
 
+    self.num_vests = idx + num
+    assert YFI.transferFrom(msg.sender, self, total, default_return_value=True)
     return idx
 
+@external
+@view
+def pending_vests(idx: uint256) -> Vest:
+    """
+    @notice Get a pending vest
+    @param idx Vest index
+    @return Vest recipient, remaining amount, duration, start and cliff
+    """
+    return self._unpack(self.packed_vests[idx])
+
+@external
+@view
+def vests_page(recipient: address, start: uint256, count: uint256) -> DynArray[VestInfo, MAX_PAGE_SIZE]:
+    """
+    @notice Get a page of the vests of a recipient
+    @param recipient Vest recipient
+    @param start Index of the first vest of the recipient in the page
+    @param count Maximum number of vests in the page
+    @return List with vest index and pending vest of each vest in the page
+    @dev Page is cut short if it extends beyond the last vest of the recipient
+    """
+    page: DynArray[VestInfo, MAX_PAGE_SIZE] = []
+    num_vests: uint256 = self.num_recipient_vests[recipient]
+    if start >= num_vests:
+        return page
+
+    for i in range(MAX_PAGE_SIZE):
+        j: uint256 = start + i
+        if i == count or j == num_vests:
+            break
+        idx: uint256 = self.recipient_vests[recipient][j]
+        page.append(VestInfo({idx: idx, vest: self._unpack(self.packed_vests[idx])}))
+    return page
+
 @external
 def deploy_vesting_contract(
     idx: uint256,
@@ -147,25 +221,51 @@ def deploy_vesting_contract(
     """
     @notice Deposit into a liquid locker and deploy a vesting contract
     @dev Requires a vest. Requires the liquid locker being approved by the owner
+    @dev If the vest already has a vesting contract for the liquid locker, it is topped up
+        instead of deploying a new one, unless it has been revoked or disowned. `open_claim` is ignored
+        when topping up
     @param idx Vest index
     @param token Liquid locker token to deposit into
     @param amount Amount of YFI to deposit
     @param open_claim Whether anyone can claim 
     @return Vest contract address, vested amount of liquid locker tokens
     """
-    vest: Vest = self.pending_vests[idx]
+    packed: uint256[2] = self.packed_vests[idx]
+    vest: Vest = self._unpack(packed)
     assert msg.sender == vest.recipient
 
     depositor: address = self.liquid_lockers[token]
     assert depositor != empty(address)
 
-    self.pending_vests[idx].amount -= amount
+    # amount is packed in the upper bits, underflows are caught by the check
+    assert amount <= vest.amount
+    self.packed_vests[idx][0] = packed[0] - (amount << 160)
 
     assert YFI.approve(depositor, amount, default_return_value=True)
     ll_amount: uint256 = Depositor(depositor).deposit(amount)
     assert ll_amount > 0
 
-    escrow: address = create_minimal_proxy_to(TARGET)
+    escrow: address = self.escrows[idx][token]
+    if escrow != empty(address) and \
+        VestingEscrowLL(escrow).disabled_at() == VestingEscrowLL(escrow).end_time() and \
+        VestingEscrowLL(escrow).owner() == OWNER:
+        assert ERC20(token).transfer(escrow, ll_amount, default_return_value=True)
+        VestingEscrowLL(escrow).top_up(ll_amount)
+        log VestingContractToppedUp(
+            msg.sender,
+            token,
+            idx,
+            escrow,
+            amount,
+            ll_amount,
+        )
+        return escrow, ll_amount
+
+    escrow = create_minimal_proxy_to(TARGET)
+    self.escrows[idx][token] = escrow
+    num_escrows: uint256 = self.num_recipient_escrows[msg.sender]
+    self.recipient_escrows[msg.sender][num_escrows] = escrow
+    self.num_recipient_escrows[msg.sender] = num_escrows + 1
     VestingEscrowLL(escrow).initialize(
         OWNER,
         token,
@@ -197,9 +297,10 @@ def revoke(idx: uint256, beneficiary: address = msg.sender):
     """
     assert msg.sender == OWNER
 
-    amount: uint256 = self.pending_vests[idx].amount
+    packed: uint256 = self.packed_vests[idx][0]
+    amount: uint256 = packed >> 160
     assert amount > 0
-    self.pending_vests[idx].amount = 0
+    self.packed_vests[idx][0] = packed & ADDRESS_MASK
     assert YFI.transfer(beneficiary, amount, default_return_value=True)
     log Revoke(idx, beneficiary)
 
@@ -234,3 +335,48 @@ def set_operator(liquid_locker: address, operator: address, flag: bool):
     assert liquid_locker != empty(address) and operator != empty(address)
     self.operators[liquid_locker][operator] = flag
     log OperatorSet(liquid_locker, operator, flag)
+
+@internal
+def _create_vest(idx: uint256, recipient: address, amount: uint256, vesting_duration: uint256, vesting_start: uint256, cliff_length: uint256):
+    """
+    @notice Validate and store a new vest
+    """
+    assert cliff_length <= vesting_duration  # dev: incorrect vesting cliff
+    assert vesting_start + vesting_duration > block.timestamp  # dev: just use a transfer, dummy
+    assert vesting_duration > 0  # dev: duration must be > 0
+    assert recipient not in [self, empty(address), YFI.address, OWNER] # dev: wrong recipient
+    assert amount > 0
+    assert amount <= AMOUNT_MASK
+    assert vesting_start + vesting_duration <= MAX_END_TIME  # dev: end time out of range
+
+    self.packed_vests[idx] = [
+        (amount << 160) | convert(recipient, uint256),
+        (vesting_start << 128) | (vesting_duration << 64) | cliff_length
+    ]
+    num_vests: uint256 = self.num_recipient_vests[recipient]
+    self.recipient_vests[recipient][num_vests] = idx
+    self.num_recipient_vests[recipient] = num_vests + 1
+
+    log VestingEscrowCreated(
+        msg.sender,
+        recipient,
+        idx,
+        amount,
+        vesting_start,
+        vesting_duration,
+        cliff_length
+    )
+
+@internal
+@pure
+def _unpack(packed: uint256[2]) -> Vest:
+    """
+    @notice Unpack a vest from its two storage slots
+    """
+    return Vest({
+        recipient: convert(packed[0] & ADDRESS_MASK, address),
+        amount: packed[0] >> 160,
+        duration: (packed[1] >> 64) & TIME_MASK,
+        start: packed[1] >> 128,
+        cliff: packed[1] & TIME_MASK
+    })
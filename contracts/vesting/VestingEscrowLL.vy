@@ -26,6 +26,10 @@ event Revoked:
     ts: uint256
 
 
+event TopUp:
+    amount: uint256
+
+
 event Disowned:
     owner: address
 
@@ -46,29 +50,26 @@ event Call:
     target: address
 
 factory: public(Factory)
-recipient: public(address)
-token: public(ERC20)
-start_time: public(uint256)
-end_time: public(uint256)
-cliff_length: public(uint256)
-total_locked: public(uint256)
-total_claimed: public(uint256)
-disabled_at: public(uint256)
-open_claim: public(bool)
-initialized: public(bool)
-
-owner: public(address)
+packed_recipient: public(uint256) # recipient | start_time | end_time
+packed_token: public(uint256) # token | cliff_length | disabled_at
+packed_owner: public(uint256) # owner | open_claim | initialized
+packed_amounts: public(uint256) # total_locked | total_claimed
 
 # Liquid locker specific state
 operators: public(HashMap[address, bool])
 messages: public(HashMap[bytes32, bool])
 
 EIP1271_MAGIC_VALUE: constant(bytes4) = 0x1626ba7e
+ADDRESS_MASK: constant(uint256) = 2**160 - 1
+TIME_MASK: constant(uint256) = 2**48 - 1
+AMOUNT_MASK: constant(uint256) = 2**128 - 1
+OPEN_CLAIM_FLAG: constant(uint256) = 2**160
+INITIALIZED_FLAG: constant(uint256) = 2**161
 
 @external
 def __init__():
     # ensure that the original contract cannot be initialized
-    self.initialized = True
+    self.packed_owner = INITIALIZED_FLAG
 
 
 @external
@@ -96,29 +97,116 @@ def initialize(
     @param cliff_length Duration (in seconds) after which the first portion vests
     @param open_claim Switch if anyone can claim for `recipient`
     """
-    assert not self.initialized  # dev: can only initialize once
-    self.initialized = True
+    assert self.packed_owner & INITIALIZED_FLAG == 0  # dev: can only initialize once
+    assert amount <= AMOUNT_MASK
     self.factory = Factory(msg.sender)
-    self.token = token
-    self.owner = owner
-    self.start_time = start_time
-    self.end_time = end_time
-    self.cliff_length = cliff_length
-    self.recipient = recipient
-    self.disabled_at = end_time  # Set to maximum time
-    self.total_locked = amount
-    self.open_claim = open_claim
+    self.packed_recipient = self._pack(recipient, start_time, end_time)
+    self.packed_token = self._pack(token.address, cliff_length, end_time)  # disabled_at set to maximum time
+    packed_owner: uint256 = convert(owner, uint256) | INITIALIZED_FLAG
+    if open_claim:
+        packed_owner |= OPEN_CLAIM_FLAG
+    self.packed_owner = packed_owner
+    self.packed_amounts = amount
 
     return True
 
 
+@external
+def top_up(amount: uint256):
+    """
+    @notice Add tokens to the vest, following the existing schedule
+    @dev Can only be called by the factory, after it has transferred the tokens
+    @param amount Amount of tokens added to `total_locked`
+    """
+    assert msg.sender == self.factory.address  # dev: not factory
+    packed_amounts: uint256 = self.packed_amounts
+    locked: uint256 = (packed_amounts & AMOUNT_MASK) + amount
+    assert locked <= AMOUNT_MASK
+    self.packed_amounts = (packed_amounts & ~AMOUNT_MASK) | locked
+
+    log TopUp(amount)
+
+
+@external
+@view
+def recipient() -> address:
+    return self._unpack(self.packed_recipient)[0]
+
+
+@external
+@view
+def start_time() -> uint256:
+    return self._unpack(self.packed_recipient)[1]
+
+
+@external
+@view
+def end_time() -> uint256:
+    return self._unpack(self.packed_recipient)[2]
+
+
+@external
+@view
+def token() -> ERC20:
+    return ERC20(self._unpack(self.packed_token)[0])
+
+
+@external
+@view
+def cliff_length() -> uint256:
+    return self._unpack(self.packed_token)[1]
+
+
+@external
+@view
+def disabled_at() -> uint256:
+    return self._unpack(self.packed_token)[2]
+
+
+@external
+@view
+def owner() -> address:
+    return convert(self.packed_owner & ADDRESS_MASK, address)
+
+
+@external
+@view
+def open_claim() -> bool:
+    return self.packed_owner & OPEN_CLAIM_FLAG > 0
+
+
+@external
+@view
+def initialized() -> bool:
+    return self.packed_owner & INITIALIZED_FLAG > 0
+
+
+@external
+@view
+def total_locked() -> uint256:
+    return self.packed_amounts & AMOUNT_MASK
+
+
+@external
+@view
+def total_claimed() -> uint256:
+    return self.packed_amounts >> 128
+
+
 @internal
 @view
 def _total_vested_at(time: uint256 = block.timestamp) -> uint256:
-    start: uint256 = self.start_time
-    end: uint256 = self.end_time
-    locked: uint256 = self.total_locked
-    if time < start + self.cliff_length:
+    recipient: address = empty(address)
+    start: uint256 = 0
+    end: uint256 = 0
+    recipient, start, end = self._unpack(self.packed_recipient)
+    return self._vested(time, start, end, self._unpack(self.packed_token)[1], self.packed_amounts & AMOUNT_MASK)
+
+
+@internal
+@pure
+def _vested(time: uint256, start: uint256, end: uint256, cliff: uint256, locked: uint256) -> uint256:
+    if time < start + cliff:
         return 0
     return min(locked * (time - start) / (end - start), locked)
 
@@ -126,7 +214,7 @@ def _total_vested_at(time: uint256 = block.timestamp) -> uint256:
 @internal
 @view
 def _unclaimed(time: uint256 = block.timestamp) -> uint256:
-    return self._total_vested_at(time) - self.total_claimed
+    return self._total_vested_at(time) - (self.packed_amounts >> 128)
 
 
 @external
@@ -136,13 +224,13 @@ def unclaimed() -> uint256:
     @notice Get the number of unclaimed, vested tokens for recipient
     @dev If `revoke` is activated, limit by the activation timestamp
     """
-    return self._unclaimed(min(block.timestamp, self.disabled_at))
+    return self._unclaimed(min(block.timestamp, self._unpack(self.packed_token)[2]))
 
 
 @internal
 @view
 def _locked(time: uint256 = block.timestamp) -> uint256:
-    return self._total_vested_at(self.disabled_at) - self._total_vested_at(time)
+    return self._total_vested_at(self._unpack(self.packed_token)[2]) - self._total_vested_at(time)
 
 
 @external
@@ -152,7 +240,7 @@ def locked() -> uint256:
     @notice Get the number of locked tokens for recipient
     @dev If `revoke` is activated, limit by the activation timestamp
     """
-    return self._locked(min(block.timestamp, self.disabled_at))
+    return self._locked(min(block.timestamp, self._unpack(self.packed_token)[2]))
 
 
 @external
@@ -162,14 +250,25 @@ def claim(beneficiary: address = msg.sender, amount: uint256 = max_value(uint256
     @param beneficiary Address to transfer claimed tokens to
     @param amount Amount of tokens to claim
     """
-    recipient: address = self.recipient
-    assert msg.sender == recipient or self.open_claim and recipient == beneficiary  # dev: not authorized
-
-    claim_period_end: uint256 = min(block.timestamp, self.disabled_at)
-    claimable: uint256 = min(self._unclaimed(claim_period_end), amount)
-    self.total_claimed += claimable
-
-    assert self.token.transfer(beneficiary, claimable, default_return_value=True)
+    recipient: address = empty(address)
+    start: uint256 = 0
+    end: uint256 = 0
+    recipient, start, end = self._unpack(self.packed_recipient)
+    assert msg.sender == recipient or self.packed_owner & OPEN_CLAIM_FLAG > 0 and recipient == beneficiary  # dev: not authorized
+
+    token: address = empty(address)
+    cliff: uint256 = 0
+    disabled_at: uint256 = 0
+    token, cliff, disabled_at = self._unpack(self.packed_token)
+    packed_amounts: uint256 = self.packed_amounts
+    claimed: uint256 = packed_amounts >> 128
+
+    claim_period_end: uint256 = min(block.timestamp, disabled_at)
+    vested: uint256 = self._vested(claim_period_end, start, end, cliff, packed_amounts & AMOUNT_MASK)
+    claimable: uint256 = min(vested - claimed, amount)
+    self.packed_amounts = ((claimed + claimable) << 128) | (packed_amounts & AMOUNT_MASK)
+
+    assert ERC20(token).transfer(beneficiary, claimable, default_return_value=True)
     log Claim(beneficiary, claimable)
 
     return claimable
@@ -184,19 +283,28 @@ def revoke(ts: uint256 = block.timestamp, beneficiary: address = msg.sender):
     @param ts Timestamp of the clawback
     @param beneficiary Recipient of the unvested part
     """
-    owner: address = self.owner
+    packed_owner: uint256 = self.packed_owner
+    owner: address = convert(packed_owner & ADDRESS_MASK, address)
     assert msg.sender == owner  # dev: not owner
-    assert ts >= block.timestamp and ts < self.end_time  # dev: no back to the future
+    recipient: address = empty(address)
+    start: uint256 = 0
+    end: uint256 = 0
+    recipient, start, end = self._unpack(self.packed_recipient)
+    assert ts >= block.timestamp and ts < end  # dev: no back to the future
 
     ruggable: uint256 = self._locked(ts)
-    self.disabled_at = ts
+    token: address = empty(address)
+    cliff: uint256 = 0
+    disabled_at: uint256 = 0
+    token, cliff, disabled_at = self._unpack(self.packed_token)
+    self.packed_token = self._pack(token, cliff, ts)
 
-    assert self.token.transfer(beneficiary, ruggable, default_return_value=True)
+    assert ERC20(token).transfer(beneficiary, ruggable, default_return_value=True)
 
-    self.owner = empty(address)
+    self.packed_owner = packed_owner & ~ADDRESS_MASK
 
     log Disowned(owner)
-    log Revoked(self.recipient, owner, ruggable, ts)
+    log Revoked(recipient, owner, ruggable, ts)
 
 
 @external
@@ -204,9 +312,10 @@ def disown():
     """
     @notice Renounce owner control of the escrow
     """
-    owner: address = self.owner
+    packed_owner: uint256 = self.packed_owner
+    owner: address = convert(packed_owner & ADDRESS_MASK, address)
     assert msg.sender == owner  # dev: not owner
-    self.owner = empty(address)
+    self.packed_owner = packed_owner & ~ADDRESS_MASK
 
     log Disowned(owner)
 
@@ -216,20 +325,23 @@ def set_open_claim(open_claim: bool):
     """
     @notice Disallow or let anyone claim tokens for `recipient`
     """
-    assert msg.sender == self.recipient  # dev: not recipient
-    self.open_claim = open_claim
+    assert msg.sender == self._unpack(self.packed_recipient)[0]  # dev: not recipient
+    packed_owner: uint256 = self.packed_owner & ~OPEN_CLAIM_FLAG
+    if open_claim:
+        packed_owner |= OPEN_CLAIM_FLAG
+    self.packed_owner = packed_owner
 
     log SetOpenClaim(open_claim)
 
 
 @external
 def collect_dust(token: ERC20, beneficiary: address = msg.sender):
-    recipient: address = self.recipient
-    assert msg.sender == recipient or self.open_claim and recipient == beneficiary  # dev: not authorized
+    recipient: address = self._unpack(self.packed_recipient)[0]
+    assert msg.sender == recipient or self.packed_owner & OPEN_CLAIM_FLAG > 0 and recipient == beneficiary  # dev: not authorized
 
     amount: uint256 = token.balanceOf(self)
-    if token == self.token:
-        amount = amount + self.total_claimed - self._total_vested_at(self.disabled_at)
+    if token.address == self._unpack(self.packed_token)[0]:
+        amount = amount + (self.packed_amounts >> 128) - self._total_vested_at(self._unpack(self.packed_token)[2])
 
     assert token.transfer(beneficiary, amount, default_return_value=True)
 
@@ -244,7 +356,7 @@ def set_signed_message(_hash: bytes32, _signed: bool):
     @param _signed True: signed, False; not signed
     @dev Can only be called by operators
     """
-    assert msg.sender == self.recipient
+    assert msg.sender == self._unpack(self.packed_recipient)[0]
     assert _hash != empty(bytes32)
     self.messages[_hash] = _signed
     log SetSignedMessage(_hash, _signed)
@@ -261,10 +373,10 @@ def set_operator(_operator: address, _flag: bool):
     @dev Prior to adding new operators their functionality should be closely reviewed, as a
         malicious operator could allow tokens to be transferred out of the vesting contract
     """
-    assert msg.sender == self.recipient
+    assert msg.sender == self._unpack(self.packed_recipient)[0]
     assert _operator != empty(address)
     if _flag:
-        assert self.factory.operators(self.token.address, _operator)
+        assert self.factory.operators(self._unpack(self.packed_token)[0], _operator)
     self.operators[_operator] = _flag
     log SetOperator(_operator, _flag)
 
@@ -291,10 +403,29 @@ def call(_target: address, _data: Bytes[2048]):
     @param _data Calldata
     @dev Can only be called by operators or vest recipient
     """
-    if msg.sender == self.recipient:
-        assert _target != self.token.address
+    if msg.sender == self._unpack(self.packed_recipient)[0]:
+        assert _target != self._unpack(self.packed_token)[0]
     else:
         assert self.operators[msg.sender]
 
     raw_call(_target, _data, value=msg.value)
     log Call(msg.sender, _target)
+
+
+@internal
+@pure
+def _pack(_account: address, _a: uint256, _b: uint256) -> uint256:
+    """
+    @notice Pack an address and two timestamps into a single storage slot
+    """
+    assert _a <= TIME_MASK and _b <= TIME_MASK
+    return (_b << 208) | (_a << 160) | convert(_account, uint256)
+
+
+@internal
+@pure
+def _unpack(_packed: uint256) -> (address, uint256, uint256):
+    """
+    @notice Unpack an address and two timestamps from a single storage slot
+    """
+    return convert(_packed & ADDRESS_MASK, address), (_packed >> 160) & TIME_MASK, _packed >> 208
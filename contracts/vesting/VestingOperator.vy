@@ -9,6 +9,7 @@
     - Lock their staked upYFI to receive the maximum vote weight possible 
         right away, instead of having to wait for it to accrue over time
     - Claim staking rewards
+    Each action can also be applied to multiple vests of the same recipient at once.
 """
 
 interface Vesting:
@@ -21,6 +22,8 @@ rewards: public(immutable(address))
 delegate_registry: public(immutable(address))
 delegation_space: public(immutable(bytes32))
 
+MAX_VESTINGS: constant(uint256) = 32
+
 event Lock:
     vesting: indexed(Vesting)
     duration: uint256
@@ -51,12 +54,19 @@ def set_snapshot_delegate(_vesting: Vesting, _delegate: address):
     @param _delegate Address to delegate voting weight to
     """
     assert msg.sender == _vesting.recipient()
-    data: Bytes[68] = b""
-    if _delegate == empty(address):
-        data = _abi_encode(delegation_space, method_id=method_id("clearDelegate(bytes32)"))
-    else:
-        data = _abi_encode(delegation_space, _delegate, method_id=method_id("setDelegate(bytes32,address)"))
-    _vesting.call(delegate_registry, data)
+    self._set_snapshot_delegate(_vesting, _delegate)
+
+@external
+def set_snapshot_delegate_many(_vestings: DynArray[Vesting, MAX_VESTINGS], _delegate: address):
+    """
+    @notice Delegate Snapshot voting weight of multiple vests
+    @param _vestings Vesting contract addresses
+    @param _delegate Address to delegate voting weight to
+    @dev Can only be called by recipient of all vests
+    """
+    for vesting in _vestings:
+        assert msg.sender == vesting.recipient()
+        self._set_snapshot_delegate(vesting, _delegate)
 
 @external
 def lock(_vesting: Vesting, _duration: uint256 = max_value(uint256)):
@@ -67,9 +77,19 @@ def lock(_vesting: Vesting, _duration: uint256 = max_value(uint256)):
     @dev Can only be called by recipient of the vest
     """
     assert msg.sender == _vesting.recipient()
-    data: Bytes[36] = _abi_encode(_duration, method_id=method_id("lock(uint256)"))
-    _vesting.call(staking, data)
-    log Lock(_vesting, _duration)
+    self._lock(_vesting, _duration)
+
+@external
+def lock_many(_vestings: DynArray[Vesting, MAX_VESTINGS], _duration: uint256 = max_value(uint256)):
+    """
+    @notice Lock supYFI of multiple vests to increase their voting weight
+    @param _vestings Vesting contract addresses
+    @param _duration Lock duration (seconds)
+    @dev Can only be called by recipient of all vests
+    """
+    for vesting in _vestings:
+        assert msg.sender == vesting.recipient()
+        self._lock(vesting, _duration)
 
 @external
 @payable
@@ -81,6 +101,70 @@ def claim(_vesting: Vesting, _receiver: address = msg.sender, _redeem_data: Byte
     @param _redeem_data Data sent to redemption contract
     """
     assert msg.sender == _vesting.recipient()
+    self._claim(_vesting, _receiver, _redeem_data, msg.value)
+
+@external
+@payable
+def claim_many(
+    _vestings: DynArray[Vesting, MAX_VESTINGS],
+    _receiver: address = msg.sender,
+    _redeem_data: DynArray[Bytes[256], MAX_VESTINGS] = [],
+    _values: DynArray[uint256, MAX_VESTINGS] = []
+):
+    """
+    @notice Claim staking rewards from multiple vests to a single receiver
+    @param _vestings Vesting contract addresses
+    @param _receiver Reward recipient
+    @param _redeem_data Data sent to redemption contract, per vest. Empty to claim without redemption
+    @param _values ETH sent along with each claim. Empty to claim without ETH
+    @dev Can only be called by recipient of all vests
+    @dev The ETH values have to add up to the ETH sent along
+    """
+    num: uint256 = len(_vestings)
+    assert len(_redeem_data) in [0, num] and len(_values) in [0, num]
+
+    total: uint256 = 0
+    for i in range(MAX_VESTINGS):
+        if i == num:
+            break
+        vesting: Vesting = _vestings[i]
+        assert msg.sender == vesting.recipient()
+        redeem_data: Bytes[256] = b""
+        if len(_redeem_data) > 0:
+            redeem_data = _redeem_data[i]
+        value: uint256 = 0
+        if len(_values) > 0:
+            value = _values[i]
+        self._claim(vesting, _receiver, redeem_data, value)
+        total += value
+    assert total == msg.value
+
+@internal
+def _set_snapshot_delegate(_vesting: Vesting, _delegate: address):
+    """
+    @notice Set or clear the Snapshot delegate through the vesting contract
+    """
+    data: Bytes[68] = b""
+    if _delegate == empty(address):
+        data = _abi_encode(delegation_space, method_id=method_id("clearDelegate(bytes32)"))
+    else:
+        data = _abi_encode(delegation_space, _delegate, method_id=method_id("setDelegate(bytes32,address)"))
+    _vesting.call(delegate_registry, data)
+
+@internal
+def _lock(_vesting: Vesting, _duration: uint256):
+    """
+    @notice Lock supYFI through the vesting contract
+    """
+    data: Bytes[36] = _abi_encode(_duration, method_id=method_id("lock(uint256)"))
+    _vesting.call(staking, data)
+    log Lock(_vesting, _duration)
+
+@internal
+def _claim(_vesting: Vesting, _receiver: address, _redeem_data: Bytes[256], _value: uint256):
+    """
+    @notice Claim staking rewards through the vesting contract
+    """
     data: Bytes[356] = _abi_encode(_receiver, _redeem_data, method_id=method_id("claim(address,bytes)"))
-    _vesting.call(rewards, data, value=msg.value)
+    _vesting.call(rewards, data, value=_value)
     log Claim(_vesting, _receiver)
@@ -0,0 +1,56 @@
+"""
+Offline prediction of the gauge addresses deployed by `Factory`.
+
+The factory deploys every gauge with CREATE2, salted with the address of its Yearn gauge
+and the number of gauges previously deployed for it (`Factory.deployments`), so its address
+only depends on the factory, the Yearn gauge, that index and the deployed initcode.
+These helpers reproduce `Factory.predict_gauge` without a connection to a node.
+"""
+
+from eth_abi import encode
+from eth_utils import keccak, to_checksum_address
+
+# initcode that deploys everything appended to it
+GAUGE_LOADER = bytes.fromhex('600b80380380913d393df3')
+
+def _address_bytes(address):
+    return bytes.fromhex(str(address).removeprefix('0x'))
+
+def _salt(ygauge, index):
+    return index.to_bytes(12, 'big') + _address_bytes(ygauge)
+
+def create2_address(deployer, salt, initcode):
+    """
+    Address of a contract deployed with CREATE2
+    https://eips.ethereum.org/EIPS/eip-1014
+    """
+    digest = keccak(b"\xff" + _address_bytes(deployer) + salt + keccak(initcode))
+    return to_checksum_address(digest[12:])
+
+def predict_gauge(factory, ygauge, proxy, reward_token, rewards, initcode, index=0):
+    """
+    Address of the `index`th gauge for `ygauge` deployed from the blueprint, where `initcode`
+    is the gauge initcode stored in the blueprint, without the blueprint preamble
+    """
+    args = [str(ygauge), str(proxy), str(reward_token), str(rewards)]
+    initcode = bytes(initcode) + encode(['address', 'address', 'address', 'address'], args)
+    return create2_address(factory, _salt(ygauge, index), initcode)
+
+def clone_code(implementation, ygauge, proxy, reward_token, rewards, asset, decimals):
+    """
+    Runtime code of a gauge clone: minimal proxy followed by the gauge configuration
+    https://eips.ethereum.org/EIPS/eip-1167
+    """
+    code = bytes.fromhex('363d3d373d3d3d363d73') + _address_bytes(implementation)
+    code += bytes.fromhex('5af43d82803e903d91602b57fd5bf3')
+    for address in [ygauge, proxy, reward_token, rewards, asset]:
+        code += _address_bytes(address)
+    return code + decimals.to_bytes(1, 'big')
+
+def predict_gauge_clone(factory, implementation, ygauge, proxy, reward_token, rewards, asset, decimals, index=0):
+    """
+    Address of the `index`th gauge for `ygauge` deployed as clone of `implementation`,
+    where `asset` and `decimals` are those of the Yearn gauge
+    """
+    initcode = GAUGE_LOADER + clone_code(implementation, ygauge, proxy, reward_token, rewards, asset, decimals)
+    return create2_address(factory, _salt(ygauge, index), initcode)
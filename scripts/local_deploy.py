@@ -0,0 +1,38 @@
+"""
+Deployment of the protocol core on a local chain, without mainnet contracts.
+
+veYFI and its reward pool are replaced by the mocks in `test/mocks`, which are shared with
+the foundry tests. Used by the test fixtures and by the scenarios of `profile_gas`.
+"""
+
+from functools import cache
+from pathlib import Path
+from ape import chain, compilers, project
+
+MOCKS = Path(__file__).parents[1] / 'test' / 'mocks'
+MAX_VALUE = 2**256 - 1
+ZERO_ADDRESS = '0x0000000000000000000000000000000000000000'
+
+@cache
+def mock(name):
+    """
+    Contract type of a veYFI mock, compiled once per process
+    """
+    return compilers.compile_source('vyper', (MOCKS / f'{name}.vy').read_text(), contractName=name)
+
+def deploy_voting_escrow(locking_token, deployer):
+    voting_escrow = mock('veYFI').deploy(locking_token, ZERO_ADDRESS, sender=deployer)
+    reward_pool = mock('YFIRewardPool').deploy(voting_escrow, chain.pending_timestamp, sender=deployer)
+    voting_escrow.setRewardPool(reward_pool, sender=deployer)
+    return voting_escrow
+
+def deploy_proxy(locking_token, voting_escrow, deployer):
+    proxy = project.Proxy.deploy(voting_escrow, sender=deployer)
+    data = locking_token.approve.encode_input(voting_escrow, MAX_VALUE)
+    proxy.call(locking_token, data, sender=deployer)
+    return proxy
+
+def deploy_liquid_locker(locking_token, voting_escrow, proxy, deployer):
+    locker = project.LiquidLocker.deploy(locking_token, voting_escrow, proxy, sender=deployer)
+    proxy.set_operator(locker, True, sender=deployer)
+    return locker
@@ -0,0 +1,317 @@
+"""
+Per-line gas profiler for the protocol contracts.
+
+Replays a transaction with `debug_traceTransaction` and maps every executed opcode back to a
+Vyper source line through the source map of the compiler. For each contract in the call tree
+it reports the gas, SLOAD/SSTORE count and external call count of every line. The cost of a
+call is the gas spent by the calling contract itself, the callee's gas is counted in the callee.
+Optionally the call tree is written in the folded stack format of flamegraph.pl and speedscope.
+
+Contracts are recognized by comparing their code with the runtime bytecode of the sources in
+`contracts` and `test/mocks` that target the installed Vyper version.
+
+    ape run profile_gas scenario gauge_deposit --network ethereum:local
+    ape run profile_gas tx 0x... --folded deposit.folded
+"""
+
+import re
+from collections import Counter, defaultdict
+from dataclasses import dataclass
+from functools import cache
+from pathlib import Path
+
+import click
+import vyper
+import vyper.ast as vy_ast
+from ape import accounts, chain, project
+from ape.cli import ConnectedProviderCommand
+from eth_utils import to_checksum_address
+
+try:
+    from .local_deploy import MAX_VALUE, MOCKS, deploy_liquid_locker, deploy_proxy, deploy_voting_escrow
+except ImportError:
+    # imported as a top level module by the tests
+    from local_deploy import MAX_VALUE, MOCKS, deploy_liquid_locker, deploy_proxy, deploy_voting_escrow
+
+ROOT = Path(__file__).parents[1]
+SOURCE_DIRS = [ROOT / 'contracts', MOCKS]
+CALL_OPS = {'CALL', 'STATICCALL', 'DELEGATECALL', 'CALLCODE'}
+UNIT = 10**18
+WEEK = 7 * 24 * 60 * 60
+
+@dataclass(frozen=True)
+class Source:
+    """
+    Compiled Vyper source with its pc to line mapping
+    """
+    name: str
+    lines: tuple[str, ...]
+    runtime: bytes
+    pc_lines: dict[int, int]
+    functions: tuple[tuple[int, int, str], ...]
+
+    @classmethod
+    def compile(cls, path):
+        code = path.read_text()
+        out = vyper.compile_code(code, output_formats=['bytecode_runtime', 'source_map'])
+        pc_lines = {pc: pos[0] for pc, pos in out['source_map']['pc_pos_map'].items() if pos is not None}
+        functions = tuple(
+            (fn.lineno, fn.end_lineno, fn.name)
+            for fn in vy_ast.parse_to_ast(code).get_children(vy_ast.FunctionDef)
+        )
+        runtime = bytes.fromhex(out['bytecode_runtime'].removeprefix('0x'))
+        return cls(path.stem, tuple(code.splitlines()), runtime, pc_lines, functions)
+
+    def line(self, pc):
+        """
+        Source line of a pc, zero if it is not mapped
+        """
+        return self.pc_lines.get(pc, 0)
+
+    def function(self, line):
+        """
+        Name of the function that contains a line, if any
+        """
+        for start, end, name in self.functions:
+            if start <= line <= end:
+                return name
+        return None
+
+    def text(self, line):
+        return self.lines[line - 1].strip() if line > 0 else '<unmapped>'
+
+@dataclass
+class LineStats:
+    gas: int = 0
+    sload: int = 0
+    sstore: int = 0
+    calls: int = 0
+
+@dataclass
+class Frame:
+    address: str
+    source: Source | None
+    path: tuple[str, ...]
+    gas: int = 0
+    call_step: dict | None = None
+
+@cache
+def _sources():
+    # only sources for the installed compiler can be reproduced exactly
+    pragma = re.compile(r'#\s*(?:@version|pragma version)\s+\^?([\d.]+)')
+    sources = []
+    for directory in SOURCE_DIRS:
+        for path in sorted(directory.rglob('*.vy')):
+            match = pragma.search(path.read_text())
+            if match is None or match.group(1) != vyper.__version__.split('+')[0]:
+                continue
+            sources.append(Source.compile(path))
+    return sources
+
+@cache
+def _source(address):
+    # deployed code is the runtime code followed by the values of immutables
+    code = bytes(chain.provider.get_code(address))
+    for source in _sources():
+        if len(source.runtime) > 0 and code.startswith(source.runtime):
+            return source
+    return None
+
+def _address(word):
+    return to_checksum_address(f'{int(word, 16) % 2**160:040x}')
+
+def _name(frame, line):
+    if frame.source is None:
+        return frame.address
+    function = frame.source.function(line)
+    if function is None:
+        return frame.source.name
+    return f'{frame.source.name}.{function}'
+
+class Profile:
+    """
+    Gas profile of a single transaction
+    """
+    def __init__(self):
+        self.lines = defaultdict(lambda: defaultdict(LineStats))
+        self.sources = {}
+        self.folded = Counter()
+        self.total = 0
+
+    @classmethod
+    def from_transaction(cls, txn_hash):
+        receipt = chain.provider.get_receipt(txn_hash)
+        trace = chain.provider.make_request(
+            'debug_traceTransaction', [txn_hash, {'enableMemory': False, 'disableStorage': True}]
+        )
+        profile = cls()
+        profile.process(receipt.receiver, trace['structLogs'])
+        return profile
+
+    def process(self, address, steps):
+        """
+        Attribute the gas of every step of a trace to its contract and source line
+        """
+        frames = [self._frame(address, ())]
+        for i, step in enumerate(steps):
+            frame = frames[-1]
+            line = frame.source.line(step['pc']) if frame.source is not None else 0
+            stats = self.lines[frame.address][line]
+            op = step['op']
+            if op == 'SLOAD':
+                stats.sload += 1
+            elif op == 'SSTORE':
+                stats.sstore += 1
+            elif op in CALL_OPS:
+                stats.calls += 1
+
+            following = steps[i + 1] if i + 1 < len(steps) else None
+            if following is not None and following['depth'] > step['depth']:
+                # entering a call, its cost is known once it returns
+                callee = _address(step['stack'][-2]) if op in CALL_OPS else f'<{op.lower()}>'
+                frame.call_step = dict(step, line=line)
+                frames.append(self._frame(callee, frame.path + (_name(frame, line),)))
+                continue
+
+            if following is None or following['depth'] == step['depth']:
+                gas = step['gas'] - following['gas'] if following is not None else step['gasCost']
+                self._record(frame, line, gas)
+                continue
+
+            # returning from a call: attribute the call overhead to the caller
+            self._record(frame, line, step['gasCost'])
+            frames.pop()
+            caller = frames[-1]
+            call = caller.call_step
+            inclusive = call['gas'] - following['gas']
+            self._record(caller, call['line'], inclusive - frame.gas)
+            caller.gas += frame.gas
+
+    def _frame(self, address, path):
+        source = _source(address) if address.startswith('0x') else None
+        self.sources[address] = source
+        return Frame(address, source, path)
+
+    def _record(self, frame, line, gas):
+        frame.gas += gas
+        self.total += gas
+        self.lines[frame.address][line].gas += gas
+        self.folded[';'.join(frame.path + (_name(frame, line),))] += gas
+
+    def report(self, top):
+        """
+        Per contract summary with its most expensive lines
+        """
+        out = []
+        for address, lines in sorted(self.lines.items(), key=lambda item: -sum(s.gas for s in item[1].values())):
+            source = self.sources[address]
+            name = source.name if source is not None else '<unknown>'
+            gas = sum(s.gas for s in lines.values())
+            sload = sum(s.sload for s in lines.values())
+            sstore = sum(s.sstore for s in lines.values())
+            calls = sum(s.calls for s in lines.values())
+            out.append(f'{name} {address}: {gas:,} gas, {sload} SLOAD, {sstore} SSTORE, {calls} calls')
+            out.append(f'  {"line":>5} {"gas":>9} {"sload":>5} {"sstore":>6} {"calls":>5}  source')
+            for line, stats in sorted(lines.items(), key=lambda item: -item[1].gas)[:top]:
+                text = source.text(line) if source is not None else ''
+                out.append(
+                    f'  {line:>5} {stats.gas:>9,} {stats.sload:>5} {stats.sstore:>6} {stats.calls:>5}  {text}'
+                )
+            out.append('')
+        return '\n'.join(out)
+
+    def write_folded(self, path):
+        path.write_text(''.join(f'{stack} {gas}\n' for stack, gas in sorted(self.folded.items()) if gas > 0))
+
+# scenarios, deployed on top of mock tokens and the veYFI mocks
+
+def _deploy_core(deployer):
+    locking_token = project.MockToken.deploy(sender=deployer)
+    discount_token = project.MockToken.deploy(sender=deployer)
+    voting_escrow = deploy_voting_escrow(locking_token, deployer)
+    proxy = deploy_proxy(locking_token, voting_escrow, deployer)
+    liquid_locker = deploy_liquid_locker(locking_token, voting_escrow, proxy, deployer)
+    return locking_token, discount_token, proxy, liquid_locker
+
+def gauge_deposit():
+    """
+    Deposit into a gauge that harvests rewards: Gauge -> yearn gauge, GaugeRewards -> token
+    """
+    deployer, alice, bob = accounts.test_accounts[:3]
+    _, discount_token, proxy, _ = _deploy_core(deployer)
+    registry = project.MockRegistry.deploy(sender=deployer)
+    rewards = project.GaugeRewards.deploy(discount_token, registry, sender=deployer)
+    asset = project.MockToken.deploy(sender=deployer)
+    ygauge = project.MockYearnGauge.deploy(sender=deployer)
+    ygauge.initialize(asset, discount_token, sender=deployer)
+    gauge = project.Gauge.deploy(ygauge, proxy, discount_token, rewards, sender=deployer)
+    registry.set_gauge_map(ygauge, gauge, sender=deployer)
+    proxy.call(ygauge, ygauge.setRecipient.encode_input(gauge), sender=deployer)
+    ygauge.set_reward_rate(UNIT, sender=deployer)
+    for account in [alice, bob]:
+        asset.mint(account, UNIT, sender=deployer)
+        asset.approve(gauge, MAX_VALUE, sender=account)
+    gauge.deposit(UNIT, sender=alice)
+    return gauge.deposit(UNIT, sender=bob)
+
+def staking_deposit():
+    """
+    Stake after a reward week rollover: Staking._update_balance -> StakingRewards.report
+    """
+    deployer, alice, bob = accounts.test_accounts[:3]
+    locking_token, discount_token, proxy, liquid_locker = _deploy_core(deployer)
+    staking = project.Staking.deploy(liquid_locker, sender=deployer)
+    rewards = project.StakingRewards.deploy(proxy, staking, locking_token, discount_token, sender=deployer)
+    staking.set_rewards(rewards, sender=deployer)
+    for token in [locking_token, discount_token]:
+        proxy.call(token, token.approve.encode_input(rewards, MAX_VALUE), sender=deployer)
+        token.mint(proxy, UNIT, sender=deployer)
+    for account in [alice, bob]:
+        locking_token.mint(account, UNIT, sender=deployer)
+        locking_token.approve(liquid_locker, MAX_VALUE, sender=account)
+        liquid_locker.deposit(UNIT, sender=account)
+        liquid_locker.approve(staking, MAX_VALUE, sender=account)
+    staking.deposit(liquid_locker.balanceOf(bob), sender=bob)
+    rewards.harvest(UNIT, UNIT, sender=deployer)
+    chain.pending_timestamp += WEEK
+    return staking.deposit(liquid_locker.balanceOf(alice), sender=alice)
+
+SCENARIOS = {
+    'gauge_deposit': gauge_deposit,
+    'staking_deposit': staking_deposit,
+}
+
+def _output(profile, folded, top):
+    click.echo(profile.report(top))
+    click.echo(f'traced {profile.total:,} gas')
+    if folded is not None:
+        profile.write_folded(folded)
+        click.echo(f'folded stacks written to {folded}')
+
+@click.group()
+def cli():
+    """
+    Per-line gas profiler
+    """
+
+@cli.command(cls=ConnectedProviderCommand)
+@click.argument('name', type=click.Choice(sorted(SCENARIOS)))
+@click.option('--folded', type=click.Path(path_type=Path), help='Write the call tree as folded stacks')
+@click.option('--top', default=20, help='Number of lines to show per contract')
+def scenario(name, folded, top):
+    """
+    Run a scenario on a local chain and profile its final transaction
+    """
+    receipt = SCENARIOS[name]()
+    click.echo(f'{name}: {receipt.gas_used:,} gas used')
+    _output(Profile.from_transaction(receipt.txn_hash), folded, top)
+
+@cli.command(cls=ConnectedProviderCommand)
+@click.argument('txn_hash')
+@click.option('--folded', type=click.Path(path_type=Path), help='Write the call tree as folded stacks')
+@click.option('--top', default=20, help='Number of lines to show per contract')
+def tx(txn_hash, folded, top):
+    """
+    Profile an existing transaction
+    """
+    _output(Profile.from_transaction(txn_hash), folded, top)
@@ -0,0 +1,166 @@
+"""
+Off-chain model of the cost of redeeming discount tokens through `BasicRedeemer`.
+
+Reproduces the invariant math of the Curve dYFI/ETH crypto pool and the linear redemption
+cost of the Yearn redemption contract in floating point, so that many candidate sell amounts
+can be evaluated in a single vectorized pass. The result can be used to pick a claim
+strategy and to build the `_data` argument of `BasicRedeemer.redeem`.
+"""
+
+from dataclasses import dataclass
+from eth_abi import encode
+import numpy as np
+
+N_COINS = 2
+A_MULTIPLIER = 10_000
+PRECISION = 10**18
+FEE_PRECISION = 10**10
+
+NUM_CANDIDATES = 4096
+NUM_ROUNDS = 4
+NUM_ITERATIONS = 64
+MARGIN = 1e-9
+
+@dataclass(frozen=True)
+class CurvePool:
+    """
+    Snapshot of the state of a two coin Curve crypto pool, both coins with 18 decimals
+    """
+    balances: tuple[int, int]
+    price_scale: int
+    D: int
+    A: int
+    gamma: int
+    mid_fee: int
+    out_fee: int
+    fee_gamma: int
+
+    @classmethod
+    def from_contract(cls, pool):
+        return cls(
+            (pool.balances(0), pool.balances(1)), pool.price_scale(), pool.D(), pool.A(),
+            pool.gamma(), pool.mid_fee(), pool.out_fee(), pool.fee_gamma()
+        )
+
+    def get_dy(self, i, j, dx):
+        """
+        Amount of coin `j` received for each amount `dx` of coin `i`, in wei
+        """
+        assert i != j and i < N_COINS and j < N_COINS
+        dx = np.asarray(dx, dtype=np.float64) / PRECISION
+        scale = self.price_scale / PRECISION
+        balances = [np.full_like(dx, b / PRECISION) for b in self.balances]
+        balances[i] = balances[i] + dx
+        xp = [balances[0], balances[1] * scale]
+        D = self.D / PRECISION
+
+        # bisect the invariant for the new balance of coin `j`, which is negative at
+        # zero and positive at the balance before the trade
+        lo = np.zeros_like(dx)
+        hi = xp[j].copy()
+        for _ in range(NUM_ITERATIONS):
+            mid = (lo + hi) / 2
+            x = [xp[0], mid] if j == 1 else [mid, xp[1]]
+            below = self._invariant(x[0], x[1], D) < 0
+            lo = np.where(below, mid, lo)
+            hi = np.where(below, hi, mid)
+        y = (lo + hi) / 2
+
+        dy = xp[j] - y
+        xp[j] = y
+        if j > 0:
+            dy = dy / scale
+        dy = dy - self._fee(xp[0], xp[1]) * dy
+        return np.maximum(dy, 0) * PRECISION
+
+    def _invariant(self, x0, x1, D):
+        A = self.A / A_MULTIPLIER / N_COINS**N_COINS
+        gamma = self.gamma / PRECISION
+        K0 = N_COINS**N_COINS * x0 * x1 / D**2
+        K = A * K0 * gamma**2 / (gamma + 1 - K0)**2
+        return K * D * (x0 + x1) + x0 * x1 - K * D**2 - (D / N_COINS)**N_COINS
+
+    def _fee(self, x0, x1):
+        fee_gamma = self.fee_gamma / PRECISION
+        f = fee_gamma / (fee_gamma + 1 - N_COINS**N_COINS * x0 * x1 / (x0 + x1)**2)
+        return (self.mid_fee * f + self.out_fee * (1 - f)) / FEE_PRECISION
+
+@dataclass(frozen=True)
+class YearnRedemption:
+    """
+    Snapshot of the redemption cost of discount tokens, in ETH per token
+    """
+    rate: int
+
+    @classmethod
+    def from_contract(cls, redemption):
+        return cls(redemption.eth_required(PRECISION))
+
+    def eth_required(self, amount):
+        return np.asarray(amount, dtype=np.float64) * self.rate / PRECISION
+
+@dataclass(frozen=True)
+class Quote:
+    """
+    Claim strategy with its value in ETH, the ETH to send along and the data to pass to the redeemer
+    """
+    strategy: str
+    value: int
+    sell_amount: int
+    eth_amount: int
+    data: bytes
+
+def sell_amount(pool, redemption, dt_amount, num=NUM_CANDIDATES, rounds=NUM_ROUNDS, margin=MARGIN):
+    """
+    Smallest amount of discount tokens to sell through the pool such that the proceeds cover
+    the redemption cost of the remainder. Each round evaluates `num` evenly spaced candidates
+    and zooms in on the interval containing the smallest feasible one. The proceeds are reduced
+    by a relative `margin` to absorb the difference between floating and integer math
+    """
+    lo, hi = 0.0, float(dt_amount)
+    for _ in range(rounds):
+        candidates = np.linspace(lo, hi, num)
+        surplus = pool.get_dy(0, 1, candidates) * (1 - margin) - redemption.eth_required(dt_amount - candidates)
+        feasible = np.flatnonzero(surplus >= 0)
+        if len(feasible) == 0:
+            raise ValueError('sale does not cover redemption cost')
+        k = feasible[0]
+        hi = candidates[k]
+        if k == 0:
+            break
+        lo = candidates[k - 1]
+        if hi - lo < 1:
+            break
+
+    amount = int(np.ceil(hi))
+    if amount >= dt_amount:
+        raise ValueError('sale does not cover redemption cost')
+    return amount
+
+def redeem_data(amount):
+    """
+    Encode a sell amount as `_data` for `BasicRedeemer.redeem`
+    """
+    return encode(['uint256'], [amount])
+
+def quote(pool, redemption, dt_amount, lt_price):
+    """
+    Value in ETH of the available ways to claim discount tokens, best first.
+    Claiming naked values the discount tokens at the price they can be sold for,
+    redeeming values the locking tokens at `lt_price`, in ETH per token
+    """
+    quotes = [Quote('naked', int(pool.get_dy(0, 1, dt_amount)), 0, 0, b'')]
+
+    eth_amount = int(np.ceil(redemption.eth_required(dt_amount)))
+    value = dt_amount * lt_price // PRECISION - eth_amount
+    quotes.append(Quote('eth', value, 0, eth_amount, b''))
+
+    try:
+        amount = sell_amount(pool, redemption, dt_amount)
+        surplus = pool.get_dy(0, 1, amount) - redemption.eth_required(dt_amount - amount)
+        value = (dt_amount - amount) * lt_price // PRECISION + int(surplus)
+        quotes.append(Quote('sell', value, amount, 0, redeem_data(amount)))
+    except ValueError:
+        pass
+
+    return sorted(quotes, key=lambda q: q.value, reverse=True)
@@ -17,6 +17,10 @@ import {IERC20} from "@openzeppelin/contracts/token/ERC20/IERC20.sol";
 import {IERC4626} from "@openzeppelin/contracts/interfaces/IERC4626.sol";
 
 contract VestingEscrowFactoryTest is BaseTest, UintUtils, FoundryRandom {
+    // vesting escrows pack their start, end and cliff into 48 bits each,
+    // the factory rejects vests that end beyond that
+    uint256 internal constant MAX_ESCROW_TIME = type(uint48).max;
+
     IVestingEscrowFactory public escrowFactory;
     IVeYFI public veYFI;
     IMockToken public token;
@@ -68,6 +72,47 @@ contract VestingEscrowFactoryTest is BaseTest, UintUtils, FoundryRandom {
                 );
     }
 
+    function _setUpDepositor(address _owner) internal {
+        IVestingEscrowDepositor _depositor = _deployVestingEscrowDepositor(
+            _owner,
+            address(token),
+            address(liquidLocker),
+            address(staking),
+            _owner
+        );
+        vm.startPrank(owner);
+        escrowFactory.set_liquid_locker(address(staking), address(_depositor));
+        vm.stopPrank();
+
+        vm.startPrank(address(liquidLocker));
+        proxy.call(
+            address(token),
+            abi.encodeWithSelector(
+                token.approve.selector,
+                address(veYFI),
+                type(uint256).max
+            )
+        );
+        vm.stopPrank();
+    }
+
+    function _createVest(
+        address _recipient,
+        uint256 _vestingDuration
+    ) internal returns (uint256) {
+        uint256 _amount = 1e18;
+        token.mint(address(this), _amount);
+        token.approve(address(escrowFactory), _amount);
+        return
+            escrowFactory.create_vest(
+                _recipient,
+                _amount,
+                _vestingDuration,
+                block.timestamp,
+                0
+            );
+    }
+
     function test_deploy_vesting_contract_valid(
         uint128 _vestingDuration,
         bool _openClaim,
@@ -95,31 +140,24 @@ contract VestingEscrowFactoryTest is BaseTest, UintUtils, FoundryRandom {
         token.approve(address(escrowFactory), _amount);
         vm.stopPrank();
 
-        IVestingEscrowDepositor _depositor = _deployVestingEscrowDepositor(
-            _owner,
-            address(token),
-            address(liquidLocker),
-            address(staking),
-            _owner
-        );
-        vm.startPrank(owner);
-        escrowFactory.set_liquid_locker(address(staking), address(_depositor));
-        vm.stopPrank();
-
-        vm.startPrank(address(liquidLocker));
-        proxy.call(
-            address(token),
-            abi.encodeWithSelector(
-                token.approve.selector,
-                address(veYFI),
-                type(uint256).max
-            )
-        );
-        vm.stopPrank();
+        _setUpDepositor(_owner);
 
         vm.startPrank(_vestCreator);
         token.mint(_vestCreator, _amount);
         token.approve(address(escrowFactory), _amount);
+        if (_vestingStart + _vestingDuration > MAX_ESCROW_TIME) {
+            // could never be deployed, rejected up front
+            vm.expectRevert();
+            escrowFactory.create_vest(
+                _recipient,
+                _amount,
+                _vestingDuration,
+                _vestingStart,
+                _cliffLength
+            );
+            vm.stopPrank();
+            return;
+        }
         uint256 vestIdx = escrowFactory.create_vest(
             _recipient,
             _amount,
@@ -144,4 +182,42 @@ contract VestingEscrowFactoryTest is BaseTest, UintUtils, FoundryRandom {
         );
         assertTrue(llTokens > 0, "invalid tokens locked");
     }
+
+    function test_create_vest_out_of_range(uint256 _vestingDuration) public {
+        _vestingDuration = bound(
+            _vestingDuration,
+            MAX_ESCROW_TIME - block.timestamp + 1,
+            type(uint128).max
+        );
+        vm.expectRevert();
+        _createVest(address(0x1234), _vestingDuration);
+    }
+
+    function test_deploy_vesting_contract_max_end_time() public {
+        address _recipient = address(0x1234);
+        _setUpDepositor(address(0x5678));
+
+        // end time at the top of the packed range is accepted
+        uint256 vestIdx = _createVest(
+            _recipient,
+            MAX_ESCROW_TIME - block.timestamp
+        );
+        vm.startPrank(_recipient);
+        (address _vestingEscrow, ) = escrowFactory.deploy_vesting_contract(
+            vestIdx,
+            address(staking),
+            1e18,
+            false
+        );
+        vm.stopPrank();
+        assertEq(
+            IVestingEscrow(_vestingEscrow).end_time(),
+            MAX_ESCROW_TIME,
+            "invalid end time"
+        );
+
+        // one second beyond it cant be created
+        vm.expectRevert();
+        _createVest(_recipient, MAX_ESCROW_TIME - block.timestamp + 1);
+    }
 }
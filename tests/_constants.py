@@ -1,5 +1,10 @@
+import sys
+from pathlib import Path
 from ape import project
 
+sys.path.insert(0, str(Path(__file__).parents[1] / 'scripts'))
+from gauge_address import GAUGE_LOADER, clone_code
+
 UNIT = 10**18
 MAX_VALUE = 2**256 - 1
 DAY = 24 * 60 * 60
@@ -16,23 +21,41 @@ YCHAD = '0xFEB4acf3df3cDEA7399794D0869ef76A6EfAff52'
 
 YGAUGE = '0x7Fd8Af959B54A677a1D8F92265Bd0714274C56a3' # YFI/ETH yGauge
 
-def _blueprint(contract):
+def _initcode(contract):
     initcode = contract.contract_type.deployment_bytecode.bytecode
     assert isinstance(initcode, str)
+    return bytes.fromhex(initcode.removeprefix('0x'))
+
+def _blueprint(contract):
+    return _blueprint_code(_initcode(contract))
+
+def _blueprint_code(initcode):
     # https://eips.ethereum.org/EIPS/eip-5202
-    initcode = bytes.fromhex(initcode.removeprefix('0x'))
     initcode = b"\xFE\x71\x00" + initcode
     len_bytes = len(initcode).to_bytes(2, "big")
     initcode = b"\x61" + len_bytes + b"\x3d\x81\x60\x0a\x3d\x39\xf3" + initcode
     return initcode
 
 def _deploy_blueprint(contract, account, **kw):
-    initcode = _blueprint(contract)
+    return _deploy_initcode(_blueprint(contract), account, **kw)
+
+def _deploy_loader(account, **kw):
+    return _deploy_initcode(_blueprint_code(GAUGE_LOADER), account, **kw)
+
+def _deploy_initcode(initcode, account, **kw):
     tx = project.provider.network.ecosystem.create_transaction(
         chain_id=project.provider.chain_id,
         data=initcode,
+        sender=account.address,
         gas_limit=10_000_000,
         **kw
     )
     receipt = account.call(tx)
     return receipt.contract_address
+
+def _deploy_gauge_clone(implementation, ygauge, proxy, reward_token, rewards, asset, decimals, account):
+    # deploy and initialize a gauge clone the same way the factory does, `account` has to be the factory of the implementation
+    code = clone_code(implementation, ygauge, proxy, reward_token, rewards, asset, decimals)
+    clone = project.GaugeClone.at(_deploy_initcode(GAUGE_LOADER + code, account))
+    clone.initialize(sender=account)
+    return clone
@@ -1,44 +1,133 @@
-from ape import Contract
-from pytest import fixture
+import json
+import os
+from pathlib import Path
+from ape import Contract, networks
+from pytest import fixture, skip
 from _constants import *
+from local_deploy import deploy_liquid_locker, deploy_proxy, deploy_voting_escrow
 
-@fixture
+# Deployment fixtures are module scoped: ape snapshots the chain once they are set up
+# and reverts to that snapshot after every test, so tests stay isolated without redeploying.
+# Fixtures that only move tokens around stay function scoped.
+# The clock keeps running while a test runs, so tests that compare against the timestamp of a
+# transaction take it from its receipt instead of reading `chain.pending_timestamp` beforehand.
+
+# gas benchmarks fail when a scenario is missing from the baseline or uses more than the baseline
+# plus this tolerance. set UPDATE_GAS_BASELINE=1 to write the measured values to the baseline instead
+GAS_BASELINE = Path(__file__).parent / 'gas_baseline.json'
+GAS_TOLERANCE = 0.02
+
+# gas measured during the session, written to the baseline at the end when updating
+GAS_MEASURED = {}
+
+def pytest_configure(config):
+    config.addinivalue_line('markers', 'fork: test requires a mainnet fork')
+    config.addinivalue_line('markers', 'local: test requires a local network')
+
+def pytest_runtest_setup(item):
+    if item.get_closest_marker('fork') is not None and not _is_fork():
+        skip('requires a mainnet fork')
+    if item.get_closest_marker('local') is not None and _is_fork():
+        skip('requires a local network')
+
+def pytest_sessionfinish(session):
+    if _update_gas_baseline() and len(GAS_MEASURED) > 0:
+        baseline = json.loads(GAS_BASELINE.read_text()) if GAS_BASELINE.exists() else {}
+        baseline.update(GAS_MEASURED)
+        GAS_BASELINE.write_text(json.dumps(dict(sorted(baseline.items())), indent=4) + '\n')
+
+def _update_gas_baseline():
+    return os.environ.get('UPDATE_GAS_BASELINE') == '1'
+
+def _is_fork():
+    return networks.provider.network.name.endswith('-fork')
+
+@fixture(scope='session')
+def fork():
+    return _is_fork()
+
+class GasRecorder:
+    def __init__(self, baseline, update):
+        self.baseline = baseline
+        self.update = update
+
+    def __call__(self, name, receipt):
+        used = receipt.gas_used
+        GAS_MEASURED[name] = used
+        if not self.update:
+            expected = self.baseline.get(name)
+            assert expected is not None, f'{name}: missing from baseline, run with UPDATE_GAS_BASELINE=1'
+            assert used <= expected * (1 + GAS_TOLERANCE), f'{name}: {used} gas, baseline {expected}'
+        return used
+
+@fixture(scope='session')
+def gas():
+    baseline = json.loads(GAS_BASELINE.read_text()) if GAS_BASELINE.exists() else {}
+    return GasRecorder(baseline, _update_gas_baseline())
+
+@fixture(scope='session')
 def deployer(accounts):
     return accounts[0]
 
-@fixture
+@fixture(scope='session')
 def alice(accounts):
     return accounts[1]
 
-@fixture
+@fixture(scope='session')
 def bob(accounts):
     return accounts[2]
 
-@fixture
-def ychad(accounts):
-    return accounts[YCHAD]
-
-@fixture
-def locking_token():
-    return Contract(YFI)
-
-@fixture
-def voting_escrow():
-    return Contract(VEYFI)
-
-@fixture
-def discount_token():
-    return Contract(DYFI)
-
-@fixture
-def proxy(project, deployer, locking_token, voting_escrow):
-    proxy = project.Proxy.deploy(voting_escrow, sender=deployer)
-    data = locking_token.approve.encode_input(voting_escrow, MAX_VALUE)
-    proxy.call(locking_token, data, sender=deployer)
-    return proxy
-
-@fixture
-def liquid_locker(project, deployer, locking_token, voting_escrow, proxy):
-    locker = project.LiquidLocker.deploy(locking_token, voting_escrow, proxy, sender=deployer)
-    proxy.set_operator(locker, True, sender=deployer)
-    return locker
+@fixture(scope='module')
+def ychad(fork, accounts, deployer, locking_token):
+    if fork:
+        return accounts[YCHAD]
+    # stand-in for the yearn multisig, funded with mock YFI
+    ychad = accounts[9]
+    locking_token.mint(ychad, 10_000 * UNIT, sender=deployer)
+    return ychad
+
+@fixture(scope='module')
+def locking_token(fork, project, deployer):
+    if fork:
+        return Contract(YFI)
+    return project.MockToken.deploy(sender=deployer)
+
+@fixture(scope='module')
+def voting_escrow(fork, deployer, locking_token):
+    if fork:
+        return Contract(VEYFI)
+    return deploy_voting_escrow(locking_token, deployer)
+
+@fixture(scope='module')
+def discount_token(fork, project, deployer):
+    if fork:
+        return Contract(DYFI)
+    return project.MockToken.deploy(sender=deployer)
+
+@fixture(scope='module')
+def proxy(deployer, locking_token, voting_escrow):
+    return deploy_proxy(locking_token, voting_escrow, deployer)
+
+@fixture(scope='module')
+def liquid_locker(deployer, locking_token, voting_escrow, proxy):
+    return deploy_liquid_locker(locking_token, voting_escrow, proxy, deployer)
+
+@fixture(scope='module')
+def curve_pool(project, deployer, discount_token):
+    # dYFI/ETH pool seeded at 10 dYFI per ETH, with the parameters of the mainnet pool.
+    # requires a discount token the deployer can mint, on a fork modules override it with a mock
+    pool = project.MockCurvePool.deploy(
+        discount_token, 400_000, 145_000_000_000_000, 26_000_000, 45_000_000,
+        230_000_000_000_000, 10 * UNIT, sender=deployer
+    )
+    discount_token.mint(deployer, 1_000 * UNIT, sender=deployer)
+    discount_token.approve(pool, MAX_VALUE, sender=deployer)
+    pool.seed(1_000 * UNIT, value=100 * UNIT, sender=deployer)
+    return pool
+
+@fixture(scope='module')
+def yearn_redemption(project, deployer, ychad, locking_token, discount_token):
+    # redemption at 0.05 ETH per dYFI
+    redemption = project.MockYearnRedemption.deploy(discount_token, locking_token, UNIT // 20, sender=deployer)
+    locking_token.transfer(redemption, 10 * UNIT, sender=ychad)
+    return redemption
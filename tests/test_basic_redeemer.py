@@ -1,42 +1,32 @@
 from ape import reverts
 from ape import Contract
-from pytest import fixture
+from pytest import fixture, mark
 from eth_abi import encode
 from _constants import *
 
-@fixture
+@fixture(scope='module')
 def rewards(accounts):
     return accounts[3]
 
-@fixture
-def yearn_redemption():
-    return Contract(REDEMPTION)
-
-@fixture
-def curve_pool():
-    return Contract(DYFI_CURVE)
+@fixture(scope='module')
+def discount_token(project, deployer):
+    return project.MockToken.deploy(sender=deployer)
 
-@fixture
+@fixture(scope='module')
 def redeemer(
     project, deployer, ychad, locking_token, discount_token, voting_escrow, 
     proxy, liquid_locker, rewards, yearn_redemption, curve_pool):
 
     locking_token.approve(liquid_locker, UNIT, sender=ychad)
     liquid_locker.deposit(UNIT, sender=ychad)
-
-    redeemer = project.BasicRedeemer.deploy(
-        voting_escrow, liquid_locker, locking_token, discount_token, 
-        proxy, rewards, ZERO_ADDRESS, sender=deployer
+    return _deploy_redeemer(
+        project, deployer, locking_token, discount_token, voting_escrow,
+        proxy, liquid_locker, rewards, yearn_redemption, curve_pool
     )
-    redeemer.set_yearn_redemption(yearn_redemption, sender=deployer)
-    redeemer.set_curve_pool(curve_pool, sender=deployer)
-    return redeemer
 
 @fixture
-def mint(chain, accounts, discount_token, rewards):
-    owner = accounts[discount_token.owner()]
-    chain.set_balance(owner, UNIT)
-    discount_token.mint(rewards, UNIT, sender=owner)
+def mint(deployer, discount_token, rewards):
+    discount_token.mint(rewards, UNIT, sender=deployer)
 
 def test_redeem_discount_eth(alice, bob, liquid_locker, rewards, discount_token, yearn_redemption, redeemer, mint):
     # redeem with ETH
@@ -92,7 +82,7 @@ def test_redeem_discount_eth_lt(alice, bob, ychad, locking_token, liquid_locker,
 def test_redeem_discount_sell(alice, bob, liquid_locker, rewards, discount_token, curve_pool, redeemer, mint):
     # redeem without ETH (sell rewards)
     discount_token.approve(redeemer, UNIT, sender=rewards)
-    data = encode(['uint256'], [2 * UNIT // 10]) # sell 0.2 discount token
+    data = encode(['uint256'], [4 * UNIT // 10]) # sell 0.4 discount token
     before = discount_token.balanceOf(curve_pool)
 
     assert discount_token.balanceOf(rewards) == UNIT
@@ -102,8 +92,8 @@ def test_redeem_discount_sell(alice, bob, liquid_locker, rewards, discount_token
     redeemer.redeem(alice, bob, 0, UNIT, data, sender=rewards)
     assert discount_token.balanceOf(rewards) == 0
     assert discount_token.balanceOf(curve_pool) > before
-    assert liquid_locker.totalSupply() == 18 * SCALE // 10
-    assert liquid_locker.balanceOf(bob) == 8 * SCALE // 10
+    assert liquid_locker.totalSupply() == 16 * SCALE // 10
+    assert liquid_locker.balanceOf(bob) == 6 * SCALE // 10
     assert redeemer.balance > 0
 
 def test_redeem_discount_sell_lt(alice, bob, ychad, locking_token, liquid_locker, rewards, discount_token, curve_pool, redeemer, mint):
@@ -111,7 +101,7 @@ def test_redeem_discount_sell_lt(alice, bob, ychad, locking_token, liquid_locker
     discount_token.approve(redeemer, UNIT, sender=rewards)
     locking_token.transfer(rewards, 2 * UNIT, sender=ychad)
     locking_token.approve(redeemer, 2 * UNIT, sender=rewards)
-    data = encode(['uint256'], [2 * UNIT // 10]) # sell 0.2 discount token
+    data = encode(['uint256'], [4 * UNIT // 10]) # sell 0.4 discount token
     before = discount_token.balanceOf(curve_pool)
 
     assert discount_token.balanceOf(rewards) == UNIT
@@ -123,10 +113,36 @@ def test_redeem_discount_sell_lt(alice, bob, ychad, locking_token, liquid_locker
     assert discount_token.balanceOf(rewards) == 0
     assert discount_token.balanceOf(curve_pool) > before
     assert locking_token.balanceOf(rewards) == 0
-    assert liquid_locker.totalSupply() == 38 * SCALE // 10
-    assert liquid_locker.balanceOf(bob) == 28 * SCALE // 10
+    assert liquid_locker.totalSupply() == 36 * SCALE // 10
+    assert liquid_locker.balanceOf(bob) == 26 * SCALE // 10
     assert redeemer.balance > 0
 
+def test_quote_sell(alice, bob, liquid_locker, rewards, discount_token, yearn_redemption, curve_pool, redeemer, mint):
+    # quote the smallest sell amount that covers the redemption cost
+    sell, eth, minted = redeemer.quote_sell(0, UNIT)
+    assert 0 < sell < UNIT
+    assert eth == curve_pool.get_dy(0, 1, sell)
+    assert eth >= yearn_redemption.eth_required(UNIT - sell)
+    assert curve_pool.get_dy(0, 1, sell - 1) < yearn_redemption.eth_required(UNIT - sell + 1)
+    assert minted == (UNIT - sell) * SCALE // UNIT
+
+    # redeem using the quote
+    discount_token.approve(redeemer, UNIT, sender=rewards)
+    data = encode(['uint256'], [sell])
+    redeemer.redeem(alice, bob, 0, UNIT, data, sender=rewards)
+    assert discount_token.balanceOf(rewards) == 0
+    assert liquid_locker.balanceOf(bob) == minted
+
+def test_quote_sell_lt(redeemer):
+    # quote includes locking token rewards in the minted amount
+    sell, _, minted = redeemer.quote_sell(2 * UNIT, UNIT)
+    assert minted == (3 * UNIT - sell) * SCALE // UNIT
+
+def test_quote_sell_small(redeemer):
+    # cant quote for an amount that cant be split
+    with reverts():
+        redeemer.quote_sell(0, 1)
+
 def test_claim_excess(deployer, alice, bob, rewards, discount_token, yearn_redemption, redeemer, mint):
     # excess is sent to treasury
     redeemer.set_treasury(alice, sender=deployer)
@@ -231,3 +247,37 @@ def test_accept_management_wrong(deployer, alice, bob, redeemer):
     redeemer.set_management(alice, sender=deployer)
     with reverts():
         redeemer.accept_management(sender=bob)
+
+@mark.fork
+def test_redeem_mainnet(project, deployer, alice, bob, accounts, chain, locking_token, voting_escrow, proxy, liquid_locker, rewards):
+    # quote and redeem against the mainnet dYFI pool and redemption contract
+    discount_token = Contract(DYFI)
+    yearn_redemption = Contract(REDEMPTION)
+    curve_pool = Contract(DYFI_CURVE)
+    redeemer = _deploy_redeemer(
+        project, deployer, locking_token, discount_token, voting_escrow,
+        proxy, liquid_locker, rewards, yearn_redemption, curve_pool
+    )
+    owner = accounts[discount_token.owner()]
+    chain.set_balance(owner, UNIT)
+    discount_token.mint(rewards, UNIT, sender=owner)
+    discount_token.approve(redeemer, UNIT, sender=rewards)
+
+    sell, eth, minted = redeemer.quote_sell(0, UNIT)
+    assert 0 < sell < UNIT
+    assert eth >= yearn_redemption.eth_required(UNIT - sell)
+    redeemer.redeem(alice, bob, 0, UNIT, encode(['uint256'], [sell]), sender=rewards)
+    assert discount_token.balanceOf(rewards) == 0
+    assert liquid_locker.balanceOf(bob) == minted
+
+def _deploy_redeemer(
+    project, deployer, locking_token, discount_token, voting_escrow,
+    proxy, liquid_locker, rewards, yearn_redemption, curve_pool):
+
+    redeemer = project.BasicRedeemer.deploy(
+        voting_escrow, liquid_locker, locking_token, discount_token, 
+        proxy, rewards, ZERO_ADDRESS, sender=deployer
+    )
+    redeemer.set_yearn_redemption(yearn_redemption, sender=deployer)
+    redeemer.set_curve_pool(curve_pool, sender=deployer)
+    return redeemer
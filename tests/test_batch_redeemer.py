@@ -0,0 +1,396 @@
+from ape import reverts
+from ape import Contract
+from pytest import fixture, mark
+from _constants import *
+
+REFUND_DELAY = 7
+
+@fixture(scope='module')
+def rewards(accounts):
+    return accounts[3]
+
+@fixture(scope='module')
+def discount_token(project, deployer):
+    return project.MockToken.deploy(sender=deployer)
+
+@fixture(scope='module')
+def lock(ychad, locking_token, liquid_locker):
+    locking_token.approve(liquid_locker, UNIT, sender=ychad)
+    liquid_locker.deposit(UNIT, sender=ychad)
+
+@fixture(scope='module')
+def redeemer(
+    project, deployer, locking_token, discount_token, voting_escrow,
+    proxy, liquid_locker, rewards, yearn_redemption, curve_pool, lock):
+
+    return _deploy_redeemer(
+        project, deployer, locking_token, discount_token, voting_escrow,
+        proxy, liquid_locker, rewards, yearn_redemption, curve_pool
+    )
+
+@fixture(scope='module')
+def registry(project, deployer):
+    return project.MockRegistry.deploy(sender=deployer)
+
+@fixture(scope='module')
+def gauge_rewards(project, deployer, discount_token, registry):
+    return project.GaugeRewards.deploy(discount_token, registry, sender=deployer)
+
+@fixture(scope='module')
+def staking(project, deployer):
+    return project.MockStaking.deploy(sender=deployer)
+
+@fixture(scope='module')
+def staking_rewards(project, deployer, proxy, locking_token, discount_token, staking):
+    rewards = project.StakingRewards.deploy(proxy, staking, locking_token, discount_token, sender=deployer)
+    data = locking_token.approve.encode_input(rewards, MAX_VALUE)
+    proxy.call(locking_token, data, sender=deployer)
+    proxy.call(discount_token, data, sender=deployer)
+    staking.set_rewards(rewards, sender=deployer)
+    return rewards
+
+@fixture(scope='module')
+def rewards_redeemer(
+    project, deployer, locking_token, discount_token, voting_escrow, proxy,
+    liquid_locker, gauge_rewards, staking_rewards, yearn_redemption, curve_pool, lock):
+
+    # redeemer used by both reward contracts
+    redeemer = project.BatchRedeemer.deploy(
+        voting_escrow, liquid_locker, locking_token, discount_token,
+        proxy, gauge_rewards, staking_rewards, sender=deployer
+    )
+    redeemer.set_yearn_redemption(yearn_redemption, sender=deployer)
+    redeemer.set_curve_pool(curve_pool, sender=deployer)
+    gauge_rewards.set_redeemer(redeemer, sender=deployer)
+    staking_rewards.set_redeemer(redeemer, sender=deployer)
+    return redeemer
+
+@fixture
+def mint(deployer, discount_token, rewards, redeemer):
+    discount_token.mint(rewards, 4 * UNIT, sender=deployer)
+    discount_token.approve(redeemer, MAX_VALUE, sender=rewards)
+
+def test_queue(alice, bob, liquid_locker, rewards, discount_token, redeemer, mint):
+    # redeem without ETH queues the tokens in the current epoch
+    epoch = redeemer.epoch()
+    assert redeemer.redeem(alice, bob, 0, UNIT, b"\x01", sender=rewards).return_value == 0
+    assert discount_token.balanceOf(rewards) == 3 * UNIT
+    assert discount_token.balanceOf(redeemer) == UNIT
+    assert liquid_locker.totalSupply() == SCALE
+    assert redeemer.queued(epoch, bob) == (0, UNIT)
+    assert redeemer.queued(epoch, alice) == (0, 0)
+    assert redeemer.packed_epochs(epoch) == UNIT << 128
+    assert redeemer.claimable(epoch, bob) == 0
+
+def test_queue_add(alice, bob, rewards, redeemer, mint):
+    # queued amounts add up
+    epoch = redeemer.epoch()
+    redeemer.redeem(alice, bob, 0, UNIT, b"\x01", sender=rewards)
+    redeemer.redeem(alice, bob, 0, 2 * UNIT, b"\x01", sender=rewards)
+    redeemer.redeem(alice, alice, 0, UNIT, b"\x01", sender=rewards)
+    assert redeemer.queued(epoch, bob) == (0, 3 * UNIT)
+    assert redeemer.queued(epoch, alice) == (0, UNIT)
+    assert redeemer.packed_epochs(epoch) == 4 * UNIT << 128
+
+def test_queue_permission(alice, bob, redeemer):
+    # only reward contracts can redeem
+    with reverts():
+        redeemer.redeem(alice, bob, 0, UNIT, b"\x01", sender=alice)
+
+def test_settle(chain, alice, bob, liquid_locker, rewards, discount_token, redeemer, mint):
+    # settle an epoch and withdraw minted tokens
+    epoch = redeemer.epoch()
+    redeemer.redeem(alice, bob, 0, UNIT, b"\x01", sender=rewards)
+    chain.pending_timestamp += DAY
+    minted = redeemer.settle(epoch, sender=alice).return_value
+    assert 0 < minted < SCALE
+    assert discount_token.balanceOf(redeemer) == 0
+    assert liquid_locker.totalSupply() == SCALE + minted
+    assert liquid_locker.balanceOf(redeemer) == minted
+    assert redeemer.minted(epoch) == minted
+    assert redeemer.claimable(epoch, bob) == minted
+
+    assert redeemer.withdraw([epoch], sender=bob).return_value == minted
+    assert liquid_locker.balanceOf(bob) == minted
+    assert redeemer.queued(epoch, bob) == (0, 0)
+    assert redeemer.claimable(epoch, bob) == 0
+
+def test_settle_lt(chain, alice, bob, ychad, locking_token, liquid_locker, rewards, redeemer, mint):
+    # locking tokens are redeemed 1:1, regardless of redemption cost of discount tokens
+    locking_token.transfer(rewards, 2 * UNIT, sender=ychad)
+    locking_token.approve(redeemer, 2 * UNIT, sender=rewards)
+    epoch = redeemer.epoch()
+    redeemer.redeem(alice, alice, 2 * UNIT, 0, b"\x01", sender=rewards)
+    redeemer.redeem(alice, bob, 0, UNIT, b"\x01", sender=rewards)
+    chain.pending_timestamp += DAY
+    minted = redeemer.settle(epoch, sender=alice).return_value
+    assert redeemer.claimable(epoch, alice) == 2 * SCALE
+    assert redeemer.claimable(epoch, bob) == minted - 2 * SCALE
+
+def test_settle_pro_rata(chain, alice, bob, liquid_locker, rewards, redeemer, mint):
+    # minted tokens are distributed pro-rata
+    epoch = redeemer.epoch()
+    redeemer.redeem(alice, alice, 0, UNIT, b"\x01", sender=rewards)
+    redeemer.redeem(alice, bob, 0, 3 * UNIT, b"\x01", sender=rewards)
+    chain.pending_timestamp += DAY
+    minted = redeemer.settle(epoch, sender=alice).return_value
+    alice_amount = redeemer.claimable(epoch, alice)
+    bob_amount = redeemer.claimable(epoch, bob)
+    assert alice_amount == minted // 4
+    assert bob_amount == 3 * minted // 4
+    redeemer.withdraw([epoch], sender=alice)
+    redeemer.withdraw([epoch], bob, sender=bob)
+    assert liquid_locker.balanceOf(alice) == alice_amount
+    assert liquid_locker.balanceOf(bob) == bob_amount
+    assert liquid_locker.balanceOf(redeemer) == minted - alice_amount - bob_amount
+
+def test_settle_multiple(chain, alice, bob, liquid_locker, rewards, redeemer, mint):
+    # withdraw from multiple epochs at once
+    epoch = redeemer.epoch()
+    redeemer.redeem(alice, bob, 0, UNIT, b"\x01", sender=rewards)
+    chain.pending_timestamp += DAY
+    chain.mine()
+    redeemer.redeem(alice, bob, 0, UNIT, b"\x01", sender=rewards)
+    chain.pending_timestamp += DAY
+    minted = redeemer.settle(epoch, sender=alice).return_value
+    minted += redeemer.settle(epoch + 1, sender=alice).return_value
+    assert redeemer.withdraw([epoch, epoch + 1], sender=bob).return_value == minted
+    assert liquid_locker.balanceOf(bob) == minted
+
+def test_settle_early(alice, bob, rewards, redeemer, mint):
+    # cant settle an epoch before it has ended
+    epoch = redeemer.epoch()
+    redeemer.redeem(alice, bob, 0, UNIT, b"\x01", sender=rewards)
+    with reverts():
+        redeemer.settle(epoch, sender=alice)
+
+def test_settle_twice(chain, alice, bob, rewards, redeemer, mint):
+    # cant settle an epoch twice
+    epoch = redeemer.epoch()
+    redeemer.redeem(alice, bob, 0, UNIT, b"\x01", sender=rewards)
+    chain.pending_timestamp += DAY
+    redeemer.settle(epoch, sender=alice)
+    with reverts():
+        redeemer.settle(epoch, sender=alice)
+
+def test_settle_empty(chain, alice, redeemer):
+    # cant settle an empty epoch
+    epoch = redeemer.epoch()
+    chain.pending_timestamp += DAY
+    with reverts():
+        redeemer.settle(epoch, sender=alice)
+
+def test_settle_sandwich(chain, deployer, alice, bob, rewards, discount_token, curve_pool, redeemer, mint):
+    # settlement reverts if the pool price is pushed away from the oracle price
+    epoch = redeemer.epoch()
+    redeemer.redeem(alice, bob, 0, UNIT, b"\x01", sender=rewards)
+    chain.pending_timestamp += DAY
+    discount_token.mint(deployer, 100 * UNIT, sender=deployer)
+    curve_pool.exchange(0, 1, 100 * UNIT, 0, True, sender=deployer)
+    with reverts():
+        redeemer.settle(epoch, sender=alice)
+
+    # management can accept a larger deviation
+    redeemer.set_max_slippage(5_000, sender=deployer)
+    redeemer.settle(epoch, sender=alice)
+    assert redeemer.minted(epoch) > 0
+
+def test_settle_oracle(chain, deployer, alice, bob, rewards, curve_pool, redeemer, mint):
+    # settlement reverts if the oracle price is above the pool price
+    epoch = redeemer.epoch()
+    redeemer.redeem(alice, bob, 0, UNIT, b"\x01", sender=rewards)
+    chain.pending_timestamp += DAY
+    curve_pool.set_price_oracle(9 * UNIT, sender=deployer)
+    with reverts():
+        redeemer.settle(epoch, sender=alice)
+
+def test_set_max_slippage(deployer, alice, redeemer):
+    # only management can set max slippage, up to 100%
+    assert redeemer.max_slippage() == 200
+    redeemer.set_max_slippage(500, sender=deployer)
+    assert redeemer.max_slippage() == 500
+    with reverts():
+        redeemer.set_max_slippage(10_001, sender=deployer)
+    with reverts():
+        redeemer.set_max_slippage(100, sender=alice)
+
+def test_refund(chain, ychad, alice, bob, locking_token, discount_token, rewards, redeemer, mint):
+    # tokens queued in an epoch that is not settled in time can be refunded
+    locking_token.transfer(rewards, UNIT, sender=ychad)
+    locking_token.approve(redeemer, UNIT, sender=rewards)
+    epoch = redeemer.epoch()
+    redeemer.redeem(alice, bob, UNIT, 2 * UNIT, b"\x01", sender=rewards)
+    redeemer.redeem(alice, alice, 0, UNIT, b"\x01", sender=rewards)
+    chain.pending_timestamp += (REFUND_DELAY + 1) * DAY
+    redeemer.refund([epoch], alice, sender=bob)
+    assert locking_token.balanceOf(alice) == UNIT
+    assert discount_token.balanceOf(alice) == 2 * UNIT
+    assert redeemer.queued(epoch, bob) == (0, 0)
+    assert redeemer.queued(epoch, alice) == (0, UNIT)
+    assert redeemer.packed_epochs(epoch) == UNIT << 128
+
+    # remainder of the epoch can still be settled
+    redeemer.settle(epoch, sender=alice)
+    assert redeemer.withdraw([epoch], sender=alice).return_value == redeemer.minted(epoch)
+
+def test_refund_early(chain, alice, bob, rewards, redeemer, mint):
+    # cant refund before the refund delay has passed
+    epoch = redeemer.epoch()
+    redeemer.redeem(alice, bob, 0, UNIT, b"\x01", sender=rewards)
+    chain.pending_timestamp += REFUND_DELAY * DAY
+    with reverts():
+        redeemer.refund([epoch], sender=bob)
+
+def test_refund_settled(chain, alice, bob, rewards, redeemer, mint):
+    # cant refund a settled epoch
+    epoch = redeemer.epoch()
+    redeemer.redeem(alice, bob, 0, UNIT, b"\x01", sender=rewards)
+    chain.pending_timestamp += DAY
+    redeemer.settle(epoch, sender=alice)
+    chain.pending_timestamp += REFUND_DELAY * DAY
+    with reverts():
+        redeemer.refund([epoch], sender=bob)
+
+def test_refund_twice(chain, alice, bob, rewards, redeemer, mint):
+    # cant refund from an epoch twice
+    epoch = redeemer.epoch()
+    redeemer.redeem(alice, bob, 0, UNIT, b"\x01", sender=rewards)
+    chain.pending_timestamp += (REFUND_DELAY + 1) * DAY
+    redeemer.refund([epoch], sender=bob)
+    with reverts():
+        redeemer.refund([epoch], sender=bob)
+
+def test_gauge_rewards(chain, accounts, deployer, alice, bob, discount_token, liquid_locker, registry, gauge_rewards, rewards_redeemer):
+    # claims with redeem data from gauge rewards are queued for the receiver
+    ygauge, gauge = accounts[5], accounts[6]
+    registry.set_gauge_map(ygauge, gauge, sender=deployer)
+    discount_token.approve(gauge_rewards, MAX_VALUE, sender=gauge)
+    gauge_rewards.report(ygauge, ZERO_ADDRESS, alice, UNIT, 0, sender=gauge)
+    discount_token.mint(gauge, UNIT, sender=deployer)
+    gauge_rewards.harvest([gauge], [UNIT], sender=deployer)
+
+    epoch = rewards_redeemer.epoch()
+    gauge_rewards.claim([gauge], bob, b"\x01", sender=alice)
+    assert discount_token.balanceOf(rewards_redeemer) == UNIT
+    assert rewards_redeemer.queued(epoch, bob) == (0, UNIT)
+
+    chain.pending_timestamp += DAY
+    minted = rewards_redeemer.settle(epoch, sender=alice).return_value
+    assert 0 < minted < SCALE
+    assert rewards_redeemer.withdraw([epoch], sender=bob).return_value == minted
+    assert liquid_locker.balanceOf(bob) == minted
+
+def test_staking_rewards(chain, deployer, ychad, alice, bob, locking_token, discount_token, proxy, liquid_locker, staking, staking_rewards, rewards_redeemer):
+    # claims with redeem data from staking rewards are queued for the receiver
+    staking.mint(alice, 2 * UNIT, sender=deployer)
+    locking_token.transfer(proxy, UNIT, sender=ychad)
+    discount_token.mint(proxy, 2 * UNIT, sender=deployer)
+    staking_rewards.harvest(UNIT, 2 * UNIT, sender=deployer)
+    chain.pending_timestamp += 2 * WEEK
+    staking.burn(alice, 2 * UNIT, sender=deployer)
+
+    epoch = rewards_redeemer.epoch()
+    staking_rewards.claim(bob, b"\x01", sender=alice)
+    assert rewards_redeemer.queued(epoch, bob) == (UNIT, 2 * UNIT)
+
+    chain.pending_timestamp += DAY
+    minted = rewards_redeemer.settle(epoch, sender=alice).return_value
+    assert SCALE < minted < 3 * SCALE
+    assert rewards_redeemer.withdraw([epoch], sender=bob).return_value == minted
+    assert liquid_locker.balanceOf(bob) == minted
+
+def test_withdraw_unsettled(alice, bob, rewards, redeemer, mint):
+    # cant withdraw from an unsettled epoch
+    epoch = redeemer.epoch()
+    redeemer.redeem(alice, bob, 0, UNIT, b"\x01", sender=rewards)
+    with reverts():
+        redeemer.withdraw([epoch], sender=bob)
+
+def test_withdraw_twice(chain, alice, bob, rewards, redeemer, mint):
+    # cant withdraw from an epoch twice
+    epoch = redeemer.epoch()
+    redeemer.redeem(alice, bob, 0, UNIT, b"\x01", sender=rewards)
+    chain.pending_timestamp += DAY
+    redeemer.settle(epoch, sender=alice)
+    redeemer.withdraw([epoch], sender=bob)
+    with reverts():
+        redeemer.withdraw([epoch], sender=bob)
+
+def test_redeem_eth(alice, bob, liquid_locker, rewards, discount_token, yearn_redemption, redeemer, mint):
+    # redeem with ETH is not queued
+    epoch = redeemer.epoch()
+    value = yearn_redemption.eth_required(UNIT)
+    assert redeemer.redeem(alice, bob, 0, UNIT, b"", value=value, sender=rewards).return_value == SCALE
+    assert discount_token.balanceOf(redeemer) == 0
+    assert liquid_locker.totalSupply() == 2 * SCALE
+    assert liquid_locker.balanceOf(bob) == SCALE
+    assert redeemer.queued(epoch, bob) == (0, 0)
+
+def test_claim_excess(chain, deployer, alice, bob, rewards, redeemer, mint):
+    # excess from settlement is sent to treasury
+    redeemer.set_treasury(alice, sender=deployer)
+    epoch = redeemer.epoch()
+    redeemer.redeem(alice, bob, 0, UNIT, b"\x01", sender=rewards)
+    chain.pending_timestamp += DAY
+    redeemer.settle(epoch, sender=bob)
+    before = alice.balance
+    redeemer.claim_excess(sender=bob)
+    assert alice.balance > before
+
+def test_set_curve_pool(accounts, deployer, discount_token, redeemer, curve_pool):
+    # curve pool contract can be changed
+    new_pool = accounts[4]
+    redeemer.set_curve_pool(new_pool, sender=deployer)
+    assert redeemer.curve_pool() == new_pool
+    assert discount_token.allowance(redeemer, curve_pool) == 0
+    assert discount_token.allowance(redeemer, new_pool) == MAX_VALUE
+
+def test_set_curve_pool_permission(accounts, alice, redeemer):
+    # only management can set curve pool
+    with reverts():
+        redeemer.set_curve_pool(accounts[4], sender=alice)
+
+def test_set_management(deployer, alice, redeemer):
+    # management can propose a replacement
+    redeemer.set_management(alice, sender=deployer)
+    assert redeemer.management() == deployer
+    assert redeemer.pending_management() == alice
+
+def test_accept_management(deployer, alice, redeemer):
+    # replacement can accept management role
+    redeemer.set_management(alice, sender=deployer)
+    redeemer.accept_management(sender=alice)
+    assert redeemer.management() == alice
+    assert redeemer.pending_management() == ZERO_ADDRESS
+
+@mark.fork
+def test_settle_mainnet(project, deployer, alice, bob, accounts, chain, locking_token, voting_escrow, proxy, liquid_locker, rewards, lock):
+    # settle against the mainnet dYFI pool and redemption contract
+    discount_token = Contract(DYFI)
+    redeemer = _deploy_redeemer(
+        project, deployer, locking_token, discount_token, voting_escrow,
+        proxy, liquid_locker, rewards, Contract(REDEMPTION), Contract(DYFI_CURVE)
+    )
+    owner = accounts[discount_token.owner()]
+    chain.set_balance(owner, UNIT)
+    discount_token.mint(rewards, UNIT, sender=owner)
+    discount_token.approve(redeemer, UNIT, sender=rewards)
+
+    epoch = redeemer.epoch()
+    redeemer.redeem(alice, bob, 0, UNIT, b"\x01", sender=rewards)
+    chain.pending_timestamp += DAY
+    minted = redeemer.settle(epoch, sender=alice).return_value
+    assert 0 < minted < SCALE
+    assert redeemer.withdraw([epoch], sender=bob).return_value == minted
+
+def _deploy_redeemer(
+    project, deployer, locking_token, discount_token, voting_escrow,
+    proxy, liquid_locker, rewards, yearn_redemption, curve_pool):
+
+    redeemer = project.BatchRedeemer.deploy(
+        voting_escrow, liquid_locker, locking_token, discount_token,
+        proxy, rewards, ZERO_ADDRESS, sender=deployer
+    )
+    redeemer.set_yearn_redemption(yearn_redemption, sender=deployer)
+    redeemer.set_curve_pool(curve_pool, sender=deployer)
+    return redeemer
@@ -1,44 +1,58 @@
 from ape import reverts
 from ape import Contract
-from pytest import fixture
+from pytest import fixture, mark
 from _constants import *
-from _constants import _deploy_blueprint
+from _constants import _deploy_blueprint, _deploy_loader, _initcode
+from gauge_address import predict_gauge, predict_gauge_clone
 
-@fixture
+@fixture(scope='module')
 def rewards(accounts):
     return accounts[3]
 
-@fixture
+@fixture(scope='module')
 def yearn_registry(project, deployer):
     return project.MockYearnRegistry.deploy(sender=deployer)
 
-@fixture
-def ygauge(deployer, yearn_registry):
-    ygauge = Contract(YGAUGE)
+@fixture(scope='module')
+def yvault(project, deployer):
+    return project.MockToken.deploy(sender=deployer)
+
+@fixture(scope='module')
+def ygauge(project, deployer, yearn_registry, yvault):
+    ygauge = project.MockYearnGauge.deploy(sender=deployer)
+    ygauge.initialize(yvault, sender=deployer)
     yearn_registry.set_registered(ygauge, True, sender=deployer)
     return ygauge
 
-@fixture
+@fixture(scope='module')
 def reward_token(project, deployer):
     return project.MockToken.deploy(sender=deployer)
 
-@fixture
+@fixture(scope='module')
 def registry(project, deployer, proxy):
     registry = project.Registry.deploy(proxy, sender=deployer)
     proxy.set_operator(registry, True, sender=deployer)
     return registry
 
-@fixture
+@fixture(scope='module')
 def blueprint(project, deployer):
     return _deploy_blueprint(project.Gauge, deployer)
 
-@fixture
+@fixture(scope='module')
 def factory(project, deployer, proxy, rewards, yearn_registry, reward_token, registry, blueprint):
     factory = project.Factory.deploy(yearn_registry, reward_token, proxy, registry, rewards, sender=deployer)
     factory.set_gauge_blueprint(blueprint, sender=deployer)
     registry.set_registrar(factory, sender=deployer)
     return factory
 
+@fixture(scope='module')
+def implementation(project, deployer, factory):
+    return project.GaugeClone.deploy(factory, sender=deployer)
+
+@fixture(scope='module')
+def loader(deployer):
+    return _deploy_loader(deployer)
+
 def test_deploy(project, alice, proxy, rewards, ygauge, reward_token, registry, factory):
     # deploy a gauge
     assert registry.num_gauges() == 0
@@ -56,21 +70,155 @@ def test_deploy(project, alice, proxy, rewards, ygauge, reward_token, registry,
     assert gauge.proxy() == proxy
     assert gauge.reward_token() == reward_token
     assert gauge.rewards() == rewards
-    assert gauge.name() == '1UP Curve YFI-ETH Pool yVault'
-    assert gauge.symbol() == 'up-yvCurve-YFIETH'
+    assert gauge.name() == '1UP MockToken'
+    assert gauge.symbol() == 'up-MOCK'
 
-def test_deploy_again(alice, ygauge, factory):
-    # cant deploy a gauge for the same ygauge again
+def test_deploy_registered(alice, ygauge, factory):
+    # cant deploy a gauge for the same ygauge again while it is registered
     factory.deploy_gauge(ygauge, sender=alice)
     with reverts():
         factory.deploy_gauge(ygauge, sender=alice)
 
-def test_deploy_again(deployer, alice, yearn_registry, ygauge, factory):
+def test_deploy_deregistered(project, deployer, alice, proxy, rewards, ygauge, reward_token, registry, factory):
+    # a new gauge can be deployed for a ygauge after its gauge is deregistered
+    gauge = factory.deploy_gauge(ygauge, sender=alice).return_value
+    registry.deregister(gauge, sender=deployer)
+    assert factory.deployments(ygauge) == 1
+
+    predicted = factory.predict_gauge(ygauge)
+    assert predicted != gauge
+    assert predicted == predict_gauge(factory, ygauge, proxy, reward_token, rewards, _initcode(project.Gauge), 1)
+    assert factory.deploy_gauge(ygauge, sender=alice).return_value == predicted
+    assert registry.gauge_map(ygauge) == predicted
+    assert factory.deployments(ygauge) == 2
+
+def test_deploy_not_registered(deployer, alice, yearn_registry, ygauge, factory):
     # cant deploy a gauge that is not registered
     yearn_registry.set_registered(ygauge, False, sender=deployer)
     with reverts():
         factory.deploy_gauge(ygauge, sender=alice)
 
+def test_predict(alice, ygauge, factory):
+    # gauge address can be predicted before deployment
+    predicted = factory.predict_gauge(ygauge)
+    assert factory.deploy_gauge(ygauge, sender=alice).return_value == predicted
+
+def test_predict_offline(project, proxy, rewards, ygauge, reward_token, factory):
+    # gauge address can be predicted offline
+    predicted = predict_gauge(factory, ygauge, proxy, reward_token, rewards, _initcode(project.Gauge))
+    assert predicted == factory.predict_gauge(ygauge)
+
+def test_predict_blueprint(project, deployer, ygauge, factory):
+    # predicted address depends on the blueprint
+    predicted = factory.predict_gauge(ygauge)
+    new_blueprint = _deploy_blueprint(project.MockToken, deployer)
+    factory.set_gauge_blueprint(new_blueprint, sender=deployer)
+    assert factory.predict_gauge(ygauge) != predicted
+
+def test_deploy_many(project, alice, proxy, ygauge, registry, factory):
+    # deploy multiple gauges at once
+    gauges = factory.deploy_gauges([ygauge], sender=alice).return_value
+    assert len(gauges) == 1
+    gauge = project.Gauge.at(gauges[0])
+    assert registry.num_gauges() == 1
+    assert registry.gauge_map(ygauge) == gauge
+    assert ygauge.recipients(proxy) == gauge
+    assert ygauge.allowance(proxy, gauge) == MAX_VALUE
+    assert gauge.ygauge() == ygauge
+
+def test_deploy_many_duplicate(alice, ygauge, factory):
+    # cant deploy multiple gauges for the same ygauge
+    with reverts():
+        factory.deploy_gauges([ygauge, ygauge], sender=alice)
+
+def test_deploy_many_not_registered(deployer, alice, yearn_registry, ygauge, factory):
+    # cant deploy multiple gauges if any is not registered
+    yearn_registry.set_registered(ygauge, False, sender=deployer)
+    with reverts():
+        factory.deploy_gauges([ygauge], sender=alice)
+
+def test_deploy_clone(project, deployer, alice, proxy, rewards, ygauge, reward_token, registry, factory, implementation, loader):
+    # deploy a gauge as clone of the implementation
+    factory.set_gauge_implementation(implementation, loader, sender=deployer)
+    gauge = factory.deploy_gauge(ygauge, sender=alice).return_value
+    gauge = project.GaugeClone.at(gauge)
+    assert registry.num_gauges() == 1
+    assert registry.gauge_map(ygauge) == gauge
+    assert ygauge.recipients(proxy) == gauge
+    assert ygauge.allowance(proxy, gauge) == MAX_VALUE
+
+    asset = Contract(ygauge.asset())
+    assert asset.allowance(gauge, ygauge) == MAX_VALUE
+    assert reward_token.allowance(gauge, rewards) == MAX_VALUE
+    assert gauge.asset() == asset
+    assert gauge.ygauge() == ygauge
+    assert gauge.proxy() == proxy
+    assert gauge.reward_token() == reward_token
+    assert gauge.rewards() == rewards
+    assert gauge.decimals() == asset.decimals()
+    assert gauge.name() == '1UP MockToken'
+    assert gauge.symbol() == 'up-MOCK'
+
+def test_deploy_clone_initialize(project, deployer, alice, ygauge, factory, implementation, loader):
+    # gauge clone cant be initialized again
+    factory.set_gauge_implementation(implementation, loader, sender=deployer)
+    gauge = factory.deploy_gauge(ygauge, sender=alice).return_value
+    with reverts():
+        project.GaugeClone.at(gauge).initialize(sender=alice)
+
+def test_deploy_clone_gas(chain, deployer, alice, ygauge, factory, implementation, loader):
+    # deploying a gauge as clone is significantly cheaper, about 1.30M against 355k gas on
+    # EthTester. registration and approvals cost the same for both and make up most of the
+    # cost of a clone, so the drop is 3.5-4x rather than an order of magnitude
+    snapshot = chain.snapshot()
+    blueprint = factory.deploy_gauge(ygauge, sender=alice).gas_used
+    chain.restore(snapshot)
+    factory.set_gauge_implementation(implementation, loader, sender=deployer)
+    clone = factory.deploy_gauge(ygauge, sender=alice).gas_used
+    assert clone * 7 < blueprint * 2
+
+def test_predict_clone(project, deployer, alice, ygauge, factory, implementation, loader):
+    # gauge clone address can be predicted before deployment
+    factory.set_gauge_implementation(implementation, loader, sender=deployer)
+    predicted = factory.predict_gauge(ygauge)
+    assert predicted != predict_gauge(
+        factory, ygauge, factory.proxy(), factory.reward_token(), factory.rewards(), _initcode(project.Gauge)
+    )
+    assert factory.deploy_gauge(ygauge, sender=alice).return_value == predicted
+
+def test_predict_clone_offline(deployer, proxy, rewards, ygauge, reward_token, factory, implementation, loader):
+    # gauge clone address can be predicted offline
+    factory.set_gauge_implementation(implementation, loader, sender=deployer)
+    asset = Contract(ygauge.asset())
+    predicted = predict_gauge_clone(
+        factory, implementation, ygauge, proxy, reward_token, rewards, asset, asset.decimals()
+    )
+    assert predicted == factory.predict_gauge(ygauge)
+
+def test_deploy_many_clone(project, deployer, alice, ygauge, registry, factory, implementation, loader):
+    # deploy multiple gauges as clones at once
+    factory.set_gauge_implementation(implementation, loader, sender=deployer)
+    gauges = factory.deploy_gauges([ygauge], sender=alice).return_value
+    gauge = project.GaugeClone.at(gauges[0])
+    assert registry.gauge_map(ygauge) == gauge
+    assert gauge.ygauge() == ygauge
+
+@mark.fork
+def test_deploy_mainnet(project, deployer, alice, proxy, yearn_registry, registry, factory, implementation, loader):
+    # deploy a gauge and a gauge clone for a mainnet yearn gauge
+    ygauge = Contract(YGAUGE)
+    yearn_registry.set_registered(ygauge, True, sender=deployer)
+    gauge = project.Gauge.at(factory.deploy_gauge(ygauge, sender=alice).return_value)
+    assert gauge.name() == '1UP Curve YFI-ETH Pool yVault'
+    assert gauge.symbol() == 'up-yvCurve-YFIETH'
+    assert ygauge.recipients(proxy) == gauge
+
+    factory.set_gauge_implementation(implementation, loader, sender=deployer)
+    registry.deregister(gauge, sender=deployer)
+    clone = project.GaugeClone.at(factory.deploy_gauge(ygauge, sender=alice).return_value)
+    assert clone.name() == gauge.name()
+    assert clone.decimals() == gauge.decimals()
+
 def test_set_blueprint(project, deployer, blueprint, factory):
     # set the gauge blueprint
     new_blueprint = _deploy_blueprint(project.Gauge, deployer)
@@ -84,6 +232,38 @@ def test_set_blueprint_permission(project, alice, factory):
     with reverts():
         factory.set_gauge_blueprint(new_blueprint, sender=alice)
 
+def test_set_implementation(deployer, factory, implementation, loader):
+    # set the gauge implementation
+    assert factory.gauge_implementation() == ZERO_ADDRESS
+    assert factory.gauge_loader() == ZERO_ADDRESS
+    factory.set_gauge_implementation(implementation, loader, sender=deployer)
+    assert factory.gauge_implementation() == implementation
+    assert factory.gauge_loader() == loader
+
+def test_set_implementation_unset(project, deployer, alice, ygauge, factory, implementation, loader):
+    # unsetting the gauge implementation reverts to deploying from the blueprint
+    factory.set_gauge_implementation(implementation, loader, sender=deployer)
+    factory.set_gauge_implementation(ZERO_ADDRESS, ZERO_ADDRESS, sender=deployer)
+    assert factory.gauge_implementation() == ZERO_ADDRESS
+    gauge = project.Gauge.at(factory.deploy_gauge(ygauge, sender=alice).return_value)
+    assert gauge.ygauge() == ygauge
+
+def test_set_implementation_factory(project, deployer, alice, factory, loader):
+    # cant set an implementation for a different factory
+    implementation = project.GaugeClone.deploy(alice, sender=deployer)
+    with reverts():
+        factory.set_gauge_implementation(implementation, loader, sender=deployer)
+
+def test_set_implementation_loader(deployer, factory, implementation, blueprint):
+    # cant set an invalid loader
+    with reverts():
+        factory.set_gauge_implementation(implementation, blueprint, sender=deployer)
+
+def test_set_implementation_permission(alice, factory, implementation, loader):
+    # only management can set the gauge implementation
+    with reverts():
+        factory.set_gauge_implementation(implementation, loader, sender=alice)
+
 def test_set_management(deployer, alice, factory):
     # management can propose a replacement
     assert factory.management() == deployer
@@ -0,0 +1,295 @@
+from eth_abi import encode
+from pytest import fixture, mark
+from _constants import *
+
+# gas benchmarks of the hot paths, compared against `gas_baseline.json` by the `gas` fixture.
+# timestamps are pinned to a fixed point in the week so that every run takes the same code paths
+
+pytestmark = mark.local
+
+HOUR = 60 * 60
+MAX_GAUGES = 32
+
+def _start_of_week(chain):
+    chain.pending_timestamp = (chain.pending_timestamp // WEEK + 1) * WEEK + DAY
+
+def _wait(chain, duration=HOUR):
+    chain.pending_timestamp += duration
+
+@fixture(scope='module')
+def charlie(accounts):
+    return accounts[5]
+
+# liquid locker
+
+def test_liquid_locker_deposit(chain, gas, ychad, locking_token, liquid_locker):
+    # first deposit creates the ve lock, later deposits add to it
+    locking_token.approve(liquid_locker, MAX_VALUE, sender=ychad)
+    _start_of_week(chain)
+    gas('LiquidLocker.deposit/first_lock', liquid_locker.deposit(UNIT, sender=ychad))
+    _wait(chain)
+    gas('LiquidLocker.deposit/warm', liquid_locker.deposit(UNIT, sender=ychad))
+
+# staking
+
+@fixture(scope='module')
+def staking_and_rewards(project, deployer, proxy, locking_token, discount_token, liquid_locker):
+    staking = project.Staking.deploy(liquid_locker, sender=deployer)
+    rewards = project.StakingRewards.deploy(proxy, staking, locking_token, discount_token, sender=deployer)
+    staking.set_rewards(rewards, sender=deployer)
+    for token in [locking_token, discount_token]:
+        proxy.call(token, token.approve.encode_input(rewards, MAX_VALUE), sender=deployer)
+    return staking, rewards
+
+@fixture(scope='module')
+def staking(staking_and_rewards):
+    return staking_and_rewards[0]
+
+@fixture(scope='module')
+def rewards(staking_and_rewards):
+    return staking_and_rewards[1]
+
+@fixture
+def stakers(ychad, alice, bob, locking_token, liquid_locker, staking):
+    # alice and bob hold upYFI, bob is the first staker
+    locking_token.approve(liquid_locker, MAX_VALUE, sender=ychad)
+    liquid_locker.deposit(10 * UNIT, sender=ychad)
+    for account in [alice, bob]:
+        liquid_locker.transfer(account, 4 * SCALE, sender=ychad)
+        liquid_locker.approve(staking, MAX_VALUE, sender=account)
+    staking.deposit(2 * SCALE, sender=bob)
+
+@fixture(scope='module')
+def mock_staking_and_rewards(project, deployer, proxy, locking_token, discount_token):
+    staking = project.MockStaking.deploy(sender=deployer)
+    rewards = project.StakingRewards.deploy(proxy, staking, locking_token, discount_token, sender=deployer)
+    staking.set_rewards(rewards, sender=deployer)
+    for token in [locking_token, discount_token]:
+        proxy.call(token, token.approve.encode_input(rewards, MAX_VALUE), sender=deployer)
+    return staking, rewards
+
+def test_staking_deposit(chain, gas, alice, staking, stakers):
+    # first deposit of a user, additional deposit in the same week and in a later week
+    _start_of_week(chain)
+    gas('Staking.deposit/first_user', staking.deposit(SCALE, sender=alice))
+    _wait(chain)
+    gas('Staking.deposit/warm', staking.deposit(SCALE, sender=alice))
+    _wait(chain, WEEK)
+    gas('Staking.deposit/new_week', staking.deposit(SCALE, sender=alice))
+
+def test_staking_transfer(chain, gas, alice, bob, charlie, staking, stakers):
+    # transfer to an account without and with an existing stake
+    staking.deposit(SCALE, sender=alice)
+    _start_of_week(chain)
+    gas('Staking.transfer/new_receiver', staking.transfer(charlie, SCALE // 2, sender=bob))
+    _wait(chain)
+    gas('Staking.transfer/existing_receiver', staking.transfer(alice, SCALE // 2, sender=bob))
+
+def test_staking_lock(chain, gas, alice, staking, stakers):
+    # lock a fresh stake
+    staking.deposit(SCALE, sender=alice)
+    _start_of_week(chain)
+    gas('Staking.lock', staking.lock(4 * WEEK, sender=alice))
+
+def test_staking_unstake_withdraw(chain, gas, bob, staking, stakers):
+    # partial withdrawal from the unstaking stream, and a final one that clears it
+    _start_of_week(chain)
+    gas('Staking.unstake', staking.unstake(SCALE, sender=bob))
+    _wait(chain, DAY)
+    gas('Staking.withdraw/partial', staking.withdraw(SCALE // 10, sender=bob))
+    _wait(chain, WEEK)
+    gas('Staking.withdraw/full', staking.withdraw(SCALE - SCALE // 10, sender=bob))
+
+def test_staking_rewards_harvest(chain, gas, deployer, proxy, locking_token, discount_token, rewards, stakers):
+    # harvest into empty and existing 'next' rewards
+    locking_token.mint(proxy, 4 * UNIT, sender=deployer)
+    discount_token.mint(proxy, 4 * UNIT, sender=deployer)
+    _start_of_week(chain)
+    gas('StakingRewards.harvest/cold', rewards.harvest(2 * UNIT, 2 * UNIT, sender=deployer))
+    _wait(chain)
+    gas('StakingRewards.harvest/warm', rewards.harvest(2 * UNIT, 2 * UNIT, sender=deployer))
+
+def test_staking_rewards_claim(chain, gas, deployer, bob, proxy, locking_token, discount_token, rewards, stakers):
+    # claim after 'next' rewards start streaming, while streaming and after all rewards are unlocked
+    locking_token.mint(proxy, 4 * UNIT, sender=deployer)
+    discount_token.mint(proxy, 4 * UNIT, sender=deployer)
+    _start_of_week(chain)
+    rewards.harvest(2 * UNIT, 2 * UNIT, sender=deployer)
+    _wait(chain, WEEK)
+    gas('StakingRewards.claim/week_rollover', rewards.claim(sender=bob))
+    _wait(chain)
+    gas('StakingRewards.claim/streaming', rewards.claim(sender=bob))
+    rewards.harvest(2 * UNIT, 2 * UNIT, sender=deployer)
+    _wait(chain, 3 * WEEK)
+    gas('StakingRewards.claim/unlocked', rewards.claim(sender=bob))
+
+def test_staking_rewards_report(chain, gas, deployer, alice, bob, proxy, locking_token, discount_token, mock_staking_and_rewards):
+    # reports are measured through the mock staking contract, which adds a small fixed overhead
+    staking, rewards = mock_staking_and_rewards
+    staking.mint(bob, UNIT, sender=deployer)
+    locking_token.mint(proxy, UNIT, sender=deployer)
+    discount_token.mint(proxy, UNIT, sender=deployer)
+    _start_of_week(chain)
+    rewards.harvest(UNIT, UNIT, sender=deployer)
+    _wait(chain)
+    gas('StakingRewards.report/first_user', staking.mint(alice, UNIT, sender=deployer))
+    _wait(chain)
+    gas('StakingRewards.report/warm', staking.mint(alice, UNIT, sender=deployer))
+    _wait(chain, WEEK)
+    gas('StakingRewards.report/week_rollover', staking.mint(alice, UNIT, sender=deployer))
+
+# gauges
+
+@fixture(scope='module')
+def gauge_registry(project, deployer):
+    return project.MockRegistry.deploy(sender=deployer)
+
+@fixture(scope='module')
+def gauge_rewards(project, deployer, discount_token, gauge_registry):
+    return project.GaugeRewards.deploy(discount_token, gauge_registry, sender=deployer)
+
+@fixture(scope='module')
+def gauges(project, deployer, alice, bob, proxy, discount_token, gauge_registry, gauge_rewards):
+    # gauges on top of mock yearn gauges that mint rewards on every claim
+    gauges = []
+    for _ in range(MAX_GAUGES):
+        asset = project.MockToken.deploy(sender=deployer)
+        ygauge = project.MockYearnGauge.deploy(sender=deployer)
+        ygauge.initialize(asset, discount_token, sender=deployer)
+        gauge = project.Gauge.deploy(ygauge, proxy, discount_token, gauge_rewards, sender=deployer)
+        gauge_registry.set_gauge_map(ygauge, gauge, sender=deployer)
+        proxy.call(ygauge, ygauge.setRecipient.encode_input(gauge), sender=deployer)
+        proxy.call(ygauge, ygauge.approve.encode_input(gauge, MAX_VALUE), sender=deployer)
+        ygauge.set_reward_rate(UNIT, sender=deployer)
+        for account in [alice, bob]:
+            asset.mint(account, 10 * UNIT, sender=deployer)
+            asset.approve(gauge, MAX_VALUE, sender=account)
+        gauges.append(gauge)
+    return gauges
+
+@fixture(scope='module')
+def gauge_account(accounts, gauge_registry):
+    # stands in for a gauge, to measure reports without the overhead of the gauge itself
+    gauge = accounts[4]
+    gauge_registry.set_gauge_map(YGAUGE, gauge, sender=gauge)
+    return gauge
+
+def _deposit(gauges, alice, bob):
+    # bob's deposits claim rewards from the yearn gauges, which accrue to alice
+    for account in [alice, bob]:
+        for gauge in gauges:
+            gauge.deposit(UNIT, sender=account)
+
+def test_gauge_deposit(chain, gas, alice, bob, gauges):
+    # first deposit into a gauge, first deposit of a user with rewards and an additional deposit
+    gauge = gauges[0]
+    _start_of_week(chain)
+    gas('Gauge.deposit/first', gauge.deposit(UNIT, sender=alice))
+    _wait(chain)
+    gas('Gauge.deposit/first_user', gauge.deposit(UNIT, sender=bob))
+    _wait(chain)
+    gas('Gauge.deposit/warm', gauge.deposit(UNIT, sender=bob))
+
+def test_gauge_withdraw(chain, gas, alice, bob, gauges):
+    # withdraw part of a position, with rewards
+    _deposit(gauges[:1], alice, bob)
+    _start_of_week(chain)
+    gas('Gauge.withdraw', gauges[0].withdraw(UNIT // 2, sender=alice))
+
+def test_gauge_transfer(chain, gas, alice, bob, charlie, gauges):
+    # transfer to an account without and with an existing position
+    _deposit(gauges[:1], alice, bob)
+    _start_of_week(chain)
+    gas('Gauge.transfer/new_receiver', gauges[0].transfer(charlie, UNIT // 2, sender=alice))
+    _wait(chain)
+    gas('Gauge.transfer/existing_receiver', gauges[0].transfer(bob, UNIT // 4, sender=alice))
+
+def test_gauge_rewards_report(gas, deployer, alice, bob, discount_token, gauge_rewards, gauge_account):
+    # every kind of report, made directly by a gauge
+    rewards, gauge = gauge_rewards, gauge_account
+    discount_token.mint(gauge, 10 * UNIT, sender=deployer)
+    discount_token.approve(rewards, MAX_VALUE, sender=gauge)
+    gas('GaugeRewards.report/deposit_first', rewards.report(YGAUGE, ZERO_ADDRESS, alice, 2 * UNIT, 0, sender=gauge))
+    gas('GaugeRewards.report/deposit_first_user', rewards.report(YGAUGE, ZERO_ADDRESS, bob, UNIT, UNIT, sender=gauge))
+    gas('GaugeRewards.report/deposit_warm', rewards.report(YGAUGE, ZERO_ADDRESS, bob, UNIT, UNIT, sender=gauge))
+    gas('GaugeRewards.report/transfer', rewards.report(YGAUGE, alice, bob, UNIT, UNIT, sender=gauge))
+    gas('GaugeRewards.report/rewards', rewards.report(YGAUGE, ZERO_ADDRESS, ZERO_ADDRESS, 0, UNIT, sender=gauge))
+    gas('GaugeRewards.report/withdraw', rewards.report(YGAUGE, bob, ZERO_ADDRESS, UNIT, UNIT, sender=gauge))
+
+@mark.parametrize('n', [1, 8, MAX_GAUGES])
+def test_gauge_rewards_claim(gas, alice, bob, gauge_rewards, gauges, n):
+    # claim from n gauges at once
+    _deposit(gauges[:n], alice, bob)
+    gas(f'GaugeRewards.claim/{n}_gauges', gauge_rewards.claim(gauges[:n], sender=alice))
+
+@mark.parametrize('n', [1, 8, MAX_GAUGES])
+def test_gauge_rewards_harvest(project, gas, deployer, alice, bob, proxy, gauge_rewards, gauges, n):
+    # harvest n gauges at once
+    _deposit(gauges[:n], alice, bob)
+    for gauge in gauges[:n]:
+        project.MockYearnGauge.at(gauge.ygauge()).getReward(proxy, sender=deployer)
+    gas(f'GaugeRewards.harvest/{n}_gauges', gauge_rewards.harvest(gauges[:n], [UNIT] * n, sender=deployer))
+
+# redemption
+
+@fixture(scope='module')
+def caller(accounts):
+    # stands in for the gauge rewards contract
+    return accounts[3]
+
+@fixture(scope='module')
+def redeemer(
+    project, deployer, caller, locking_token, discount_token, voting_escrow,
+    proxy, liquid_locker, yearn_redemption, curve_pool):
+
+    redeemer = project.BasicRedeemer.deploy(
+        voting_escrow, liquid_locker, locking_token, discount_token,
+        proxy, caller, ZERO_ADDRESS, sender=deployer
+    )
+    redeemer.set_yearn_redemption(yearn_redemption, sender=deployer)
+    redeemer.set_curve_pool(curve_pool, sender=deployer)
+    return redeemer
+
+@fixture
+def lock(ychad, locking_token, liquid_locker):
+    # redemptions add to an existing ve lock. function scoped, so the first lock
+    # is always the one measured by test_liquid_locker_deposit
+    locking_token.approve(liquid_locker, UNIT, sender=ychad)
+    liquid_locker.deposit(UNIT, sender=ychad)
+
+def test_basic_redeemer_redeem(gas, deployer, alice, caller, locking_token, discount_token, yearn_redemption, redeemer, lock):
+    # redeem by supplying ETH, by selling part of the rewards and without discount tokens
+    locking_token.mint(caller, UNIT, sender=deployer)
+    discount_token.mint(caller, 2 * UNIT, sender=deployer)
+    locking_token.approve(redeemer, MAX_VALUE, sender=caller)
+    discount_token.approve(redeemer, MAX_VALUE, sender=caller)
+    value = yearn_redemption.eth_required(UNIT)
+    gas('BasicRedeemer.redeem/eth', redeemer.redeem(caller, alice, 0, UNIT, b'', value=value, sender=caller))
+    sell = redeemer.quote_sell(0, UNIT)[0]
+    data = encode(['uint256'], [sell])
+    gas('BasicRedeemer.redeem/sell', redeemer.redeem(caller, alice, 0, UNIT, data, sender=caller))
+    gas('BasicRedeemer.redeem/locking_token', redeemer.redeem(caller, alice, UNIT, 0, b'', sender=caller))
+
+# vesting
+
+@fixture(scope='module')
+def vesting_factory(project, deployer, locking_token, liquid_locker, staking):
+    implementation = project.VestingEscrowLL.deploy(sender=deployer)
+    factory = project.VestingEscrowFactory.deploy(implementation, locking_token, deployer, sender=deployer)
+    depositor = project.VestingEscrowDepositor.deploy(locking_token, liquid_locker, staking, deployer, sender=deployer)
+    factory.set_liquid_locker(staking, depositor, sender=deployer)
+    return factory
+
+def test_vesting_escrow(project, chain, gas, ychad, alice, bob, locking_token, staking, vesting_factory, lock):
+    # deploy a packed vesting escrow, claim from it for the first time and again later
+    locking_token.approve(vesting_factory, MAX_VALUE, sender=ychad)
+    _start_of_week(chain)
+    ts = chain.pending_timestamp
+    vesting_factory.create_vest(alice, UNIT, 4 * WEEK, ts, 0, sender=ychad)
+    receipt = vesting_factory.deploy_vesting_contract(0, staking, UNIT, sender=alice)
+    gas('VestingEscrowFactory.deploy_vesting_contract', receipt)
+    escrow = project.VestingEscrowLL.at(vesting_factory.escrows(0, staking))
+    chain.pending_timestamp = ts + WEEK
+    gas('VestingEscrowLL.claim/first', escrow.claim(bob, sender=alice))
+    chain.pending_timestamp = ts + 2 * WEEK
+    gas('VestingEscrowLL.claim/warm', escrow.claim(bob, sender=alice))
@@ -1,37 +1,39 @@
 from ape import reverts, Contract
 # from ape_ethereum.proxies import _make_minimal_proxy
 from ape.contracts import ContractContainer
-from pytest import fixture
+from pytest import fixture, mark
 from _constants import *
+from _constants import _deploy_gauge_clone
 
-@fixture
+@fixture(scope='module')
 def yvault(project, deployer):
     return project.MockToken.deploy(sender=deployer)
 
-@fixture
-def ygauge(networks, deployer, yvault):
-    ygauge_mainnet = Contract(YGAUGE)
-    ygauge = '0x0123456789012345678901234567890123456789'
-    networks.active_provider.set_code(ygauge, networks.active_provider.get_code(YGAUGE))
-    ygauge = Contract(ygauge, ygauge_mainnet.contract_type)
-    ygauge.initialize(yvault, deployer, sender=deployer)
+@fixture(scope='module')
+def ygauge(project, deployer, yvault):
+    ygauge = project.MockYearnGauge.deploy(sender=deployer)
+    ygauge.initialize(yvault, sender=deployer)
     return ygauge
 
-@fixture
+@fixture(scope='module')
 def reward_token(project, deployer):
     return project.MockToken.deploy(sender=deployer)
 
-@fixture
+@fixture(scope='module')
 def registry(project, deployer):
     return project.MockRegistry.deploy(sender=deployer)
 
-@fixture
+@fixture(scope='module')
 def rewards(project, deployer, reward_token, registry):
     return project.GaugeRewards.deploy(reward_token, registry, sender=deployer)
 
-@fixture
-def gauge(project, deployer, proxy, ygauge, reward_token, registry, rewards):
-    gauge = project.Gauge.deploy(ygauge, proxy, reward_token, rewards, sender=deployer)
+@fixture(scope='module', params=[False, True], ids=['gauge', 'clone'])
+def clone(request):
+    return request.param
+
+@fixture(scope='module')
+def gauge(project, deployer, proxy, ygauge, reward_token, registry, rewards, clone):
+    gauge = _deploy_gauge(project, deployer, proxy, ygauge, reward_token, rewards, clone)
     registry.set_gauge_map(ygauge, gauge, sender=deployer)
     data = ygauge.approve.encode_input(gauge, MAX_VALUE)
     proxy.call(ygauge, data, sender=deployer) # done by registry upon registration
@@ -247,7 +249,8 @@ def test_approve(alice, bob, gauge):
     gauge.approve(bob, UNIT, sender=alice)
     assert gauge.allowance(alice, bob) == UNIT
 
-def test_lower_decimals(accounts, project, deployer, proxy, reward_token, registry, rewards):
+@mark.fork
+def test_lower_decimals(accounts, project, deployer, proxy, reward_token, registry, rewards, clone):
     # should be able to deposit vaults with lower number of decimals
     asset = Contract('0xA0b86991c6218b36c1d19D4a2e9Eb0cE3606eB48')
     whale = accounts['0xD6153F5af5679a75cC85D8974463545181f48772']
@@ -255,7 +258,8 @@ def test_lower_decimals(accounts, project, deployer, proxy, reward_token, regist
     yvault = Contract('0xBe53A109B494E5c9f97b9Cd39Fe969BE68BF6204')
     ygauge = Contract('0x622fA41799406B120f9a40dA843D358b7b2CFEE3')
 
-    gauge = project.Gauge.deploy(ygauge, proxy, reward_token, rewards, sender=deployer)
+    gauge = _deploy_gauge(project, deployer, proxy, ygauge, reward_token, rewards, clone)
+    assert gauge.decimals() == 6
     registry.set_gauge_map(ygauge, gauge, sender=deployer)
     data = ygauge.approve.encode_input(gauge, MAX_VALUE)
     proxy.call(ygauge, data, sender=deployer)
@@ -273,3 +277,83 @@ def test_lower_decimals(accounts, project, deployer, proxy, reward_token, regist
     assert yvault.balanceOf(whale) == yv_amt
     assert gauge.balanceOf(whale) == 0
     assert rewards.gauge_balance(gauge, whale) == 0
+
+def test_clone_overhead(project, deployer, alice, bob, proxy, yvault, ygauge, reward_token, registry, rewards):
+    # per call overhead of a gauge clone compared to a regular gauge is small
+    gas = {}
+    for clone in [False, True]:
+        gauge = _deploy_gauge(project, deployer, proxy, ygauge, reward_token, rewards, clone)
+        registry.set_gauge_map(ygauge, gauge, sender=deployer)
+        data = ygauge.approve.encode_input(gauge, MAX_VALUE)
+        proxy.call(ygauge, data, sender=deployer)
+        yvault.mint(alice, 3 * UNIT, sender=deployer)
+        yvault.approve(gauge, 3 * UNIT, sender=alice)
+        gauge.deposit(UNIT, sender=alice)
+
+        deposit = gauge.deposit(UNIT, sender=alice).gas_used
+        transfer = gauge.transfer(bob, UNIT, sender=alice).gas_used
+        withdraw = gauge.withdraw(UNIT, sender=alice).gas_used
+        gas[clone] = (deposit, transfer, withdraw)
+
+    # clones pay for a cold delegatecall into the implementation and read their configuration from code
+    for regular, clone in zip(gas[False], gas[True]):
+        assert clone - regular < 8_000
+
+def test_clone_abi(project):
+    # a gauge clone exposes the same interface as a regular gauge, besides its initialization
+    abi = [item for item in project.Gauge.contract_type.abi if item.type != 'constructor']
+    clone_abi = [
+        item for item in project.GaugeClone.contract_type.abi
+        if item.type != 'constructor' and item.name not in ['factory', 'initialize']
+    ]
+    assert sorted(item.model_dump_json() for item in abi) == sorted(item.model_dump_json() for item in clone_abi)
+
+def test_clone_source(project):
+    # gauge and gauge clone only differ in their configuration, the logic in between is identical
+    def shared(name):
+        source = (project.contracts_folder / f'{name}.vy').read_text()
+        return source[source.index('@external\n@view\ndef name()'):source.index('# configuration')]
+    assert shared('Gauge') == shared('GaugeClone')
+
+def test_clone_parity(project, deployer, alice, bob, proxy, yvault, ygauge, reward_token, registry, rewards):
+    # a gauge clone ends up in the same state as a regular gauge after the same sequence of calls
+    state = {}
+    for clone in [False, True]:
+        gauge = _deploy_gauge(project, deployer, proxy, ygauge, reward_token, rewards, clone)
+        registry.set_gauge_map(ygauge, gauge, sender=deployer)
+        data = ygauge.approve.encode_input(gauge, MAX_VALUE)
+        proxy.call(ygauge, data, sender=deployer)
+        yvault.mint(alice, 4 * UNIT, sender=deployer)
+        yvault.approve(gauge, 4 * UNIT, sender=alice)
+
+        gauge.deposit(2 * UNIT, bob, sender=alice)
+        gauge.mint(UNIT, sender=alice)
+        gauge.transfer(alice, UNIT // 2, sender=bob)
+        gauge.approve(alice, UNIT, sender=bob)
+        gauge.transferFrom(bob, alice, UNIT // 4, sender=alice)
+        gauge.withdraw(UNIT // 3, bob, bob, sender=bob)
+        gauge.redeem(UNIT // 5, alice, bob, sender=alice)
+
+        state[clone] = (
+            gauge.name(), gauge.symbol(), gauge.decimals(),
+            gauge.totalSupply(), gauge.totalAssets(),
+            gauge.balanceOf(alice), gauge.balanceOf(bob),
+            gauge.allowance(bob, alice),
+            gauge.maxWithdraw(alice), gauge.maxRedeem(bob),
+            gauge.convertToShares(UNIT), gauge.convertToAssets(UNIT),
+            gauge.previewDeposit(UNIT), gauge.previewMint(UNIT),
+            gauge.previewWithdraw(UNIT), gauge.previewRedeem(UNIT),
+            rewards.gauge_supply(gauge), rewards.gauge_balance(gauge, alice), rewards.gauge_balance(gauge, bob),
+        )
+    assert state[False] == state[True]
+
+def _deploy_gauge(project, deployer, proxy, ygauge, reward_token, rewards, clone):
+    if not clone:
+        return project.Gauge.deploy(ygauge, proxy, reward_token, rewards, sender=deployer)
+
+    # the deployer acts as factory of the implementation
+    implementation = project.GaugeClone.deploy(deployer, sender=deployer)
+    asset = Contract(ygauge.asset())
+    return _deploy_gauge_clone(
+        implementation, ygauge, proxy, reward_token, rewards, asset, asset.decimals(), deployer
+    )
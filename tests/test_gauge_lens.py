@@ -0,0 +1,74 @@
+from pytest import fixture
+from _constants import *
+
+@fixture(scope='module')
+def registry(project, deployer, proxy):
+    registry = project.Registry.deploy(proxy, sender=deployer)
+    proxy.set_operator(registry, True, sender=deployer)
+    return registry
+
+@fixture(scope='module')
+def reward_token(project, deployer):
+    return project.MockToken.deploy(sender=deployer)
+
+@fixture(scope='module')
+def rewards_registry(project, deployer):
+    return project.MockRegistry.deploy(sender=deployer)
+
+@fixture(scope='module')
+def rewards(project, deployer, reward_token, rewards_registry):
+    return project.GaugeRewards.deploy(reward_token, rewards_registry, sender=deployer)
+
+@fixture(scope='module')
+def lens(project, deployer, registry, rewards):
+    return project.GaugeLens.deploy(registry, rewards, sender=deployer)
+
+@fixture(scope='module')
+def gauges(project, deployer, proxy, registry, reward_token):
+    gauges = []
+    for _ in range(3):
+        yvault = project.MockToken.deploy(sender=deployer)
+        ygauge = project.MockYearnGauge.deploy(sender=deployer)
+        ygauge.initialize(yvault, reward_token, sender=deployer)
+        gauge = project.MockGauge.deploy(yvault, ygauge, sender=deployer)
+        # yearn gauge rewards of the proxy are claimed to the gauge
+        proxy.call(ygauge, ygauge.setRecipient.encode_input(gauge), sender=deployer)
+        registry.register(gauge, sender=deployer)
+        gauges.append((gauge, ygauge))
+    return gauges
+
+def test_gauges_page(chain, accounts, deployer, alice, proxy, rewards_registry, rewards, lens, gauges):
+    # retrieve a page of registered gauges along with their supply and pending rewards
+    gauge, ygauge = gauges[1]
+    rewards_registry.set_gauge_map(ygauge, gauge, sender=deployer)
+    chain.set_balance(gauge.address, UNIT)
+    rewards.report(ygauge, ZERO_ADDRESS, alice, 2 * UNIT, 0, sender=accounts[gauge.address])
+    ygauge.mint(proxy, 2 * UNIT, sender=deployer)
+    ygauge.set_reward_rate(3 * UNIT, sender=deployer)
+
+    page = lens.gauges_page(0, 10)
+    assert len(page) == 3
+    for i, state in enumerate(page):
+        assert state.gauge == gauges[i][0]
+        assert state.ygauge == gauges[i][1]
+        assert state.idx == i
+    assert [state.supply for state in page] == [0, 2 * UNIT, 0]
+    assert [state.pending for state in page] == [0, 3 * UNIT, 0]
+
+def test_gauges_page_claimed(deployer, proxy, reward_token, lens, gauges):
+    # rewards claimed from the yearn gauge but not yet harvested are pending
+    gauge, ygauge = gauges[1]
+    ygauge.mint(proxy, 2 * UNIT, sender=deployer)
+    ygauge.set_reward_rate(3 * UNIT, sender=deployer)
+    ygauge.getReward(proxy, sender=deployer)
+    assert reward_token.balanceOf(gauge) == 3 * UNIT
+    ygauge.set_reward_rate(UNIT, sender=deployer)
+    assert lens.gauges_page(1, 1)[0].pending == 4 * UNIT
+
+def test_gauges_page_partial(lens, gauges):
+    # pages are cut short at the last gauge
+    page = lens.gauges_page(2, 10)
+    assert len(page) == 1
+    assert page[0].gauge == gauges[2][0]
+    assert page[0].idx == 2
+    assert lens.gauges_page(3, 10) == []
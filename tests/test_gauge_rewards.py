@@ -8,34 +8,34 @@ REDEEM_SELL_FEE_IDX = 2 # claim with redeem, without ETH
 REDEEM_FEE_IDX      = 3 # claim with redeem, with ETH
 EXPECTED_DATA       = b"abcd"
 
-@fixture
+@fixture(scope='module')
 def token(project, deployer):
     return project.MockToken.deploy(sender=deployer)
 
-@fixture
+@fixture(scope='module')
 def registry(project, deployer):
     return project.MockRegistry.deploy(sender=deployer)
 
-@fixture
+@fixture(scope='module')
 def rewards(project, deployer, token, registry):
     return project.GaugeRewards.deploy(token, registry, sender=deployer)
 
-@fixture
+@fixture(scope='module')
 def ygauge(accounts):
     return accounts[3]
 
-@fixture
+@fixture(scope='module')
 def gauge(accounts, deployer, token, registry, rewards, ygauge):
     gauge = accounts[4]
     registry.set_gauge_map(ygauge, gauge, sender=deployer)
     token.approve(rewards, MAX_VALUE, sender=gauge)
     return gauge
 
-@fixture
+@fixture(scope='module')
 def redeem_token(project, deployer):
     return project.MockToken.deploy(sender=deployer)
 
-@fixture
+@fixture(scope='module')
 def redeemer(project, deployer, token, rewards, redeem_token):
     redeemer = project.MockGaugeRedeemer.deploy(token, redeem_token, sender=deployer)
     rewards.set_redeemer(redeemer, sender=deployer)
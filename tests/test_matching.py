@@ -4,22 +4,22 @@ from _constants import *
 
 SCALE = 69_420 * UNIT
 
-@fixture
+@fixture(scope='module')
 def staking_and_rewards(project, deployer, proxy, locking_token, discount_token, liquid_locker):
     staking = project.Staking.deploy(liquid_locker, sender=deployer)
     rewards = project.StakingRewards.deploy(proxy, staking, locking_token, discount_token, sender=deployer)
     staking.set_rewards(rewards, sender=deployer)
     return staking, rewards
 
-@fixture
+@fixture(scope='module')
 def staking(staking_and_rewards):
     return staking_and_rewards[0]
 
-@fixture
+@fixture(scope='module')
 def rewards(staking_and_rewards):
     return staking_and_rewards[1]
 
-@fixture
+@fixture(scope='module')
 def matching(project, ychad, deployer, alice, staking):
     return project.Matching.deploy(staking, ychad, alice, 2_500, sender=deployer)
 
@@ -0,0 +1,131 @@
+from ape import reverts
+from pytest import fixture
+from _constants import *
+
+SCALE = 69_420 * UNIT
+
+@fixture(scope='module')
+def staking_and_rewards(project, deployer, proxy, locking_token, discount_token, liquid_locker):
+    staking = project.Staking.deploy(liquid_locker, sender=deployer)
+    rewards = project.StakingRewards.deploy(proxy, staking, locking_token, discount_token, sender=deployer)
+    staking.set_rewards(rewards, sender=deployer)
+    return staking, rewards
+
+@fixture(scope='module')
+def staking(staking_and_rewards):
+    return staking_and_rewards[0]
+
+@fixture(scope='module')
+def rewards(staking_and_rewards):
+    return staking_and_rewards[1]
+
+@fixture(scope='module')
+def charlie(accounts):
+    return accounts[3]
+
+@fixture(scope='module')
+def matching(project, ychad, deployer, alice, bob, staking):
+    matching = project.MatchingRegistry.deploy(staking, ychad, sender=deployer)
+    matching.set_recipient(alice, 2_500, 10 * UNIT, sender=ychad)
+    matching.set_recipient(bob, 1_000, UNIT, sender=ychad)
+    return matching
+
+def test_set_recipient(ychad, alice, bob, charlie, matching):
+    # recipients can be added, updated and removed
+    assert matching.num_recipients() == 2
+    assert matching.recipients(0) == alice
+    assert matching.recipients(1) == bob
+    assert matching.matching_rates(alice) == 2_500
+    assert matching.caps(alice) == 10 * UNIT
+
+    matching.set_recipient(charlie, 5_000, UNIT, sender=ychad)
+    matching.set_recipient(alice, 3_000, 2 * UNIT, sender=ychad)
+    assert matching.num_recipients() == 3
+    assert matching.matching_rates(alice) == 3_000
+    assert matching.caps(alice) == 2 * UNIT
+
+    matching.set_recipient(alice, 0, 0, sender=ychad)
+    assert matching.num_recipients() == 2
+    assert matching.recipients(0) == charlie
+    assert matching.recipients(1) == bob
+    assert matching.matching_rates(alice) == 0
+
+def test_set_recipient_invalid(ychad, charlie, matching):
+    # cant remove a recipient that is not added, or set a rate above 100%
+    with reverts():
+        matching.set_recipient(charlie, 0, 0, sender=ychad)
+    with reverts():
+        matching.set_recipient(charlie, 10_001, UNIT, sender=ychad)
+
+def test_set_recipient_permission(alice, charlie, matching):
+    # only owner can set recipients
+    with reverts():
+        matching.set_recipient(charlie, 1_000, UNIT, sender=alice)
+
+def test_match_all(ychad, alice, bob, locking_token, liquid_locker, staking, matching):
+    # locked yfi is matched at each recipient's rate, up to their cap
+    locking_token.transfer(matching, 10 * UNIT, sender=ychad)
+    locking_token.approve(liquid_locker, 20 * UNIT, sender=ychad)
+    liquid_locker.deposit(8 * UNIT, sender=ychad)
+    assert matching.matchable(alice) == 2 * UNIT
+    assert matching.matchable(bob) == 8 * UNIT // 10
+    assert matching.match_all(sender=alice).return_value == (28 * UNIT // 10, 28 * SCALE // 10)
+    assert staking.balanceOf(alice) == 2 * SCALE
+    assert staking.balanceOf(bob) == 8 * SCALE // 10
+    assert matching.matched(alice) == 2 * UNIT
+    assert matching.matched(bob) == 8 * UNIT // 10
+    assert matching.total_matched() == 28 * UNIT // 10
+
+    liquid_locker.deposit(12 * UNIT, sender=ychad)
+    assert matching.matchable(alice) == 3 * UNIT
+    assert matching.matchable(bob) == 2 * UNIT // 10
+    assert matching.match_all(sender=bob).return_value == (32 * UNIT // 10, 32 * SCALE // 10)
+    assert staking.balanceOf(alice) == 5 * SCALE
+    assert staking.balanceOf(bob) == SCALE
+    assert matching.matchable(bob) == 0
+
+def test_match_all_sequential(ychad, alice, locking_token, liquid_locker, matching):
+    # cant match more than once in a row without additional deposits
+    locking_token.transfer(matching, 5 * UNIT, sender=ychad)
+    locking_token.approve(liquid_locker, 8 * UNIT, sender=ychad)
+    liquid_locker.deposit(8 * UNIT, sender=ychad)
+    matching.match_all(sender=alice)
+    with reverts():
+        matching.match_all(sender=alice)
+
+def test_match_all_available(ychad, alice, bob, locking_token, liquid_locker, staking, matching):
+    # recipients are matched in order until the available tokens run out
+    locking_token.transfer(matching, 2 * UNIT, sender=ychad)
+    locking_token.approve(liquid_locker, 12 * UNIT, sender=ychad)
+    liquid_locker.deposit(12 * UNIT, sender=ychad)
+    assert matching.match_all(sender=ychad).return_value == (2 * UNIT, 2 * SCALE)
+    assert staking.balanceOf(alice) == 2 * SCALE
+    assert staking.balanceOf(bob) == 0
+    assert locking_token.balanceOf(matching) == 0
+
+    locking_token.transfer(matching, 5 * UNIT, sender=ychad)
+    assert matching.match_all(sender=ychad).return_value == (2 * UNIT, 2 * SCALE)
+    assert staking.balanceOf(alice) == 3 * SCALE
+    assert staking.balanceOf(bob) == SCALE
+
+def test_match_all_permission(ychad, charlie, locking_token, liquid_locker, matching):
+    # only owner or recipients can match
+    locking_token.transfer(matching, 5 * UNIT, sender=ychad)
+    locking_token.approve(liquid_locker, 8 * UNIT, sender=ychad)
+    liquid_locker.deposit(8 * UNIT, sender=ychad)
+    with reverts():
+        matching.match_all(sender=charlie)
+
+def test_revoke(ychad, locking_token, matching):
+    # tokens can be revoked
+    locking_token.transfer(matching, 3 * UNIT, sender=ychad)
+    pre = locking_token.balanceOf(ychad)
+    matching.revoke(locking_token, UNIT, sender=ychad)
+    assert locking_token.balanceOf(matching) == 2 * UNIT
+    assert locking_token.balanceOf(ychad) == pre + UNIT
+
+def test_revoke_permission(ychad, alice, locking_token, matching):
+    # only owner can revoke tokens
+    locking_token.transfer(matching, 3 * UNIT, sender=ychad)
+    with reverts():
+        matching.revoke(locking_token, UNIT, sender=alice)
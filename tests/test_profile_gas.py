@@ -0,0 +1,33 @@
+from pytest import fixture, mark, skip
+from _constants import *
+from profile_gas import Profile, gauge_deposit
+
+pytestmark = mark.local
+
+@fixture(scope='module', autouse=True)
+def tracing(chain, deployer):
+    # the profiler replays transactions, which only some providers support
+    receipt = deployer.transfer(deployer, 0)
+    try:
+        chain.provider.make_request('debug_traceTransaction', [receipt.txn_hash, {}])
+    except NotImplementedError:
+        skip('requires a provider with debug_traceTransaction')
+
+def test_profile_transfer(deployer, alice, bob, discount_token):
+    # lines of a token transfer are mapped to the source
+    discount_token.mint(alice, UNIT, sender=deployer)
+    receipt = discount_token.transfer(bob, UNIT, sender=alice)
+    profile = Profile.from_transaction(receipt.txn_hash)
+    assert profile.sources[discount_token.address].name == 'MockToken'
+    lines = profile.lines[discount_token.address]
+    assert sum(stats.sstore for stats in lines.values()) == 2
+    assert 0 < profile.total < receipt.gas_used
+
+def test_profile_call_tree():
+    # gas of calls is attributed to the callee, folded stacks follow the call tree
+    receipt = gauge_deposit()
+    profile = Profile.from_transaction(receipt.txn_hash)
+    names = {source.name for source in profile.sources.values() if source is not None}
+    assert {'Gauge', 'GaugeRewards', 'MockToken', 'MockYearnGauge'} <= names
+    assert any(stack.startswith('Gauge._deposit;GaugeRewards.report') for stack in profile.folded)
+    assert sum(profile.folded.values()) == profile.total
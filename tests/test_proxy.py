@@ -2,7 +2,9 @@ from ape import reverts
 from _constants import *
 
 MESSAGE_HASH = '0x0123456789ABCDEF0123456789ABCDEF0123456789ABCDEF0123456789ABCDEF'
+MESSAGE_HASH2 = '0xFEDCBA9876543210FEDCBA9876543210FEDCBA9876543210FEDCBA9876543210'
 EIP1271_MAGIC_VALUE = bytes.fromhex('1626ba7e')
+MAX_RETURN_SIZE = 256
 
 def test_proxy_call(project, deployer, alice, proxy):
     # operator can call any contract through the proxy
@@ -21,6 +23,70 @@ def test_proxy_call_permission(project, deployer, alice, proxy):
     with reverts():
         proxy.call(token, data, sender=alice)
 
+def test_proxy_call_many(project, deployer, alice, bob, proxy):
+    # operator can make multiple calls through the proxy in one transaction
+    proxy.set_operator(alice, True, sender=deployer)
+    token = project.MockToken.deploy(sender=deployer)
+    token.mint(proxy, 3 * UNIT, sender=deployer)
+    data = [token.transfer.encode_input(alice, UNIT), token.transfer.encode_input(bob, 2 * UNIT)]
+    tx = proxy.call_many([token, token], data, [0, 0], [False, False], sender=alice)
+    assert [r.success for r in tx.return_value] == [True, True]
+    assert token.balanceOf(alice) == UNIT
+    assert token.balanceOf(bob) == 2 * UNIT
+    events = tx.decode_logs(proxy.CallMany)
+    assert len(events) == 1
+    assert events[0].calls == 2 and events[0].failed == 0
+
+def test_proxy_call_many_allow_failure(project, deployer, alice, bob, proxy):
+    # failing calls are recorded instead of reverting if allowed
+    proxy.set_operator(alice, True, sender=deployer)
+    token = project.MockToken.deploy(sender=deployer)
+    token.mint(proxy, UNIT, sender=deployer)
+    data = [token.transfer.encode_input(alice, 2 * UNIT), token.transfer.encode_input(bob, UNIT)]
+    tx = proxy.call_many([token, token], data, [0, 0], [True, False], sender=alice)
+    assert [r.success for r in tx.return_value] == [False, True]
+    assert token.balanceOf(alice) == 0
+    assert token.balanceOf(bob) == UNIT
+    assert tx.decode_logs(proxy.CallMany)[0].failed == 1
+
+def test_proxy_call_many_failure(project, deployer, alice, bob, proxy):
+    # failing call reverts the batch if not allowed to fail
+    proxy.set_operator(alice, True, sender=deployer)
+    token = project.MockToken.deploy(sender=deployer)
+    token.mint(proxy, UNIT, sender=deployer)
+    data = [token.transfer.encode_input(bob, UNIT), token.transfer.encode_input(alice, 2 * UNIT)]
+    with reverts():
+        proxy.call_many([token, token], data, [0, 0], [True, False], sender=alice)
+
+def test_proxy_call_many_revert_data(project, deployer, alice, proxy):
+    # revert data of a failing call is bubbled up in full, not truncated to the recorded return size
+    proxy.set_operator(alice, True, sender=deployer)
+    reverter = project.MockReverter.deploy(sender=deployer)
+    reason = 'x' * (2 * MAX_RETURN_SIZE)
+    data = reverter.fail.encode_input(reason)
+    with reverts(reason):
+        proxy.call_many([reverter], [data], [0], [False], sender=alice)
+    tx = proxy.call_many([reverter], [data], [0], [True], sender=alice)
+    assert not tx.return_value[0].success
+    assert len(tx.return_value[0].data) == MAX_RETURN_SIZE
+
+def test_proxy_call_many_value(deployer, alice, bob, proxy):
+    # value sent along has to match the sum of the per-call values
+    proxy.set_operator(alice, True, sender=deployer)
+    with reverts():
+        proxy.call_many([bob, bob], [b"", b""], [UNIT, UNIT], [False, False], value=UNIT, sender=alice)
+    before = bob.balance
+    proxy.call_many([bob, bob], [b"", b""], [UNIT, UNIT], [False, False], value=2 * UNIT, sender=alice)
+    assert bob.balance == before + 2 * UNIT
+
+def test_proxy_call_many_permission(project, deployer, alice, proxy):
+    # only operator can make multiple calls through the proxy
+    token = project.MockToken.deploy(sender=deployer)
+    token.mint(proxy, UNIT, sender=deployer)
+    data = token.transfer.encode_input(alice, UNIT)
+    with reverts():
+        proxy.call_many([token], [data], [0], [False], sender=alice)
+
 def test_modify_lock(chain, deployer, alice, ychad, locking_token, voting_escrow, proxy):
     # modify proxy's lock
     data = locking_token.approve.encode_input(voting_escrow, MAX_VALUE)
@@ -44,6 +110,7 @@ def test_set_signed_message(deployer, alice, proxy):
     with reverts():
         proxy.isValidSignature(MESSAGE_HASH, b"")
     proxy.set_signed_message(MESSAGE_HASH, True, sender=alice)
+    assert proxy.messages(MESSAGE_HASH)
     assert proxy.isValidSignature(MESSAGE_HASH, b"") == EIP1271_MAGIC_VALUE
 
 def test_unset_signed_message(deployer, alice, proxy):
@@ -54,6 +121,47 @@ def test_unset_signed_message(deployer, alice, proxy):
     with reverts():
         proxy.isValidSignature(MESSAGE_HASH, b"")
 
+def test_set_signed_message_expiry(chain, deployer, alice, proxy):
+    # signed messages are no longer valid after their expiry
+    proxy.set_operator(alice, True, sender=deployer)
+    expiry = chain.pending_timestamp + DAY
+    tx = proxy.set_signed_message(MESSAGE_HASH, True, expiry, sender=alice)
+    assert tx.decode_logs(proxy.SetSignedMessage)[0].signed
+    assert tx.decode_logs(proxy.SetMessageExpiry)[0].expiry == expiry
+    assert proxy.message_expiry(MESSAGE_HASH) == expiry
+    assert proxy.messages(MESSAGE_HASH)
+    assert proxy.isValidSignature(MESSAGE_HASH, b"") == EIP1271_MAGIC_VALUE
+    chain.pending_timestamp += DAY
+    chain.mine()
+    assert not proxy.messages(MESSAGE_HASH)
+    with reverts():
+        proxy.isValidSignature(MESSAGE_HASH, b"")
+
+def test_set_signed_message_expired(chain, deployer, alice, proxy):
+    # cant sign a message with an expiry in the past
+    proxy.set_operator(alice, True, sender=deployer)
+    with reverts():
+        proxy.set_signed_message(MESSAGE_HASH, True, chain.pending_timestamp - 1, sender=alice)
+
+def test_set_signed_messages(chain, deployer, alice, proxy):
+    # sign and unsign multiple messages at once
+    proxy.set_operator(alice, True, sender=deployer)
+    proxy.set_signed_messages([MESSAGE_HASH, MESSAGE_HASH2], [True, True], sender=alice)
+    assert proxy.isValidSignature(MESSAGE_HASH, b"") == EIP1271_MAGIC_VALUE
+    assert proxy.isValidSignature(MESSAGE_HASH2, b"") == EIP1271_MAGIC_VALUE
+    assert proxy.message_expiry(MESSAGE_HASH) == MAX_VALUE
+    proxy.set_signed_messages([MESSAGE_HASH, MESSAGE_HASH2], [False, True], chain.pending_timestamp + DAY, sender=alice)
+    with reverts():
+        proxy.isValidSignature(MESSAGE_HASH, b"")
+    assert proxy.message_expiry(MESSAGE_HASH) == 0
+    assert not proxy.messages(MESSAGE_HASH)
+    assert proxy.isValidSignature(MESSAGE_HASH2, b"") == EIP1271_MAGIC_VALUE
+
+def test_set_signed_messages_permission(alice, proxy):
+    # only an operator can set multiple signed messages
+    with reverts():
+        proxy.set_signed_messages([MESSAGE_HASH], [True], sender=alice)
+
 def test_set_signed_message_permission(alice, proxy):
     # only an operator can set a signed message
     with reverts():
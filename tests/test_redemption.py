@@ -0,0 +1,109 @@
+from ape import Contract
+from pytest import fixture, mark, raises
+from _constants import *
+from redemption import CurvePool, YearnRedemption, sell_amount, redeem_data, quote
+
+@fixture(scope='module')
+def rewards(accounts):
+    return accounts[3]
+
+@fixture(scope='module')
+def discount_token(project, deployer):
+    return project.MockToken.deploy(sender=deployer)
+
+@fixture(scope='module')
+def redeemer(
+    project, deployer, ychad, locking_token, discount_token, voting_escrow,
+    proxy, liquid_locker, rewards, yearn_redemption, curve_pool):
+
+    locking_token.approve(liquid_locker, UNIT, sender=ychad)
+    liquid_locker.deposit(UNIT, sender=ychad)
+
+    redeemer = project.BasicRedeemer.deploy(
+        voting_escrow, liquid_locker, locking_token, discount_token,
+        proxy, rewards, ZERO_ADDRESS, sender=deployer
+    )
+    redeemer.set_yearn_redemption(yearn_redemption, sender=deployer)
+    redeemer.set_curve_pool(curve_pool, sender=deployer)
+    return redeemer
+
+@fixture
+def mint(deployer, discount_token, rewards, redeemer):
+    discount_token.mint(rewards, 10 * UNIT, sender=deployer)
+    discount_token.approve(redeemer, MAX_VALUE, sender=rewards)
+
+def test_get_dy(curve_pool):
+    # model matches pool output in both directions
+    model = CurvePool.from_contract(curve_pool)
+    for amount in [UNIT // 1000, UNIT, 100 * UNIT, 500 * UNIT]:
+        expected = curve_pool.get_dy(0, 1, amount)
+        assert abs(model.get_dy(0, 1, amount) - expected) <= expected // 10**9
+        expected = curve_pool.get_dy(1, 0, amount // 10)
+        assert abs(model.get_dy(1, 0, amount // 10) - expected) <= expected // 10**9
+
+def test_get_dy_vectorized(curve_pool):
+    # model evaluates many amounts at once
+    model = CurvePool.from_contract(curve_pool)
+    amounts = [UNIT, 2 * UNIT, 3 * UNIT]
+    dy = model.get_dy(0, 1, amounts)
+    assert dy.shape == (3,)
+    assert dy[0] < dy[1] < dy[2]
+    assert abs(dy[1] - model.get_dy(0, 1, 2 * UNIT)) <= 1
+
+def test_eth_required(yearn_redemption):
+    # model matches redemption cost
+    model = YearnRedemption.from_contract(yearn_redemption)
+    assert model.eth_required(3 * UNIT) == yearn_redemption.eth_required(3 * UNIT)
+
+def test_sell_amount(curve_pool, yearn_redemption, redeemer):
+    # sell amount covers redemption cost and is close to the smallest possible
+    pool = CurvePool.from_contract(curve_pool)
+    redemption = YearnRedemption.from_contract(yearn_redemption)
+    for amount in [UNIT, 10 * UNIT]:
+        sell = sell_amount(pool, redemption, amount)
+        assert curve_pool.get_dy(0, 1, sell) >= yearn_redemption.eth_required(amount - sell)
+        quoted = redeemer.quote_sell(0, amount)[0]
+        assert quoted <= sell <= quoted + amount // 10**8
+
+def test_sell_amount_uncovered(deployer, curve_pool, yearn_redemption):
+    # cant cover redemption cost if redeeming a single wei costs more than selling everything
+    yearn_redemption.set_rate(10**20 * UNIT, sender=deployer)
+    pool = CurvePool.from_contract(curve_pool)
+    redemption = YearnRedemption.from_contract(yearn_redemption)
+    with raises(ValueError):
+        sell_amount(pool, redemption, UNIT)
+
+def test_redeem_data(alice, bob, liquid_locker, rewards, discount_token, curve_pool, yearn_redemption, redeemer, mint):
+    # redeem using the model's sell amount
+    pool = CurvePool.from_contract(curve_pool)
+    redemption = YearnRedemption.from_contract(yearn_redemption)
+    sell = sell_amount(pool, redemption, UNIT)
+    redeemer.redeem(alice, bob, 0, UNIT, redeem_data(sell), sender=rewards)
+    assert discount_token.balanceOf(rewards) == 9 * UNIT
+    assert liquid_locker.balanceOf(bob) == (UNIT - sell) * SCALE // UNIT
+
+def test_quote(alice, bob, liquid_locker, rewards, curve_pool, yearn_redemption, redeemer, mint):
+    # best strategy depends on locking token price
+    pool = CurvePool.from_contract(curve_pool)
+    redemption = YearnRedemption.from_contract(yearn_redemption)
+    assert quote(pool, redemption, UNIT, UNIT // 100)[0].strategy == 'naked'
+    assert quote(pool, redemption, UNIT, UNIT)[0].strategy == 'eth'
+
+    quotes = {q.strategy: q for q in quote(pool, redemption, UNIT, UNIT)}
+    assert quotes['eth'].eth_amount == yearn_redemption.eth_required(UNIT)
+    assert quotes['sell'].data == redeem_data(quotes['sell'].sell_amount)
+
+    # quoted data and value can be passed to the redeemer as-is
+    for strategy in ['eth', 'sell']:
+        q = quotes[strategy]
+        before = liquid_locker.balanceOf(bob)
+        redeemer.redeem(alice, bob, 0, UNIT, q.data, value=q.eth_amount, sender=rewards)
+        assert liquid_locker.balanceOf(bob) - before == (UNIT - q.sell_amount) * SCALE // UNIT
+
+@mark.fork
+def test_mainnet_pool():
+    # model matches the live pool
+    pool = Contract(DYFI_CURVE)
+    model = CurvePool.from_contract(pool)
+    expected = pool.get_dy(0, 1, UNIT)
+    assert abs(model.get_dy(0, 1, UNIT) - expected) <= expected // 10**6
@@ -4,26 +4,26 @@ from _constants import *
 
 YGAUGE_DISABLED = '0x0000000000000000000000000000000000000001'
 
-@fixture
+@fixture(scope='module')
 def registrar(accounts):
     return accounts[3]
 
-@fixture
+@fixture(scope='module')
 def registry(project, deployer, registrar, proxy):
     registry = project.Registry.deploy(proxy, sender=deployer)
     registry.set_registrar(registrar, sender=deployer)
     proxy.set_operator(registry, True, sender=deployer)
     return registry
 
-@fixture
+@fixture(scope='module')
 def yvault(project, deployer):
     return project.MockToken.deploy(sender=deployer)
 
-@fixture
+@fixture(scope='module')
 def ygauge(project, deployer):
     return project.MockYearnGauge.deploy(sender=deployer)
 
-@fixture
+@fixture(scope='module')
 def gauge(project, deployer, yvault, ygauge):
     return project.MockGauge.deploy(yvault, ygauge, sender=deployer)
 
@@ -43,6 +43,69 @@ def test_register(registrar, registry, ygauge, gauge):
     assert registry.gauge_map(ygauge) == gauge
     assert registry.ygauge_registered(ygauge)
     assert registry.gauge_registered(gauge)
+    assert registry.gauge_ygauge(gauge) == ygauge
+    assert registry.gauge_index(gauge) == 0
+
+def test_gauge_registered_unknown(alice, registry):
+    # checking an arbitrary address does not revert
+    assert not registry.gauge_registered(alice)
+    assert registry.gauge_ygauge(alice) == ZERO_ADDRESS
+    with reverts():
+        registry.gauge_index(alice)
+
+def test_gauges_page(project, deployer, registrar, registry, ygauge, gauge):
+    # retrieve a page of registered gauges
+    assert registry.gauges_page(0, 10) == []
+    gauges = [(gauge, ygauge)]
+    registry.register(gauge, sender=registrar)
+    for _ in range(2):
+        yvault2 = project.MockToken.deploy(sender=deployer)
+        ygauge2 = project.MockYearnGauge.deploy(sender=deployer)
+        gauge2 = project.MockGauge.deploy(yvault2, ygauge2, sender=deployer)
+        registry.register(gauge2, sender=registrar)
+        gauges.append((gauge2, ygauge2))
+
+    page = registry.gauges_page(0, 10)
+    assert len(page) == 3
+    for i, info in enumerate(page):
+        assert info.gauge == gauges[i][0]
+        assert info.ygauge == gauges[i][1]
+        assert info.idx == i
+
+    page = registry.gauges_page(1, 1)
+    assert len(page) == 1
+    assert page[0].gauge == gauges[1][0]
+    assert page[0].idx == 1
+    assert len(registry.gauges_page(2, 10)) == 1
+    assert registry.gauges_page(3, 10) == []
+
+def test_register_many(project, deployer, registrar, proxy, registry, ygauge, gauge):
+    # register multiple gauges at once
+    gauges = [(gauge, ygauge)]
+    for _ in range(2):
+        yvault2 = project.MockToken.deploy(sender=deployer)
+        ygauge2 = project.MockYearnGauge.deploy(sender=deployer)
+        gauges.append((project.MockGauge.deploy(yvault2, ygauge2, sender=deployer), ygauge2))
+    tx = registry.register_many([g for g, _ in gauges], sender=registrar)
+    assert tx.return_value == [0, 1, 2]
+    assert registry.num_gauges() == 3
+    for i, (g, yg) in enumerate(gauges):
+        assert registry.ygauges(i) == yg
+        assert registry.gauge_map(yg) == g
+        assert registry.gauge_index(g) == i
+        assert yg.allowance(proxy, g) == MAX_VALUE
+    assert len(tx.decode_logs(proxy.CallMany)) == 1
+
+def test_register_many_double(project, deployer, registrar, registry, yvault, ygauge, gauge):
+    # cant register multiple gauges with the same ygauge
+    gauge2 = project.MockGauge.deploy(yvault, ygauge, sender=deployer)
+    with reverts():
+        registry.register_many([gauge, gauge2], sender=registrar)
+
+def test_register_many_permission(deployer, registry, gauge):
+    # only registrar can register multiple gauges
+    with reverts():
+        registry.register_many([gauge], sender=deployer)
 
 def test_register_permission(deployer, registry, gauge):
     # only registrar can register a gauge
@@ -80,7 +143,7 @@ def test_deregister(project, deployer, registrar, registry, ygauge, gauge):
     assert registry.gauge_registered(gauge)
     assert registry.ygauge_registered(ygauge2)
     assert registry.gauge_registered(gauge2)
-    registry.deregister(gauge, 0, sender=deployer)
+    registry.deregister(gauge, sender=deployer)
     assert registry.num_gauges() == 1
     assert registry.ygauges(0) == ygauge2
     assert registry.ygauges(1) == ZERO_ADDRESS
@@ -100,7 +163,7 @@ def test_deregister_last(project, deployer, registrar, registry, ygauge, gauge):
     gauge2 = project.MockGauge.deploy(yvault2, ygauge2, sender=deployer)
     registry.register(gauge, sender=registrar)
     registry.register(gauge2, sender=registrar)
-    registry.deregister(gauge2, 1, sender=deployer)
+    registry.deregister(gauge2, sender=deployer)
     assert registry.num_gauges() == 1
     assert registry.ygauges(0) == ygauge
     assert registry.ygauges(1) == ZERO_ADDRESS
@@ -113,7 +176,7 @@ def test_deregister_permission(registrar, registry, gauge):
     # only management can deregister a gauge
     registry.register(gauge, sender=registrar)
     with reverts():
-        registry.deregister(gauge, 0, sender=registrar)
+        registry.deregister(gauge, sender=registrar)
 
 def test_deregister_not_registered(project, deployer, registrar, registry, gauge):
     # cant deregister a gauge that isnt registered
@@ -122,24 +185,52 @@ def test_deregister_not_registered(project, deployer, registrar, registry, gauge
     gauge2 = project.MockGauge.deploy(yvault2, ygauge2, sender=deployer)
     registry.register(gauge, sender=registrar)
     with reverts():
-        registry.deregister(gauge2, 1, sender=deployer)
+        registry.deregister(gauge2, sender=deployer)
 
 def test_deregister_wrong(project, deployer, registrar, registry, yvault, ygauge, gauge):
     # cant deregister a non-registered gauge that has a registered ygauge
     gauge2 = project.MockGauge.deploy(yvault, ygauge, sender=deployer)
     registry.register(gauge, sender=registrar)
     with reverts():
-        registry.deregister(gauge2, 0, sender=deployer)
+        registry.deregister(gauge2, sender=deployer)
 
-def test_deregister_idx(project, deployer, registrar, registry, gauge):
-    # cant deregister with wrong index
+def test_deregister_moved(project, deployer, registrar, registry, ygauge, gauge):
+    # index of the last gauge is updated when it is moved
     yvault2 = project.MockToken.deploy(sender=deployer)
     ygauge2 = project.MockYearnGauge.deploy(sender=deployer)
     gauge2 = project.MockGauge.deploy(yvault2, ygauge2, sender=deployer)
     registry.register(gauge, sender=registrar)
     registry.register(gauge2, sender=registrar)
+    assert registry.gauge_index(gauge2) == 1
+    registry.deregister(gauge, sender=deployer)
+    assert registry.gauge_index(gauge2) == 0
+    assert registry.gauge_ygauge(gauge2) == ygauge2
+    registry.deregister(gauge2, sender=deployer)
+    assert registry.num_gauges() == 0
+    assert not registry.gauge_registered(gauge2)
+
+def test_deregister_many(project, deployer, registrar, registry, ygauge, gauge):
+    # deregister multiple gauges at once
+    gauges = [gauge]
+    for _ in range(3):
+        yvault2 = project.MockToken.deploy(sender=deployer)
+        ygauge2 = project.MockYearnGauge.deploy(sender=deployer)
+        gauges.append(project.MockGauge.deploy(yvault2, ygauge2, sender=deployer))
+    registry.register_many(gauges, sender=registrar)
+    registry.deregister_many([gauges[0], gauges[2]], sender=deployer)
+    assert registry.num_gauges() == 2
+    assert not registry.gauge_registered(gauges[0])
+    assert not registry.gauge_registered(gauges[2])
+    assert registry.gauge_map(ygauge) == ZERO_ADDRESS
+    assert registry.gauges(registry.gauge_index(gauges[1])) == gauges[1]
+    assert registry.gauges(registry.gauge_index(gauges[3])) == gauges[3]
+    assert registry.ygauges(2) == ZERO_ADDRESS
+
+def test_deregister_many_permission(registrar, registry, gauge):
+    # only management can deregister multiple gauges
+    registry.register(gauge, sender=registrar)
     with reverts():
-        registry.deregister(gauge, 1, sender=deployer)
+        registry.deregister_many([gauge], sender=registrar)
 
 def test_disable(deployer, registry, ygauge):
     # ygauges can be disabled
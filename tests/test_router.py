@@ -0,0 +1,89 @@
+from ape import reverts, Contract
+from pytest import fixture, mark
+from _constants import *
+
+DEPOSIT = 0
+STAKE = 1
+REDEEM = 2
+ZAP = 3
+
+WETH = '0xC02aaA39b223FE8D0A0e5C4F27eAD9083C756Cc2'
+WETH_GAUGE = '0xfd14Fde2e67A6E1b2BbEDa72336Eb682e76Fd7AE'
+
+@fixture(scope='module')
+def staking(project, deployer, proxy, locking_token, discount_token, liquid_locker):
+    staking = project.Staking.deploy(liquid_locker, sender=deployer)
+    rewards = project.StakingRewards.deploy(proxy, staking, locking_token, discount_token, sender=deployer)
+    staking.set_rewards(rewards, sender=deployer)
+    return staking
+
+@fixture(scope='module')
+def zap(project, deployer):
+    registry = project.MockRegistry.deploy(sender=deployer)
+    return project.Zap.deploy(WETH, registry, sender=deployer)
+
+@fixture(scope='module')
+def router(project, deployer, staking, zap):
+    return project.Router.deploy(staking, zap, sender=deployer)
+
+@fixture
+def yfi(ychad, alice, locking_token, router):
+    locking_token.transfer(alice, 3 * UNIT, sender=ychad)
+    locking_token.approve(router, MAX_VALUE, sender=alice)
+
+def _action(action, amount=0, target=ZERO_ADDRESS, data=b""):
+    return (action, amount, target, data)
+
+def test_deposit_stake(alice, bob, locking_token, liquid_locker, staking, router, yfi):
+    # deposit and stake in one transaction, to receiver
+    router.execute([_action(DEPOSIT, UNIT), _action(STAKE, MAX_VALUE)], bob, sender=alice)
+    assert locking_token.balanceOf(alice) == 2 * UNIT
+    assert staking.balanceOf(bob) == UNIT * 69_420
+    assert liquid_locker.balanceOf(router) == 0
+    assert locking_token.balanceOf(router) == 0
+
+def test_deposit_leftover(alice, liquid_locker, router, yfi):
+    # output that is not used by a later action is sent to the receiver
+    router.execute([_action(DEPOSIT, UNIT)], sender=alice)
+    assert liquid_locker.balanceOf(alice) == UNIT * 69_420
+    assert liquid_locker.balanceOf(router) == 0
+
+def test_redeem(chain, alice, liquid_locker, staking, router, yfi):
+    # redeem unstaked tokens
+    router.execute([_action(DEPOSIT, UNIT), _action(STAKE, MAX_VALUE)], sender=alice)
+    staking.unstake(UNIT * 69_420, sender=alice)
+    chain.pending_timestamp += WEEK
+    chain.mine()
+    staking.approve(router, MAX_VALUE, sender=alice)
+    router.execute([_action(REDEEM, MAX_VALUE)], sender=alice)
+    assert liquid_locker.balanceOf(alice) == UNIT * 69_420
+
+def test_redeem_permission(chain, alice, staking, router, yfi):
+    # router needs an allowance to redeem on behalf of the caller
+    router.execute([_action(DEPOSIT, UNIT), _action(STAKE, MAX_VALUE)], sender=alice)
+    staking.unstake(UNIT * 69_420, sender=alice)
+    chain.pending_timestamp += WEEK
+    chain.mine()
+    with reverts():
+        router.execute([_action(REDEEM, MAX_VALUE)], sender=alice)
+
+@mark.fork
+def test_zap(alice, router):
+    # zap underlying into a gauge
+    weth = Contract(WETH)
+    gauge = Contract(WETH_GAUGE)
+    weth.deposit(value=UNIT, sender=alice)
+    weth.approve(router, UNIT, sender=alice)
+    router.execute([_action(ZAP, UNIT, gauge)], sender=alice)
+    assert gauge.balanceOf(alice) > 0
+    assert gauge.balanceOf(router) == 0
+    assert weth.balanceOf(router) == 0
+
+def test_unknown_action(alice, router):
+    with reverts("unknown action"):
+        router.execute([_action(4)], sender=alice)
+
+def test_depositor(alice, locking_token, staking, router, yfi):
+    # router can be used as depositor for vests
+    assert router.deposit(UNIT, sender=alice).return_value == UNIT * 69_420
+    assert staking.balanceOf(alice) == UNIT * 69_420
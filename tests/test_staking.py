@@ -4,23 +4,23 @@ from _constants import *
 
 BIG_MASK = 2**112 - 1
 
-@fixture
+@fixture(scope='module')
 def proxy(accounts):
     return accounts[3]
 
-@fixture
+@fixture(scope='module')
 def locking_token(project, deployer):
     return project.MockToken.deploy(sender=deployer)
 
-@fixture
+@fixture(scope='module')
 def discount_token(project, deployer):
     return project.MockToken.deploy(sender=deployer)
 
-@fixture
+@fixture(scope='module')
 def staking_token(project, deployer):
     return project.MockToken.deploy(sender=deployer)
 
-@fixture
+@fixture(scope='module')
 def staking_and_rewards(project, deployer, proxy, locking_token, discount_token, staking_token):
     staking = project.Staking.deploy(staking_token, sender=deployer)
     rewards = project.StakingRewards.deploy(proxy, staking, locking_token, discount_token, sender=deployer)
@@ -29,11 +29,11 @@ def staking_and_rewards(project, deployer, proxy, locking_token, discount_token,
     discount_token.approve(rewards, MAX_VALUE, sender=proxy)
     return staking, rewards
 
-@fixture
+@fixture(scope='module')
 def staking(staking_and_rewards):
     return staking_and_rewards[0]
 
-@fixture
+@fixture(scope='module')
 def rewards(staking_and_rewards):
     return staking_and_rewards[1]
 
@@ -203,22 +203,20 @@ def test_deposit_add_locked_weight(chain, deployer, alice, staking_token, stakin
     chain.mine()
     assert staking.vote_weight(alice) == 54 * UNIT # (32*6.5 + 64*3.5) / 8
 
-def test_lock(chain, deployer, alice, staking_token, staking):
+def test_lock(deployer, alice, staking_token, staking):
     # stake can be locked
     staking_token.mint(alice, UNIT, sender=deployer)
     staking_token.approve(staking, UNIT, sender=alice)
     staking.deposit(UNIT, sender=alice)
     assert staking.unlock_times(alice) == 0
-    ts = chain.pending_timestamp
-    staking.lock(2 * WEEK, sender=alice)
+    ts = staking.lock(2 * WEEK, sender=alice).timestamp
     assert staking.unlock_times(alice) == ts + 2 * WEEK
 
-def test_lock_max(chain, deployer, alice, staking_token, staking):
+def test_lock_max(deployer, alice, staking_token, staking):
     # lock duration is capped
     staking_token.mint(alice, UNIT, sender=deployer)
     staking_token.approve(staking, UNIT, sender=alice)
-    ts = chain.pending_timestamp
-    staking.deposit(UNIT, sender=alice)
+    ts = staking.deposit(UNIT, sender=alice).timestamp
     staking.lock(9 * WEEK, sender=alice)
     assert staking.unlock_times(alice) == ts + 8 * WEEK
 
@@ -226,8 +224,7 @@ def test_lock_excessive(chain, deployer, alice, staking_token, staking):
     # lock duration is no longer than necessary
     staking_token.mint(alice, UNIT, sender=deployer)
     staking_token.approve(staking, UNIT, sender=alice)
-    ts = chain.pending_timestamp
-    staking.deposit(UNIT, sender=alice)
+    ts = staking.deposit(UNIT, sender=alice).timestamp
     ts += WEEK
     chain.pending_timestamp = ts
     staking.lock(8 * WEEK, sender=alice)
@@ -246,20 +243,18 @@ def test_relock(chain, deployer, alice, staking_token, staking):
     # cant relock when already at max
     staking_token.mint(alice, UNIT, sender=deployer)
     staking_token.approve(staking, UNIT, sender=alice)
-    ts = chain.pending_timestamp
-    staking.deposit(UNIT, sender=alice)
+    ts = staking.deposit(UNIT, sender=alice).timestamp
     chain.pending_timestamp = ts + 8 * WEEK
     with reverts():
         staking.lock(sender=alice)
 
-def test_unstake(chain, deployer, alice, staking_token, staking):
+def test_unstake(deployer, alice, staking_token, staking):
     # unstaking starts a stream
     staking_token.mint(alice, 3 * UNIT, sender=deployer)
     staking_token.approve(staking, 3 * UNIT, sender=alice)
     staking.deposit(3 * UNIT, sender=alice)
     assert staking.streams(alice) == (0, 0, 0)
-    ts = chain.pending_timestamp
-    staking.unstake(2 * UNIT, sender=alice)
+    ts = staking.unstake(2 * UNIT, sender=alice).timestamp
     assert staking.totalSupply() == UNIT
     assert staking.balanceOf(alice) == UNIT
     assert staking.streams(alice) == (ts, 2 * UNIT, 0)
@@ -290,8 +285,7 @@ def test_unstake_withdraw(chain, deployer, alice, bob, staking_token, staking):
     staking_token.mint(alice, 4 * UNIT, sender=deployer)
     staking_token.approve(staking, 4 * UNIT, sender=alice)
     staking.deposit(4 * UNIT, sender=alice)
-    ts = chain.pending_timestamp
-    staking.unstake(4 * UNIT, sender=alice)
+    ts = staking.unstake(4 * UNIT, sender=alice).timestamp
     assert staking.maxWithdraw(alice) == 0
     chain.pending_timestamp = ts + WEEK // 4
     with chain.isolate():
@@ -317,8 +311,7 @@ def test_unstake_withdraw_multiple(chain, deployer, alice, staking_token, stakin
     staking_token.mint(alice, 4 * UNIT, sender=deployer)
     staking_token.approve(staking, 4 * UNIT, sender=alice)
     staking.deposit(4 * UNIT, sender=alice)
-    ts = chain.pending_timestamp
-    staking.unstake(4 * UNIT, sender=alice)
+    ts = staking.unstake(4 * UNIT, sender=alice).timestamp
     chain.pending_timestamp = ts + WEEK // 4
     staking.withdraw(UNIT, sender=alice)
     chain.pending_timestamp = ts + WEEK * 3 // 4
@@ -335,8 +328,7 @@ def test_unstake_withdraw_excessive(chain, deployer, alice, staking_token, staki
     staking_token.mint(alice, 4 * UNIT, sender=deployer)
     staking_token.approve(staking, 4 * UNIT, sender=alice)
     staking.deposit(4 * UNIT, sender=alice)
-    ts = chain.pending_timestamp
-    staking.unstake(4 * UNIT, sender=alice)
+    ts = staking.unstake(4 * UNIT, sender=alice).timestamp
     chain.pending_timestamp = ts + WEEK // 4
     with reverts():
         staking.withdraw(2 * UNIT, sender=alice)
@@ -346,8 +338,7 @@ def test_unstake_withdraw_all(chain, deployer, alice, staking_token, staking):
     staking_token.mint(alice, 4 * UNIT, sender=deployer)
     staking_token.approve(staking, 4 * UNIT, sender=alice)
     staking.deposit(4 * UNIT, sender=alice)
-    ts = chain.pending_timestamp
-    staking.unstake(4 * UNIT, sender=alice)
+    ts = staking.unstake(4 * UNIT, sender=alice).timestamp
     chain.pending_timestamp = ts + 2 * WEEK
     chain.mine()
     assert staking.maxWithdraw(alice) == 4 * UNIT
@@ -361,6 +352,7 @@ def test_unstake_withdraw_from(chain, deployer, alice, bob, staking_token, staki
     staking.deposit(4 * UNIT, sender=alice)
     staking.unstake(4 * UNIT, sender=alice)
     chain.pending_timestamp += WEEK
+    chain.mine()
     staking.approve(bob, 3 * UNIT, sender=alice)
     assert staking.allowance(alice, bob) == 3 * UNIT
     staking.withdraw(UNIT, deployer, alice, sender=bob)
@@ -373,8 +365,7 @@ def test_unstake_withdraw_from_excessive(chain, deployer, alice, bob, staking_to
     staking_token.mint(alice, 4 * UNIT, sender=deployer)
     staking_token.approve(staking, 4 * UNIT, sender=alice)
     staking.deposit(4 * UNIT, sender=alice)
-    ts = chain.pending_timestamp
-    staking.unstake(4 * UNIT, sender=alice)
+    ts = staking.unstake(4 * UNIT, sender=alice).timestamp
     chain.pending_timestamp = ts + WEEK // 2
     staking.approve(bob, 3 * UNIT, sender=alice)
     with reverts():
@@ -396,12 +387,10 @@ def test_unstake_merge(chain, deployer, alice, staking_token, staking):
     staking_token.mint(alice, 4 * UNIT, sender=deployer)
     staking_token.approve(staking, 4 * UNIT, sender=alice)
     staking.deposit(4 * UNIT, sender=alice)
-    ts = chain.pending_timestamp
-    staking.unstake(3 * UNIT, sender=alice)
+    ts = staking.unstake(3 * UNIT, sender=alice).timestamp
     chain.pending_timestamp = ts + WEEK * 3 // 4
     staking.withdraw(2 * UNIT, sender=alice)
-    ts = chain.pending_timestamp
-    staking.unstake(UNIT, sender=alice)
+    ts = staking.unstake(UNIT, sender=alice).timestamp
     assert staking.streams(alice) == (ts, 2 * UNIT, 0)
     assert staking.maxWithdraw(alice) == 0
 
@@ -13,19 +13,19 @@ MASK = 2**128 - 1
 SMALL_MASK = 2**32 - 1
 BIG_MASK = 2**112 - 1
 
-@fixture
+@fixture(scope='module')
 def locking_token(project, deployer):
     return project.MockToken.deploy(sender=deployer)
 
-@fixture
+@fixture(scope='module')
 def discount_token(project, deployer):
     return project.MockToken.deploy(sender=deployer)
 
-@fixture
+@fixture(scope='module')
 def staking(project, deployer):
     return project.MockStaking.deploy(sender=deployer)
 
-@fixture
+@fixture(scope='module')
 def rewards(project, deployer, proxy, locking_token, discount_token, staking):
     rewards = project.StakingRewards.deploy(proxy, staking, locking_token, discount_token, sender=deployer)
     data = locking_token.approve.encode_input(rewards, MAX_VALUE)
@@ -34,11 +34,11 @@ def rewards(project, deployer, proxy, locking_token, discount_token, staking):
     staking.set_rewards(rewards, sender=deployer)
     return rewards
 
-@fixture
+@fixture(scope='module')
 def redeem_token(project, deployer):
     return project.MockToken.deploy(sender=deployer)
 
-@fixture
+@fixture(scope='module')
 def redeemer(project, deployer, locking_token, discount_token, rewards, redeem_token):
     redeemer = project.MockStakingRedeemer.deploy(locking_token, discount_token, redeem_token, sender=deployer)
     rewards.set_redeemer(redeemer, sender=deployer)
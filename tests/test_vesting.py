@@ -4,8 +4,9 @@ from pytest import fixture
 from _constants import *
 
 MESSAGE = '0x1234567890abcdef1234567890abcdef1234567890abcdef1234567890abcdef'
+EIP1271_MAGIC_VALUE = bytes.fromhex('1626ba7e')
 
-@fixture
+@fixture(scope='module')
 def staking_and_rewards(project, deployer, proxy, liquid_locker, locking_token, discount_token):
     staking = project.Staking.deploy(liquid_locker, sender=deployer)
     rewards = project.StakingRewards.deploy(proxy, staking, locking_token, discount_token, sender=deployer)
@@ -14,38 +15,44 @@ def staking_and_rewards(project, deployer, proxy, liquid_locker, locking_token,
     proxy.call(locking_token, data, sender=deployer)
     return staking, rewards
 
-@fixture
+@fixture(scope='module')
 def staking(staking_and_rewards):
     return staking_and_rewards[0]
 
-@fixture
+@fixture(scope='module')
 def rewards(staking_and_rewards):
     return staking_and_rewards[1]
 
-@fixture
+@fixture(scope='module')
 def vesting_impl(project, deployer):
     return project.VestingEscrowLL.deploy(sender=deployer)
 
-@fixture
+@fixture(scope='module')
 def factory(project, alice, deployer, locking_token, vesting_impl):
     return project.VestingEscrowFactory.deploy(vesting_impl, locking_token, deployer, sender=alice)
 
-@fixture
+@fixture(scope='module')
 def depositor(project, deployer, locking_token, liquid_locker, staking):
     return project.VestingEscrowDepositor.deploy(locking_token, liquid_locker, staking, deployer, sender=deployer)
 
-@fixture
-def delegate_registry():
-    return Contract('0x469788fE6E9E9681C6ebF3bF78e7Fd26Fc015446')
+@fixture(scope='module')
+def delegate_registry(fork, project, deployer):
+    if fork:
+        return Contract('0x469788fE6E9E9681C6ebF3bF78e7Fd26Fc015446')
+    return project.MockDelegateRegistry.deploy(sender=deployer)
 
-@fixture
+@fixture(scope='module')
 def delegation_space():
     return bytes('1uptokyo.eth', 'utf-8')
 
-@fixture
+@fixture(scope='module')
 def operator(project, deployer, staking, rewards, delegate_registry, delegation_space):
     return project.VestingOperator.deploy(staking, rewards, delegate_registry, delegation_space, sender=deployer)
 
+@fixture(scope='module')
+def claimer(project, deployer):
+    return project.VestingClaimer.deploy(sender=deployer)
+
 def test_create_vest(chain, ychad, alice, locking_token, factory):
     # anyone can create a yfi vest
     locking_token.approve(factory, 10 * UNIT, sender=ychad)
@@ -71,6 +78,87 @@ def test_create_vest_multiple(ychad, alice, locking_token, factory):
     assert factory.pending_vests(0).amount == 4 * UNIT
     assert factory.pending_vests(1).amount == 6 * UNIT
 
+def test_create_vests(chain, ychad, alice, bob, locking_token, factory):
+    # multiple vests can be created at once with a single transfer
+    locking_token.approve(factory, 10 * UNIT, sender=ychad)
+    factory.create_vest(alice, UNIT, 5 * DAY, sender=ychad)
+    ts = chain.pending_timestamp + 1
+    receipt = factory.create_vests([alice, bob], [3 * UNIT, 6 * UNIT], [5 * DAY, 6 * DAY], [ts, ts + DAY], [DAY, 0], sender=ychad)
+    assert receipt.return_value == 1
+    assert factory.num_vests() == 3
+    assert factory.pending_vests(1) == (alice, 3 * UNIT, 5 * DAY, ts, DAY)
+    assert factory.pending_vests(2) == (bob, 6 * UNIT, 6 * DAY, ts + DAY, 0)
+    assert locking_token.balanceOf(factory) == 10 * UNIT
+    assert len(receipt.decode_logs(factory.VestingEscrowCreated)) == 2
+    assert len(receipt.decode_logs(locking_token.Transfer)) == 1
+
+def test_create_vests_gas(ychad, alice, bob, locking_token, factory):
+    # batch creation is cheaper per vest
+    locking_token.approve(factory, 10 * UNIT, sender=ychad)
+    factory.create_vest(alice, UNIT, 5 * DAY, sender=ychad)
+    single = factory.create_vest(bob, UNIT, 5 * DAY, sender=ychad).gas_used
+    n = 8
+    recipients = [alice, bob] * (n // 2)
+    ts = factory.pending_vests(0).start
+    batch = factory.create_vests(recipients, [UNIT // n] * n, [5 * DAY] * n, [ts] * n, [0] * n, sender=ychad).gas_used
+    # every vest still writes its own storage, the savings come from the transaction and transfer
+    assert batch < single * n * 4 // 5
+
+def test_create_vests_length(ychad, alice, bob, locking_token, factory):
+    # all arrays need to have the same length
+    locking_token.approve(factory, 10 * UNIT, sender=ychad)
+    with reverts():
+        factory.create_vests([alice, bob], [UNIT], [5 * DAY] * 2, [0] * 2, [0] * 2, sender=ychad)
+
+def test_create_vests_invalid(chain, ychad, alice, locking_token, factory):
+    # every vest is validated
+    locking_token.approve(factory, 10 * UNIT, sender=ychad)
+    ts = chain.pending_timestamp
+    with reverts():
+        factory.create_vests([alice, alice], [UNIT, UNIT], [5 * DAY, 5 * DAY], [ts, ts], [0, 6 * DAY], sender=ychad)
+
+def test_create_vest_end_time(ychad, alice, locking_token, factory):
+    # vests have to end within the time range of the vesting escrow
+    locking_token.approve(factory, 10 * UNIT, sender=ychad)
+    max_end = 2**48 - 1
+    factory.create_vest(alice, UNIT, DAY, max_end - DAY, sender=ychad)
+    with reverts():
+        factory.create_vest(alice, UNIT, DAY + 1, max_end - DAY, sender=ychad)
+
+def test_recipient_vests(chain, ychad, alice, bob, locking_token, factory):
+    # vests are indexed per recipient and can be retrieved in pages
+    locking_token.approve(factory, 10 * UNIT, sender=ychad)
+    ts = chain.pending_timestamp
+    factory.create_vest(alice, UNIT, 5 * DAY, ts, sender=ychad)
+    factory.create_vests([bob, alice, alice], [2 * UNIT, 3 * UNIT, 4 * UNIT], [5 * DAY] * 3, [ts] * 3, [0] * 3, sender=ychad)
+    assert factory.num_recipient_vests(alice) == 3
+    assert factory.num_recipient_vests(bob) == 1
+    assert [factory.recipient_vests(alice, i) for i in range(3)] == [0, 2, 3]
+
+    page = factory.vests_page(alice, 0, 10)
+    assert [info.idx for info in page] == [0, 2, 3]
+    assert [info.vest.amount for info in page] == [UNIT, 3 * UNIT, 4 * UNIT]
+    assert page[1].vest.recipient == alice
+    assert page[1].vest.duration == 5 * DAY
+
+    page = factory.vests_page(alice, 1, 1)
+    assert len(page) == 1 and page[0].idx == 2
+    assert len(factory.vests_page(alice, 3, 1)) == 0
+    assert factory.vests_page(bob, 0, 10)[0].idx == 1
+
+def test_recipient_escrows(ychad, deployer, alice, locking_token, staking, factory, depositor):
+    # deployed vesting contracts are indexed per recipient
+    locking_token.approve(factory, 3 * UNIT, sender=ychad)
+    factory.create_vest(alice, UNIT, 5 * DAY, sender=ychad)
+    factory.create_vest(alice, 2 * UNIT, 5 * DAY, sender=ychad)
+    factory.set_liquid_locker(staking, depositor, sender=deployer)
+    vesting_contract = factory.deploy_vesting_contract(0, staking, UNIT, sender=alice).return_value[0]
+    vesting_contract2 = factory.deploy_vesting_contract(1, staking, UNIT, sender=alice).return_value[0]
+    factory.deploy_vesting_contract(1, staking, UNIT, sender=alice)
+    assert factory.num_recipient_escrows(alice) == 2
+    assert factory.recipient_escrows(alice, 0) == vesting_contract
+    assert factory.recipient_escrows(alice, 1) == vesting_contract2
+
 def test_deploy_vesting_contract(chain, ychad, deployer, alice, locking_token, voting_escrow, proxy, staking, factory, depositor):
     # users with a vest can pick a liquid locker and deploy a vesting contract
     locking_token.approve(factory, 3 * UNIT, sender=ychad)
@@ -93,6 +181,72 @@ def test_deploy_vesting_contract(chain, ychad, deployer, alice, locking_token, v
     assert vesting_contract.owner() == deployer
     assert voting_escrow.locked(proxy).amount == UNIT
 
+def test_vesting_packed(chain, ychad, deployer, alice, locking_token, staking, factory, depositor):
+    # vesting contract state is packed into few slots
+    locking_token.approve(factory, UNIT, sender=ychad)
+    ts = chain.pending_timestamp
+    factory.create_vest(alice, UNIT, 5 * DAY, ts, DAY, sender=ychad)
+    factory.set_liquid_locker(staking, depositor, sender=deployer)
+    vesting_contract = factory.deploy_vesting_contract(0, staking, UNIT, sender=alice).return_value[0]
+    vesting_contract = project.VestingEscrowLL.at(vesting_contract)
+    assert vesting_contract.packed_recipient() == ((ts + 5 * DAY) << 208) | (ts << 160) | int(alice.address, 16)
+    assert vesting_contract.packed_token() == ((ts + 5 * DAY) << 208) | (DAY << 160) | int(staking.address, 16)
+    assert vesting_contract.packed_owner() == (3 << 160) | int(deployer.address, 16)
+    assert vesting_contract.packed_amounts() == SCALE
+    assert vesting_contract.initialized()
+    assert vesting_contract.disabled_at() == ts + 5 * DAY
+    assert vesting_contract.total_claimed() == 0
+
+def test_vesting_claim(chain, ychad, deployer, alice, bob, locking_token, staking, factory, depositor):
+    # vested tokens can be claimed by the recipient, or by anyone with open claim
+    locking_token.approve(factory, UNIT, sender=ychad)
+    ts = chain.pending_timestamp
+    factory.create_vest(alice, UNIT, 4 * DAY, ts, DAY, sender=ychad)
+    factory.set_liquid_locker(staking, depositor, sender=deployer)
+    vesting_contract = factory.deploy_vesting_contract(0, staking, UNIT, sender=alice).return_value[0]
+    vesting_contract = project.VestingEscrowLL.at(vesting_contract)
+
+    chain.pending_timestamp = ts + DAY // 2
+    chain.mine()
+    assert vesting_contract.unclaimed() == 0
+
+    chain.pending_timestamp = ts + 2 * DAY
+    assert vesting_contract.claim(alice, SCALE // 4, sender=bob).return_value == SCALE // 4
+    assert vesting_contract.total_claimed() == SCALE // 4
+    assert staking.balanceOf(alice) == SCALE // 4
+
+    vesting_contract.set_open_claim(False, sender=alice)
+    assert not vesting_contract.open_claim()
+    assert vesting_contract.initialized()
+    with reverts():
+        vesting_contract.claim(alice, sender=bob)
+
+    chain.pending_timestamp = ts + 4 * DAY
+    vesting_contract.claim(sender=alice)
+    assert vesting_contract.total_claimed() == SCALE
+    assert staking.balanceOf(alice) == SCALE
+
+def test_vesting_revoke(chain, ychad, deployer, alice, bob, locking_token, staking, factory, depositor):
+    # owner can revoke the unvested part
+    locking_token.approve(factory, UNIT, sender=ychad)
+    ts = chain.pending_timestamp
+    factory.create_vest(alice, UNIT, 4 * DAY, ts, 0, sender=ychad)
+    factory.set_liquid_locker(staking, depositor, sender=deployer)
+    vesting_contract = factory.deploy_vesting_contract(0, staking, UNIT, sender=alice).return_value[0]
+    vesting_contract = project.VestingEscrowLL.at(vesting_contract)
+
+    chain.pending_timestamp = ts + DAY
+    vesting_contract.revoke(ts + DAY, bob, sender=deployer)
+    assert vesting_contract.disabled_at() == ts + DAY
+    assert vesting_contract.owner() == ZERO_ADDRESS
+    assert vesting_contract.open_claim()
+    assert vesting_contract.end_time() == ts + 4 * DAY
+    assert staking.balanceOf(bob) == 3 * SCALE // 4
+
+    chain.pending_timestamp = ts + 4 * DAY
+    vesting_contract.claim(sender=alice)
+    assert staking.balanceOf(alice) == SCALE // 4
+
 def test_deploy_vesting_contract_excessive(ychad, deployer, alice, bob, locking_token, staking, factory, depositor):
     # cannot deposit more than vest size
     locking_token.approve(factory, 3 * UNIT, sender=ychad)
@@ -102,6 +256,66 @@ def test_deploy_vesting_contract_excessive(ychad, deployer, alice, bob, locking_
     with reverts():
         factory.deploy_vesting_contract(0, staking, 2 * UNIT, sender=alice)
 
+def test_deploy_vesting_contract_top_up(chain, ychad, deployer, alice, locking_token, staking, factory, depositor):
+    # converting a vest in tranches tops up the existing vesting contract
+    locking_token.approve(factory, 3 * UNIT, sender=ychad)
+    ts = chain.pending_timestamp
+    factory.create_vest(alice, 3 * UNIT, 4 * DAY, ts, sender=ychad)
+    factory.set_liquid_locker(staking, depositor, sender=deployer)
+    receipt = factory.deploy_vesting_contract(0, staking, UNIT, sender=alice)
+    vesting_contract = receipt.return_value[0]
+    gas = receipt.gas_used
+    assert factory.escrows(0, staking) == vesting_contract
+
+    chain.pending_timestamp = ts + 2 * DAY
+    receipt = factory.deploy_vesting_contract(0, staking, UNIT, sender=alice)
+    assert receipt.return_value == (vesting_contract, SCALE)
+    assert receipt.gas_used < gas
+    assert factory.pending_vests(0).amount == UNIT
+
+    vesting_contract = project.VestingEscrowLL.at(vesting_contract)
+    assert vesting_contract.total_locked() == 2 * SCALE
+    assert staking.balanceOf(vesting_contract) == 2 * SCALE
+    assert vesting_contract.unclaimed() == SCALE
+
+    # both tranches vest until the original end
+    chain.pending_timestamp = ts + 4 * DAY
+    vesting_contract.claim(sender=alice)
+    assert staking.balanceOf(alice) == 2 * SCALE
+
+def test_deploy_vesting_contract_top_up_revoked(chain, ychad, deployer, alice, locking_token, staking, factory, depositor):
+    # a revoked vesting contract is not topped up
+    locking_token.approve(factory, 2 * UNIT, sender=ychad)
+    factory.create_vest(alice, 2 * UNIT, 4 * DAY, sender=ychad)
+    factory.set_liquid_locker(staking, depositor, sender=deployer)
+    vesting_contract = factory.deploy_vesting_contract(0, staking, UNIT, sender=alice).return_value[0]
+    project.VestingEscrowLL.at(vesting_contract).revoke(sender=deployer)
+    vesting_contract2 = factory.deploy_vesting_contract(0, staking, UNIT, sender=alice).return_value[0]
+    assert vesting_contract2 != vesting_contract
+    assert factory.escrows(0, staking) == vesting_contract2
+
+def test_deploy_vesting_contract_top_up_disowned(chain, ychad, deployer, alice, locking_token, staking, factory, depositor):
+    # a disowned vesting contract is not topped up, so the owner can still revoke the new tranche
+    locking_token.approve(factory, 2 * UNIT, sender=ychad)
+    factory.create_vest(alice, 2 * UNIT, 4 * DAY, sender=ychad)
+    factory.set_liquid_locker(staking, depositor, sender=deployer)
+    vesting_contract = factory.deploy_vesting_contract(0, staking, UNIT, sender=alice).return_value[0]
+    project.VestingEscrowLL.at(vesting_contract).disown(sender=deployer)
+    vesting_contract2 = factory.deploy_vesting_contract(0, staking, UNIT, sender=alice).return_value[0]
+    assert vesting_contract2 != vesting_contract
+    assert factory.escrows(0, staking) == vesting_contract2
+    assert project.VestingEscrowLL.at(vesting_contract).total_locked() == SCALE
+    assert project.VestingEscrowLL.at(vesting_contract2).owner() == deployer
+
+def test_top_up_permission(ychad, deployer, alice, locking_token, staking, factory, depositor):
+    # only the factory can top up a vesting contract
+    locking_token.approve(factory, UNIT, sender=ychad)
+    factory.create_vest(alice, UNIT, 4 * DAY, sender=ychad)
+    factory.set_liquid_locker(staking, depositor, sender=deployer)
+    vesting_contract = factory.deploy_vesting_contract(0, staking, UNIT, sender=alice).return_value[0]
+    with reverts():
+        project.VestingEscrowLL.at(vesting_contract).top_up(UNIT, sender=alice)
+
 def test_deploy_vesting_contract_permission(ychad, deployer, alice, bob, locking_token, staking, factory, depositor):
     # cannot deploy vesting contract for another user's vest
     locking_token.approve(factory, UNIT, sender=ychad)
@@ -286,7 +500,7 @@ def test_sign(ychad, deployer, alice, locking_token, staking, factory, depositor
     with reverts():
         vesting.isValidSignature(MESSAGE, b'')
     vesting.set_signed_message(MESSAGE, True, sender=alice)
-    assert vesting.isValidSignature(MESSAGE, b'').hex() == '0x1626ba7e'
+    assert vesting.isValidSignature(MESSAGE, b'') == EIP1271_MAGIC_VALUE
 
 def test_sign_permission(ychad, deployer, alice, locking_token, staking, factory, depositor):
     # only recipient can sign messages
@@ -306,7 +520,7 @@ def test_unsign(ychad, deployer, alice, locking_token, staking, factory, deposit
     vesting, _ = factory.deploy_vesting_contract(0, staking, UNIT, False, sender=alice).return_value
     vesting = project.VestingEscrowLL.at(vesting)
     vesting.set_signed_message(MESSAGE, True, sender=alice)
-    assert vesting.isValidSignature(MESSAGE, b'').hex() == '0x1626ba7e'
+    assert vesting.isValidSignature(MESSAGE, b'') == EIP1271_MAGIC_VALUE
     vesting.set_signed_message(MESSAGE, False, sender=alice)
     with reverts():
         vesting.isValidSignature(MESSAGE, b'')
@@ -350,7 +564,7 @@ def test_unset_snapshot_delegate(ychad, deployer, alice, bob, locking_token, sta
     operator.set_snapshot_delegate(vesting, ZERO_ADDRESS, sender=alice)
     assert delegate_registry.delegation(vesting, delegation_space) == ZERO_ADDRESS
 
-def test_lock(chain, ychad, deployer, alice, locking_token, staking, factory, depositor, operator):
+def test_lock(ychad, deployer, alice, locking_token, staking, factory, depositor, operator):
     # stake can be locked by calling the operator
     locking_token.approve(factory, 3 * UNIT, sender=ychad)
     factory.create_vest(alice, 3 * UNIT, 5 * DAY, sender=ychad)
@@ -360,8 +574,7 @@ def test_lock(chain, ychad, deployer, alice, locking_token, staking, factory, de
     factory.set_operator(staking, operator, True, sender=deployer)
     vesting.set_operator(operator, True, sender=alice)
     assert staking.unlock_times(vesting) == 0
-    ts = chain.pending_timestamp
-    operator.lock(vesting, WEEK, sender=alice)
+    ts = operator.lock(vesting, WEEK, sender=alice).timestamp
     assert staking.unlock_times(vesting) == ts + WEEK
 
 def test_lock_permission(ychad, deployer, alice, locking_token, staking, factory, depositor, operator):
@@ -407,3 +620,117 @@ def test_claim_permission(chain, ychad, deployer, alice, locking_token, proxy, s
     chain.pending_timestamp += WEEK
     with reverts():
         operator.claim(vesting, sender=deployer)
+
+def _vestings(ychad, deployer, alice, locking_token, staking, factory, depositor, operator):
+    locking_token.approve(factory, 2 * UNIT, sender=ychad)
+    factory.create_vest(alice, UNIT, 5 * DAY, sender=ychad)
+    factory.create_vest(alice, UNIT, 5 * DAY, sender=ychad)
+    factory.set_liquid_locker(staking, depositor, sender=deployer)
+    factory.set_operator(staking, operator, True, sender=deployer)
+    vestings = []
+    for idx in range(2):
+        vesting, _ = factory.deploy_vesting_contract(idx, staking, UNIT, False, sender=alice).return_value
+        vesting = project.VestingEscrowLL.at(vesting)
+        vesting.set_operator(operator, True, sender=alice)
+        vestings.append(vesting)
+    return vestings
+
+def test_set_snapshot_delegate_many(ychad, deployer, alice, bob, locking_token, staking, factory, depositor, operator, delegate_registry, delegation_space):
+    # snapshot voting weight of multiple vests can be delegated at once
+    vestings = _vestings(ychad, deployer, alice, locking_token, staking, factory, depositor, operator)
+    operator.set_snapshot_delegate_many(vestings, bob, sender=alice)
+    for vesting in vestings:
+        assert delegate_registry.delegation(vesting, delegation_space) == bob
+
+def test_lock_many(ychad, deployer, alice, locking_token, staking, factory, depositor, operator):
+    # multiple vests can be locked at once
+    vestings = _vestings(ychad, deployer, alice, locking_token, staking, factory, depositor, operator)
+    ts = operator.lock_many(vestings, WEEK, sender=alice).timestamp
+    for vesting in vestings:
+        assert staking.unlock_times(vesting) == ts + WEEK
+
+def test_lock_many_permission(ychad, deployer, alice, bob, locking_token, staking, factory, depositor, operator):
+    # only recipient of all vests can lock
+    vestings = _vestings(ychad, deployer, alice, locking_token, staking, factory, depositor, operator)
+    locking_token.approve(factory, UNIT, sender=ychad)
+    factory.create_vest(bob, UNIT, 5 * DAY, sender=ychad)
+    vesting, _ = factory.deploy_vesting_contract(2, staking, UNIT, False, sender=bob).return_value
+    with reverts():
+        operator.lock_many(vestings + [vesting], WEEK, sender=alice)
+
+def test_claim_many(chain, ychad, deployer, alice, bob, locking_token, proxy, staking, rewards, factory, depositor, operator):
+    # rewards of multiple vests can be claimed to a single receiver
+    vestings = _vestings(ychad, deployer, alice, locking_token, staking, factory, depositor, operator)
+    locking_token.transfer(proxy, UNIT, sender=ychad)
+    rewards.harvest(UNIT, 0, sender=deployer)
+    chain.pending_timestamp += WEEK
+    with chain.isolate():
+        operator.claim(vestings[0], bob, sender=alice)
+        single = locking_token.balanceOf(bob)
+    assert single > 0
+    operator.claim_many(vestings, bob, sender=alice)
+    assert locking_token.balanceOf(bob) >= 2 * single
+
+def test_claim_many_redeem(chain, project, ychad, deployer, alice, bob, locking_token, proxy, staking, rewards, factory, depositor, operator):
+    # every vest is claimed with its own redeem data and ETH value
+    redeem_token = project.MockToken.deploy(sender=deployer)
+    redeemer = project.MockStakingRedeemer.deploy(locking_token, rewards.discount_token(), redeem_token, sender=deployer)
+    rewards.set_redeemer(redeemer, sender=deployer)
+    locking_token.approve(factory, 4 * UNIT, sender=ychad)
+    factory.create_vest(alice, UNIT, 5 * DAY, sender=ychad)
+    factory.create_vest(alice, 3 * UNIT, 5 * DAY, sender=ychad)
+    factory.set_liquid_locker(staking, depositor, sender=deployer)
+    factory.set_operator(staking, operator, True, sender=deployer)
+    vestings = []
+    for idx, amount in enumerate([UNIT, 3 * UNIT]):
+        vesting, _ = factory.deploy_vesting_contract(idx, staking, amount, False, sender=alice).return_value
+        vesting = project.VestingEscrowLL.at(vesting)
+        vesting.set_operator(operator, True, sender=alice)
+        vestings.append(vesting)
+
+    locking_token.transfer(proxy, UNIT, sender=ychad)
+    rewards.harvest(UNIT, 0, sender=deployer)
+    chain.pending_timestamp += 2 * WEEK
+    chain.mine()
+    first = rewards.claimable(vestings[0])[0]
+    second = rewards.claimable(vestings[1])[0]
+    assert 0 < first < second
+
+    # values have to add up to the ETH sent along
+    with reverts():
+        operator.claim_many(vestings, bob, [b"", b"dcba"], [0, UNIT], value=2 * UNIT, sender=alice)
+    with reverts():
+        operator.claim_many(vestings, bob, [b"", b"dcba"], [UNIT], value=UNIT, sender=alice)
+
+    # first vest is claimed naked, second is redeemed with ETH
+    operator.claim_many(vestings, bob, [b"", b"dcba"], [0, UNIT], value=UNIT, sender=alice)
+    assert locking_token.balanceOf(bob) == first
+    assert redeem_token.balanceOf(bob) == 3 * second + UNIT
+    assert redeemer.balance == UNIT
+
+def test_batch_claim(chain, accounts, ychad, deployer, alice, bob, locking_token, staking, factory, depositor, claimer):
+    # anyone can claim from many vests with open claim at once
+    charlie = accounts[3]
+    locking_token.approve(factory, 3 * UNIT, sender=ychad)
+    ts = chain.pending_timestamp
+    factory.create_vests([alice, bob, charlie], [UNIT] * 3, [4 * DAY] * 3, [ts] * 3, [0, 0, 2 * DAY], sender=ychad)
+    factory.set_liquid_locker(staking, depositor, sender=deployer)
+    vestings = [
+        factory.deploy_vesting_contract(0, staking, UNIT, sender=alice).return_value[0],
+        factory.deploy_vesting_contract(1, staking, UNIT, False, sender=bob).return_value[0],
+        factory.deploy_vesting_contract(2, staking, UNIT, sender=charlie).return_value[0],
+    ]
+
+    # closed and not yet vested contracts are skipped
+    chain.pending_timestamp = ts + DAY
+    chain.mine()
+    assert claimer.claimable(vestings) == [SCALE // 4, 0, 0]
+    assert claimer.claim(vestings, sender=deployer).return_value == [SCALE // 4, 0, 0]
+    assert staking.balanceOf(alice) == SCALE // 4
+    assert staking.balanceOf(bob) == 0
+    assert staking.balanceOf(charlie) == 0
+
+    chain.pending_timestamp = ts + 2 * DAY
+    assert claimer.claim(vestings, sender=deployer).return_value == [SCALE // 4, 0, SCALE // 2]
+    assert staking.balanceOf(alice) == SCALE // 2
+    assert staking.balanceOf(charlie) == SCALE // 2
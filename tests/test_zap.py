@@ -1,5 +1,5 @@
 from ape import reverts, Contract
-from pytest import fixture
+from pytest import fixture, mark
 from _constants import *
 
 WETH = '0xC02aaA39b223FE8D0A0e5C4F27eAD9083C756Cc2'
@@ -13,43 +13,265 @@ YFI_LP_GAUGE = '0x6FB0d27A572975fae301800b6cb121Cd3f3bAa11'
 DAI_WHALE = '0x47ac0Fb4F2D84898e4D9E7b4DaB3C24507a6D503'
 YFI_LP_POOL = '0xC26b89A667578ec7b3f11b2F98d6Fd15C07C54ba'
 
-@fixture
+@fixture(scope='module')
 def weth():
     return Contract(WETH)
 
-@fixture
+@fixture(scope='module')
 def weth_gauge():
     return Contract(WETH_GAUGE)
 
-@fixture
+@fixture(scope='module')
 def dai():
     return Contract(DAI)
 
-@fixture
+@fixture(scope='module')
 def dai_gauge():
     return Contract(DAI_GAUGE)
 
-@fixture
+@fixture(scope='module')
 def dai_whale(accounts):
     return accounts[DAI_WHALE]
 
-@fixture
+@fixture(scope='module')
 def yfi_lp():
     return Contract(YFI_LP)
 
-@fixture
+@fixture(scope='module')
 def yfi_lp_gauge():
     return Contract(YFI_LP_GAUGE)
 
-@fixture
+@fixture(scope='module')
 def yfi_lp_pool():
     return Contract(YFI_LP_POOL)
 
-@fixture
-def zap(project, deployer, weth):
-    return project.Zap.deploy(weth, sender=deployer)
+@fixture(scope='module')
+def registry(project, deployer):
+    return project.MockRegistry.deploy(sender=deployer)
 
-def test_deposit(dai, dai_gauge, dai_whale, zap):
+@fixture(scope='module')
+def zap(project, deployer, registry):
+    return project.Zap.deploy(WETH, registry, sender=deployer)
+
+@fixture(scope='module')
+def rewards(project, deployer, registry):
+    reward_token = project.MockToken.deploy(sender=deployer)
+    return project.GaugeRewards.deploy(reward_token, registry, sender=deployer)
+
+@fixture(scope='module')
+def underlying(project, deployer, alice):
+    underlying = project.MockToken.deploy(sender=deployer)
+    underlying.mint(alice, 10_000 * UNIT, sender=deployer)
+    return underlying
+
+@fixture(scope='module')
+def yvault(project, deployer, underlying):
+    return _deploy_vault(project, deployer, underlying)
+
+@fixture(scope='module')
+def gauge(project, deployer, proxy, registry, rewards, yvault):
+    return _deploy_gauge(project, deployer, proxy, registry, rewards, yvault)
+
+@fixture(scope='module')
+def other_gauge(project, deployer, alice, proxy, registry, rewards):
+    # gauge for a yvault with a different underlying
+    underlying = project.MockToken.deploy(sender=deployer)
+    underlying.mint(alice, 10_000 * UNIT, sender=deployer)
+    yvault = _deploy_vault(project, deployer, underlying)
+    return _deploy_gauge(project, deployer, proxy, registry, rewards, yvault)
+
+@fixture(scope='module')
+def replacement_gauge(project, deployer, proxy, registry, rewards, yvault):
+    # second registered 1up gauge for the same yvault, through another yearn gauge
+    return _deploy_gauge(project, deployer, proxy, registry, rewards, yvault)
+
+def test_deposit(alice, underlying, yvault, gauge, zap):
+    amt = 1_000 * UNIT
+    bal = underlying.balanceOf(alice)
+    underlying.approve(zap, amt, sender=alice)
+
+    assert gauge.balanceOf(alice) == 0
+    shares = zap.deposit(gauge, amt, sender=alice).return_value
+    assert shares == amt
+    assert underlying.balanceOf(alice) == bal - amt
+    assert underlying.balanceOf(yvault) == amt
+    assert gauge.balanceOf(alice) == shares
+
+def test_withdraw(alice, underlying, gauge, zap):
+    amt = 1_000 * UNIT
+    underlying.approve(zap, 2_000 * UNIT, sender=alice)
+    zap.deposit(gauge, 2_000 * UNIT, sender=alice)
+
+    bal = underlying.balanceOf(alice)
+    gauge_bal = gauge.balanceOf(alice)
+    gauge.approve(zap, amt, sender=alice)
+    assets = zap.withdraw(gauge, amt, sender=alice).return_value
+    assert assets == amt
+    assert gauge.balanceOf(alice) == gauge_bal - amt
+    assert underlying.balanceOf(alice) == bal + assets
+
+def test_deposit_many(project, alice, underlying, gauge, other_gauge, zap):
+    other = project.MockToken.at(project.MockYearnGauge.at(other_gauge.asset()).asset())
+    bal = underlying.balanceOf(alice)
+    other_bal = other.balanceOf(alice)
+    underlying.approve(zap, 2_000 * UNIT, sender=alice)
+    other.approve(zap, UNIT, sender=alice)
+
+    gauges = [gauge, other_gauge, gauge]
+    shares = zap.deposit_many(gauges, [500 * UNIT, UNIT, 1_500 * UNIT], sender=alice).return_value
+    assert shares == [500 * UNIT, UNIT, 1_500 * UNIT]
+    assert underlying.balanceOf(alice) == bal - 2_000 * UNIT
+    assert other.balanceOf(alice) == other_bal - UNIT
+    assert gauge.balanceOf(alice) == shares[0] + shares[2]
+    assert other_gauge.balanceOf(alice) == shares[1]
+
+def test_deposit_many_approval(alice, underlying, yvault, gauge, zap):
+    # approvals are reused across deposits. mock allowances are spent even when unlimited
+    underlying.approve(zap, 2_000 * UNIT, sender=alice)
+    zap.deposit_many([gauge], [1_000 * UNIT], sender=alice)
+    assert underlying.allowance(zap, yvault) == MAX_VALUE - 1_000 * UNIT
+    assert yvault.allowance(zap, gauge) == MAX_VALUE - 1_000 * UNIT
+
+    zap.deposit(gauge, 1_000 * UNIT, sender=alice)
+    assert underlying.allowance(zap, yvault) == MAX_VALUE - 2_000 * UNIT
+    assert yvault.allowance(zap, gauge) == MAX_VALUE - 2_000 * UNIT
+
+def test_deposit_approval_unregistered(project, deployer, alice, underlying, yvault, zap):
+    # gauges that arent registered only get the approvals used by the deposit
+    gauge = project.MockYearnGauge.deploy(sender=deployer)
+    gauge.initialize(yvault, sender=deployer)
+    underlying.approve(zap, UNIT, sender=alice)
+    zap.deposit(gauge, UNIT, sender=alice)
+    assert gauge.balanceOf(alice) == UNIT
+    assert underlying.allowance(zap, yvault) == 0
+    assert yvault.allowance(zap, gauge) == 0
+
+def test_deposit_many_length(alice, gauge, zap):
+    with reverts():
+        zap.deposit_many([gauge, gauge], [UNIT], sender=alice)
+
+def test_withdraw_many(project, alice, underlying, gauge, other_gauge, zap):
+    other = project.MockToken.at(project.MockYearnGauge.at(other_gauge.asset()).asset())
+    bal = underlying.balanceOf(alice)
+    other_bal = other.balanceOf(alice)
+    underlying.approve(zap, 2_000 * UNIT, sender=alice)
+    other.approve(zap, UNIT, sender=alice)
+    shares, other_shares = zap.deposit_many([gauge, other_gauge], [2_000 * UNIT, UNIT], sender=alice).return_value
+
+    gauge.approve(zap, shares, sender=alice)
+    other_gauge.approve(zap, other_shares, sender=alice)
+    assets = zap.withdraw_many([gauge, other_gauge], [shares, other_shares], sender=alice).return_value
+    assert assets == [2_000 * UNIT, UNIT]
+    assert gauge.balanceOf(alice) == 0
+    assert other_gauge.balanceOf(alice) == 0
+    assert underlying.balanceOf(alice) == bal
+    assert other.balanceOf(alice) == other_bal
+
+def test_migrate(alice, underlying, gauge, replacement_gauge, zap):
+    # migrate between gauges with the same yvault
+    underlying.approve(zap, 1_000 * UNIT, sender=alice)
+    shares = zap.deposit(gauge, 1_000 * UNIT, sender=alice).return_value
+
+    gauge.approve(zap, shares, sender=alice)
+    assert zap.migrate(gauge, replacement_gauge, shares, shares, sender=alice).return_value == shares
+    assert gauge.balanceOf(alice) == 0
+    assert replacement_gauge.balanceOf(alice) == shares
+    assert Contract(replacement_gauge.asset()).balanceOf(zap) == 0
+
+def test_migrate_vault(project, deployer, alice, proxy, underlying, registry, rewards, gauge, zap):
+    # migrate between gauges with a different yvault for the same underlying
+    new = _deploy_gauge(project, deployer, proxy, registry, rewards, _deploy_vault(project, deployer, underlying))
+    underlying.approve(zap, 1_000 * UNIT, sender=alice)
+    shares = zap.deposit(gauge, 1_000 * UNIT, sender=alice).return_value
+
+    gauge.approve(zap, shares, sender=alice)
+    assert zap.migrate(gauge, new, shares, shares, sender=alice).return_value == shares
+    assert gauge.balanceOf(alice) == 0
+    assert new.balanceOf(alice) == shares
+    assert underlying.balanceOf(zap) == 0
+
+def test_migrate_gas(chain, alice, underlying, gauge, replacement_gauge, zap):
+    # migrating is cheaper than withdrawing and depositing separately
+    underlying.approve(zap, MAX_VALUE, sender=alice)
+    shares = zap.deposit(gauge, 1_000 * UNIT, sender=alice).return_value
+    zap.deposit(replacement_gauge, 1_000 * UNIT, sender=alice)
+    gauge.approve(zap, shares, sender=alice)
+
+    snapshot = chain.snapshot()
+    bal = underlying.balanceOf(alice)
+    separate = zap.withdraw(gauge, shares, sender=alice).gas_used
+    separate += zap.deposit(replacement_gauge, underlying.balanceOf(alice) - bal, sender=alice).gas_used
+    chain.restore(snapshot)
+    migrate = zap.migrate(gauge, replacement_gauge, shares, shares, sender=alice).gas_used
+    assert migrate < separate
+
+def test_migrate_slippage(alice, underlying, gauge, replacement_gauge, zap):
+    underlying.approve(zap, 1_000 * UNIT, sender=alice)
+    shares = zap.deposit(gauge, 1_000 * UNIT, sender=alice).return_value
+
+    gauge.approve(zap, shares, sender=alice)
+    with reverts("slippage"):
+        zap.migrate(gauge, replacement_gauge, shares, shares + 1, sender=alice)
+
+def test_migrate_mismatch(alice, underlying, gauge, other_gauge, zap):
+    # cant migrate between gauges with a different underlying
+    underlying.approve(zap, UNIT, sender=alice)
+    shares = zap.deposit(gauge, UNIT, sender=alice).return_value
+    gauge.approve(zap, shares, sender=alice)
+    with reverts("underlying mismatch"):
+        zap.migrate(gauge, other_gauge, shares, 0, sender=alice)
+
+def test_migrate_unregistered(project, deployer, alice, underlying, yvault, gauge, replacement_gauge, zap):
+    # a gauge that claims to withdraw without sending anything cant move tokens stranded in zap
+    fake = project.MockGauge.deploy(yvault, gauge.ygauge(), sender=deployer)
+    underlying.approve(yvault, UNIT, sender=alice)
+    yvault.deposit(UNIT, zap, sender=alice)
+
+    with reverts("not registered"):
+        zap.migrate(fake, replacement_gauge, UNIT, 0, sender=alice)
+    with reverts("not registered"):
+        zap.migrate(replacement_gauge, fake, UNIT, 0, sender=alice)
+    assert yvault.balanceOf(zap) == UNIT
+    assert replacement_gauge.balanceOf(alice) == 0
+
+def test_migrate_stranded(alice, underlying, yvault, gauge, replacement_gauge, zap):
+    # only the withdrawn tokens are migrated, not tokens stranded in zap
+    underlying.approve(zap, 1_000 * UNIT, sender=alice)
+    shares = zap.deposit(gauge, 1_000 * UNIT, sender=alice).return_value
+    underlying.approve(yvault, UNIT, sender=alice)
+    yvault.deposit(UNIT, zap, sender=alice)
+
+    gauge.approve(zap, shares, sender=alice)
+    assert zap.migrate(gauge, replacement_gauge, shares, 0, sender=alice).return_value == shares
+    assert replacement_gauge.balanceOf(alice) == shares
+    assert yvault.balanceOf(zap) == UNIT
+
+def test_rescue(deployer, alice, underlying, zap):
+    underlying.transfer(zap, 3 * UNIT, sender=alice)
+
+    with reverts():
+        zap.rescue(underlying, UNIT, sender=alice)
+
+    bal = underlying.balanceOf(deployer)
+    zap.rescue(underlying, UNIT, sender=deployer)
+    assert underlying.balanceOf(zap) == 2 * UNIT
+    assert underlying.balanceOf(deployer) == bal + UNIT
+
+    zap.rescue(underlying, sender=deployer)
+    assert underlying.balanceOf(zap) == 0
+    assert underlying.balanceOf(deployer) == bal + 3 * UNIT
+
+def test_management(deployer, alice, zap):
+    assert zap.management() == deployer
+
+    with reverts():
+        zap.set_management(alice, sender=alice)
+
+    zap.set_management(alice, sender=deployer)
+    assert zap.management() == alice
+
+@mark.fork
+def test_deposit_mainnet(dai, dai_gauge, dai_whale, zap):
     amt = 1_000 * UNIT
     bal = dai.balanceOf(dai_whale)
     dai.approve(zap, amt, sender=dai_whale)
@@ -63,6 +285,7 @@ def test_deposit(dai, dai_gauge, dai_whale, zap):
     dai_vault = Contract(dai_gauge.asset())
     assert abs(dai_vault.convertToAssets(shares)-amt) <= 2
 
+@mark.fork
 def test_deposit_eth(alice, weth_gauge, zap):
     amt = UNIT
     assert weth_gauge.balanceOf(alice) == 0
@@ -73,6 +296,7 @@ def test_deposit_eth(alice, weth_gauge, zap):
     weth_vault = Contract(weth_gauge.asset())
     assert abs(weth_vault.convertToAssets(shares)-amt) <= 1
 
+@mark.fork
 def test_deposit_legacy(alice, yfi_lp, yfi_lp_gauge, yfi_lp_pool, zap):
     amt = UNIT
     yfi_lp_pool.add_liquidity([10 * UNIT, 0], 0, True, value=10 * UNIT, sender=alice)
@@ -85,19 +309,7 @@ def test_deposit_legacy(alice, yfi_lp, yfi_lp_gauge, yfi_lp_pool, zap):
     assert yfi_lp.balanceOf(alice) == bal - amt
     assert yfi_lp_gauge.balanceOf(alice) == shares
 
-def test_withdraw(dai, dai_gauge, dai_whale, zap):
-    amt = 1_000 * UNIT
-    dai.approve(zap, 2_000 * UNIT, sender=dai_whale)
-    zap.deposit(dai_gauge, 2_000 * UNIT, sender=dai_whale)
-    
-    bal = dai.balanceOf(dai_whale)
-    gauge_bal = dai_gauge.balanceOf(dai_whale)
-    dai_gauge.approve(zap, amt, sender=dai_whale)
-    assets = zap.withdraw(dai_gauge, amt, sender=dai_whale).return_value
-    assert assets > amt
-    assert dai_gauge.balanceOf(dai_whale) == gauge_bal - amt
-    assert dai.balanceOf(dai_whale) == bal + assets
-
+@mark.fork
 def test_withdraw_eth(alice, weth_gauge, zap):
     amt = UNIT
     zap.deposit_eth(weth_gauge, value=2 * UNIT, sender=alice)
@@ -110,6 +322,7 @@ def test_withdraw_eth(alice, weth_gauge, zap):
     assert weth_gauge.balanceOf(alice) == gauge_bal - amt
     assert alice.balance > bal + amt
 
+@mark.fork
 def test_withdraw_legacy(alice, yfi_lp, yfi_lp_gauge, yfi_lp_pool, zap):
     amt = UNIT
     yfi_lp_pool.add_liquidity([10 * UNIT, 0], 0, True, value=10 * UNIT, sender=alice)
@@ -124,26 +337,68 @@ def test_withdraw_legacy(alice, yfi_lp, yfi_lp_gauge, yfi_lp_pool, zap):
     assert yfi_lp_gauge.balanceOf(alice) == gauge_bal - amt
     assert yfi_lp.balanceOf(alice) == bal + assets
 
-def test_rescue(deployer, alice, dai, dai_whale, zap):
-    dai.transfer(zap, 3 * UNIT, sender=dai_whale)
+@mark.fork
+def test_deposit_many_eth(alice, weth_gauge, zap):
+    shares = zap.deposit_many_eth([weth_gauge, weth_gauge], [UNIT, 2 * UNIT], value=3 * UNIT, sender=alice).return_value
+    assert len(shares) == 2
+    assert shares[1] > shares[0] > 0
+    assert weth_gauge.balanceOf(alice) == shares[0] + shares[1]
 
+@mark.fork
+def test_deposit_many_eth_value(alice, weth_gauge, zap):
     with reverts():
-        zap.rescue(dai, UNIT, sender=alice)
+        zap.deposit_many_eth([weth_gauge, weth_gauge], [UNIT, UNIT], value=3 * UNIT, sender=alice)
 
-    bal = dai.balanceOf(deployer)
-    zap.rescue(dai, UNIT, sender=deployer)
-    assert dai.balanceOf(zap) == 2 * UNIT
-    assert dai.balanceOf(deployer) == bal + UNIT
+@mark.fork
+def test_deposit_many_eth_not_weth(alice, weth_gauge, dai_gauge, zap):
+    with reverts("not WETH"):
+        zap.deposit_many_eth([weth_gauge, dai_gauge], [UNIT, UNIT], value=2 * UNIT, sender=alice)
 
-    zap.rescue(dai, sender=deployer)
-    assert dai.balanceOf(zap) == 0
-    assert dai.balanceOf(deployer) == bal + 3 * UNIT
+@mark.fork
+def test_deposit_many_legacy(alice, yfi_lp, yfi_lp_gauge, yfi_lp_pool, zap):
+    yfi_lp_pool.add_liquidity([10 * UNIT, 0], 0, True, value=10 * UNIT, sender=alice)
+    bal = yfi_lp.balanceOf(alice)
+    yfi_lp.approve(zap, 3 * UNIT, sender=alice)
 
-def test_management(deployer, alice, zap):
-    assert zap.management() == deployer
+    shares = zap.deposit_many_legacy([yfi_lp_gauge, yfi_lp_gauge], [UNIT, 2 * UNIT], sender=alice).return_value
+    assert len(shares) == 2
+    assert yfi_lp.balanceOf(alice) == bal - 3 * UNIT
+    assert yfi_lp_gauge.balanceOf(alice) == shares[0] + shares[1]
 
-    with reverts():
-        zap.set_management(alice, sender=alice)
+@mark.fork
+def test_withdraw_many_eth(alice, weth_gauge, zap):
+    shares = zap.deposit_many_eth([weth_gauge, weth_gauge], [UNIT, UNIT], value=2 * UNIT, sender=alice).return_value
+    total = shares[0] + shares[1]
 
-    zap.set_management(alice, sender=deployer)
-    assert zap.management() == alice
+    bal = alice.balance
+    weth_gauge.approve(zap, total, sender=alice)
+    assets = zap.withdraw_many_eth([weth_gauge, weth_gauge], shares, sender=alice).return_value
+    assert weth_gauge.balanceOf(alice) == 0
+    assert alice.balance > bal + UNIT
+    assert abs(assets[0] + assets[1] - 2 * UNIT) <= 2
+
+@mark.fork
+def test_withdraw_many_legacy(alice, yfi_lp, yfi_lp_gauge, yfi_lp_pool, zap):
+    yfi_lp_pool.add_liquidity([10 * UNIT, 0], 0, True, value=10 * UNIT, sender=alice)
+    yfi_lp.approve(zap, 2 * UNIT, sender=alice)
+    zap.deposit_legacy(yfi_lp_gauge, 2 * UNIT, sender=alice)
+
+    bal = yfi_lp.balanceOf(alice)
+    yfi_lp_gauge.approve(zap, 2 * UNIT, sender=alice)
+    assets = zap.withdraw_many_legacy([yfi_lp_gauge, yfi_lp_gauge], [UNIT, UNIT], sender=alice).return_value
+    assert yfi_lp_gauge.balanceOf(alice) == 0
+    assert yfi_lp.balanceOf(alice) == bal + assets[0] + assets[1]
+
+def _deploy_vault(project, deployer, underlying):
+    # yearn gauge mock doubles as a yvault, shares are minted 1:1
+    yvault = project.MockYearnGauge.deploy(sender=deployer)
+    yvault.initialize(underlying, sender=deployer)
+    return yvault
+
+def _deploy_gauge(project, deployer, proxy, registry, rewards, yvault):
+    ygauge = project.MockYearnGauge.deploy(sender=deployer)
+    ygauge.initialize(yvault, sender=deployer)
+    gauge = project.Gauge.deploy(ygauge, proxy, rewards.discount_token(), rewards, sender=deployer)
+    registry.set_gauge_map(ygauge, gauge, sender=deployer)
+    proxy.call(ygauge, ygauge.approve.encode_input(gauge, MAX_VALUE), sender=deployer)
+    return gauge